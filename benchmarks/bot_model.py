@@ -0,0 +1,103 @@
+"""
+Latency and accuracy of trained BotModels against the hand-weighted heuristic
+
+Run from the repository root:
+
+    python -m benchmarks.bot_model [--accounts 3000] [--messages labeled.ndjson]
+
+Accounts are split into a training and a held-out set; both scorers are
+evaluated on the held-out accounts. --messages reads NDJSON messages with
+"sender", "text", "timestamp" and a boolean "is_bot" label; without it a
+labeled fixture set of scripted and organic accounts is generated.
+"""
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+
+from core.detection.bot_detector import BotDetector
+from core.detection.bot_model import BotModel, compare_with_heuristic
+
+SCRIPTED_TEXTS = [
+    "Best quality, delivery available, contact for details",
+    "dm for info https://t.me/deals #offer",
+    "Available now!!! cash only, fast delivery",
+    "JOIN THE RALLY NOW https://bit.ly/x #vote #vote",
+    "/start trusted supplier, premium quality",
+    "Vote vote vote for change 9999999999"
+]
+
+ORGANIC_WORDS = (
+    "the rally was loud today we met near the station and talked about the vote "
+    "traffic was bad lol see you tomorrow thanks for the photos कल मिलते हैं "
+    "anyone going to the market weather is nice hope everyone is safe"
+).split()
+
+def generate_messages(accounts: int, seed: int) -> List[Dict[str, Any]]:
+    """Labeled messages of scripted and organic accounts, with overlap between the two"""
+    rng = random.Random(seed)
+    messages = []
+    for account in range(accounts):
+        is_bot = rng.random() < 0.3
+        # Some scripted accounts blend in and some people post like machines
+        disguised = rng.random() < 0.25
+        moment = datetime(2026, 10, 1) + timedelta(minutes=rng.randint(0, 1440))
+        for _ in range(rng.randint(3, 40)):
+            if is_bot and not disguised:
+                moment += timedelta(seconds=rng.choice([30, 60, 60]) if rng.random() < 0.7 else rng.randint(1, 5))
+            else:
+                moment += timedelta(seconds=rng.expovariate(1 / 1800))
+            scripted = rng.random() < (0.4 if disguised else 0.85) if is_bot else rng.random() < 0.05
+            text = rng.choice(SCRIPTED_TEXTS) if scripted else " ".join(rng.sample(ORGANIC_WORDS, rng.randint(3, 12)))
+            messages.append({"sender": f"a{account}", "text": text, "timestamp": moment.isoformat(), "is_bot": is_bot})
+    return messages
+
+def load_messages(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=3000, help="Accounts in the generated fixture set")
+    parser.add_argument("--messages", help="NDJSON file of labeled messages instead of the generated set")
+    parser.add_argument("--holdout", type=float, default=0.3, help="Share of accounts held out for evaluation")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repetitions; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    messages = load_messages(args.messages) if args.messages else generate_messages(args.accounts, args.seed)
+    labels_by_account = {message["sender"]: bool(message["is_bot"]) for message in messages}
+    
+    detector = BotDetector()
+    start = time.perf_counter()
+    frame = detector.detect_many(messages)
+    extraction = time.perf_counter() - start
+    features = detector.account_features_from_frame(frame)
+    labels = frame["account"].map(labels_by_account).to_numpy(dtype=int)
+    print(
+        f"{len(messages)} messages, {len(frame)} accounts ({labels.mean():.0%} bots), "
+        f"feature extraction {extraction:.2f}s ({len(messages) / extraction:,.0f} messages/s)"
+    )
+    
+    order = np.random.default_rng(args.seed).permutation(len(frame))
+    split = int(len(order) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+    
+    print(f"{'scorer':<36}{'accuracy':>10}{'roc auc':>10}{'latency ms':>12}{'accounts/s':>14}")
+    for kind in ("logistic_regression", "gradient_boosting"):
+        model = BotModel(kind).fit(features[train], labels[train])
+        results = compare_with_heuristic(model, features[test], labels[test], repeats=args.repeats)
+        rows = [("heuristic", results["heuristic"])] if kind == "logistic_regression" else []
+        rows.append((f"model ({kind})", results["model"]))
+        for name, result in rows:
+            print(
+                f"{name:<36}{result['accuracy']:>10.3f}{result['roc_auc']:>10.3f}"
+                f"{result['latency_seconds'] * 1000:>12.3f}{result['accounts_per_second']:>14,.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
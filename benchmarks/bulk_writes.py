@@ -0,0 +1,87 @@
+"""
+Row throughput of single-row stores against store_*_many and BatchWriter
+
+Run from the repository root:
+
+    python -m benchmarks.bulk_writes [--rows 50000] [--batch-size 5000]
+
+Threats and accounts are written to a fresh SQLite database per method.
+A quarter of the account rows repeat a username, so the account writers
+exercise the upsert path as well as inserts.
+"""
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from utils.database import Database
+from utils.batch_writer import BatchWriter
+
+def generate(rows: int) -> Dict[str, List[Dict[str, Any]]]:
+    threats = [
+        {
+            "platform": ("telegram", "whatsapp", "twitter")[i % 3],
+            "channel": f"channel{i % 50}",
+            "message": f"rally at booth {i} tonight",
+            "threat_score": i % 100,
+            "risk_level": "high" if i % 100 >= 80 else "low",
+            "metadata": {"sequence": i}
+        }
+        for i in range(rows)
+    ]
+    accounts = [
+        {
+            "username": f"user{i % (rows * 3 // 4)}",
+            "platform": "telegram",
+            "threat_score": i % 100,
+            "metadata": {"phone_numbers": [f"+91{i % 9973:010d}"]}
+        }
+        for i in range(rows)
+    ]
+    return {"threats": threats, "accounts": accounts}
+
+def single_rows(database: Database, kind: str, rows: List[Dict[str, Any]], batch_size: int) -> None:
+    store = database.store_threat if kind == "threats" else database.store_account
+    for row in rows:
+        store(row)
+
+def store_many(database: Database, kind: str, rows: List[Dict[str, Any]], batch_size: int) -> None:
+    store = database.store_threats_many if kind == "threats" else database.store_accounts_many
+    store(rows, batch_size=batch_size)
+
+def batch_writer(database: Database, kind: str, rows: List[Dict[str, Any]], batch_size: int) -> None:
+    with BatchWriter(database, batch_size=batch_size) as writer:
+        for row in rows:
+            writer.add(kind, row)
+
+METHODS: Dict[str, Callable[[Database, str, List[Dict[str, Any]], int], None]] = {
+    "single row": single_rows,
+    "store_*_many": store_many,
+    "BatchWriter": batch_writer
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Rows of each kind")
+    parser.add_argument("--single-rows", type=int, default=5000, help="Rows of each kind for the single-row method")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    
+    data = generate(args.rows)
+    directory = Path(tempfile.mkdtemp())
+    print(f"{'method':<16}{'threats/s':>12}{'accounts/s':>12}")
+    for name, write in METHODS.items():
+        rates = []
+        for kind, rows in data.items():
+            # Single-row writes are slow enough that a sample gives a stable rate
+            rows = rows[:args.single_rows] if name == "single row" else rows
+            database = Database(str(directory / f"{name.replace(' ', '_')}_{kind}.db"))
+            start = time.perf_counter()
+            write(database, kind, rows, args.batch_size)
+            rates.append(len(rows) / (time.perf_counter() - start))
+            database.close()
+        print(f"{name:<16}{rates[0]:>12,.0f}{rates[1]:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
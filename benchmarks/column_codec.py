@@ -0,0 +1,133 @@
+"""
+Database size and decode time of the JSON column encodings
+
+Run from the repository root:
+
+    python -m benchmarks.column_codec [--threats 50000]
+
+The same generated threats, shaped like scraper metadata and content
+analysis results, are stored once per encoding: legacy json.dumps text and
+every ColumnCodec setting. Reports the vacuumed file size, the time to
+decode every metadata and analysis_result value, and full-row read time.
+"""
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+from typing import Any, Dict, List
+
+from utils.column_codec import ColumnCodec, MSGPACK_AVAILABLE
+from utils.database import Database
+
+WORDS = "vote rally booth election protest march meeting tonight square police अभी चलो मतदान".split()
+
+def generate_threats(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Threats with metadata and analysis results of realistic shape; about 1 in 10 carries message context"""
+    rng = random.Random(seed)
+    threats = []
+    for i in range(count):
+        score = rng.randint(0, 100)
+        metadata = {
+            "phone_numbers": [f"+91{rng.randint(6 * 10 ** 9, 10 ** 10 - 1)}" for _ in range(rng.randint(0, 3))],
+            "email_addresses": [f"user{rng.randint(0, 999)}@example.in" for _ in range(rng.randint(0, 2))],
+            "urls": [f"https://t.me/c/{rng.randint(0, 10 ** 6)}" for _ in range(rng.randint(0, 2))],
+            "hashtags": [f"#{rng.choice(WORDS)}" for _ in range(rng.randint(0, 4))],
+            "message_id": i,
+            "forwarded": rng.random() < 0.2
+        }
+        if rng.random() < 0.1:
+            metadata["context"] = [
+                {"sender": f"u{rng.randint(0, 500)}", "text": " ".join(rng.choices(WORDS, k=20))}
+                for _ in range(rng.randint(5, 30))
+            ]
+        analysis = {
+            "threat_score": score,
+            "risk_level": "high" if score >= 80 else "medium" if score >= 50 else "low",
+            "categories": {name: round(rng.random(), 3) for name in ("violence", "mobilization", "hate", "drugs")},
+            "keywords": rng.sample(WORDS, rng.randint(1, 6)),
+            "entities": [{"text": rng.choice(WORDS), "label": rng.choice(["LOC", "ORG", "PER"])} for _ in range(rng.randint(0, 5))],
+            "sentiment": {"polarity": round(rng.uniform(-1, 1), 3), "subjectivity": round(rng.random(), 3)},
+            "language": rng.choice(["en", "hi", "mixed"])
+        }
+        threats.append({
+            "platform": rng.choice(["telegram", "whatsapp", "instagram"]),
+            "channel": f"channel{rng.randint(0, 50)}",
+            "message": " ".join(rng.choices(WORDS, k=rng.randint(5, 40))),
+            "threat_score": score,
+            "risk_level": analysis["risk_level"],
+            "metadata": metadata,
+            "analysis_result": analysis
+        })
+    return threats
+
+def store(path: str, threats: List[Dict[str, Any]], codec: ColumnCodec = None) -> Database:
+    """Store the threats with a codec, or as legacy json.dumps text when codec is None"""
+    database = Database(path, codec=codec)
+    if codec is not None:
+        database.store_threats_many(threats)
+        return database
+    
+    legacy = [
+        {**threat, "metadata": {}, "analysis_result": {}}
+        for threat in threats
+    ]
+    database.store_threats_many(legacy)
+    conn = database._get_connection()
+    with conn:
+        conn.executemany(
+            "UPDATE threats SET metadata = ?, analysis_result = ? WHERE id = ?",
+            ((json.dumps(threat["metadata"]), json.dumps(threat["analysis_result"]), i + 1) for i, threat in enumerate(threats))
+        )
+    return database
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threats", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    threats = generate_threats(args.threats, args.seed)
+    settings = {
+        "legacy json.dumps": None,
+        "compact json": ColumnCodec("json", compress_threshold=None),
+        "json + zlib > 1 KB": ColumnCodec("json", compress_threshold=1024),
+        "json + zlib > 256 B": ColumnCodec("json", compress_threshold=256)
+    }
+    if MSGPACK_AVAILABLE:
+        settings["msgpack"] = ColumnCodec("msgpack", compress_threshold=None)
+        settings["msgpack + zlib > 1 KB"] = ColumnCodec("msgpack", compress_threshold=1024)
+    else:
+        print("msgpack is not installed; skipping the msgpack encodings")
+    
+    directory = tempfile.mkdtemp()
+    print(f"{'encoding':<24}{'file MB':>10}{'columns MB':>12}{'decode s':>10}{'read rows s':>13}")
+    for number, (name, codec) in enumerate(settings.items()):
+        path = os.path.join(directory, f"codec{number}.db")
+        database = store(path, threats, codec)
+        conn = database._get_connection()
+        conn.execute("VACUUM")
+        size = os.path.getsize(path) / 2 ** 20
+        stored = conn.execute("SELECT metadata, analysis_result FROM threats").fetchall()
+        column_bytes = sum(
+            len(value.encode("utf-8") if isinstance(value, str) else value) for row in stored for value in row
+        ) / 2 ** 20
+        
+        start = time.perf_counter()
+        for metadata, analysis_result in stored:
+            database.codec.decode(metadata)
+            database.codec.decode(analysis_result)
+        decode = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in database.iter_threats(batch_size=5000, lazy=False):
+            pass
+        read = time.perf_counter() - start
+        
+        print(f"{name:<24}{size:>10.1f}{column_bytes:>12.1f}{decode:>10.2f}{read:>13.2f}")
+        database.close()
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Single-row Database throughput with per-call against per-thread connections
+
+Run from the repository root:
+
+    python -m benchmarks.database_throughput [--writes 2000] [--reads 500] [--threads 4]
+
+The per-call baseline opens a fresh, untuned connection in every method, as
+Database did before connections were pooled. Each mode gets its own database
+file, since WAL journaling persists in the file once enabled.
+"""
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+from utils.database import Database
+
+class PerCallDatabase(Database):
+    """Database that connects on every call, with SQLite's default settings"""
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        # Closed when the calling method drops its last reference
+        return sqlite3.connect(self.db_path, timeout=self.timeout)
+
+def _threat(i: int) -> dict:
+    return {
+        "platform": "telegram",
+        "channel": f"channel{i % 20}",
+        "message": f"rally at booth {i} tonight",
+        "threat_score": i % 100,
+        "risk_level": "high" if i % 100 >= 80 else "low",
+        "metadata": {"sequence": i}
+    }
+
+def _rate(operations: int, threads: int, operation: Callable[[int], object]) -> float:
+    """Operations per second with the work split over threads"""
+    def work(offset: int):
+        for i in range(offset, operations, threads):
+            operation(i)
+    
+    workers = [threading.Thread(target=work, args=(offset,)) for offset in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return operations / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=2000, help="Single-row store_threat calls")
+    parser.add_argument("--reads", type=int, default=500, help="get_recent_threats calls")
+    parser.add_argument("--threads", type=int, default=4, help="Threads for the concurrent run")
+    args = parser.parse_args()
+    
+    directory = Path(tempfile.mkdtemp())
+    print(f"{'connections':<14}{'threads':>8}{'writes/s':>12}{'reads/s':>12}")
+    for name, database_class in (("per call", PerCallDatabase), ("per thread", Database)):
+        for threads in (1, args.threads):
+            database = database_class(str(directory / f"{name.replace(' ', '_')}_{threads}.db"))
+            writes = _rate(args.writes, threads, lambda i: database.store_threat(_threat(i)))
+            reads = _rate(args.reads, threads, lambda i: database.get_recent_threats(limit=50))
+            print(f"{name:<14}{threads:>8}{writes:>12,.0f}{reads:>12,.0f}")
+            database.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Database migrations on a large generated legacy database under concurrent writes
+
+Run from the repository root:
+
+    python -m benchmarks.migrations [--threats 1000000] [--accounts 100000]
+
+A database is generated in the schema that predates migrations, then opened
+with Database while another connection keeps inserting threats. Reports the
+migration time and how long the writer was blocked at worst.
+"""
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+
+from utils.database import Database
+
+LEGACY_THREATS = """
+    CREATE TABLE threats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        channel TEXT NOT NULL,
+        message TEXT NOT NULL,
+        threat_score INTEGER NOT NULL,
+        risk_level TEXT NOT NULL,
+        bot_detected BOOLEAN DEFAULT FALSE,
+        metadata TEXT,
+        analysis_result TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+LEGACY_ACCOUNTS = """
+    CREATE TABLE accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        platform TEXT NOT NULL,
+        threat_score INTEGER DEFAULT 0,
+        risk_level TEXT DEFAULT 'low',
+        bot_confidence REAL DEFAULT 0.0,
+        metadata TEXT,
+        first_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+        last_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+        message_count INTEGER DEFAULT 0
+    )
+"""
+
+INSERT_THREAT = """
+    INSERT INTO threats (platform, channel, message, threat_score, risk_level, metadata, analysis_result)
+    VALUES (?, 'channel', ?, ?, ?, ?, '{}')
+"""
+
+def generate(path: str, threats: int, accounts: int) -> None:
+    """Legacy database with JSON columns written by json.dumps"""
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(LEGACY_THREATS)
+        conn.execute(LEGACY_ACCOUNTS)
+        conn.executemany(INSERT_THREAT, (
+            (("telegram", "whatsapp", "twitter")[i % 3], f"rally at booth {i}", i % 100, "low",
+             json.dumps({"sequence": i, "tags": ["rally"]}))
+            for i in range(threats)
+        ))
+        conn.executemany(
+            "INSERT INTO accounts (username, platform, threat_score, metadata) VALUES (?, 'telegram', ?, ?)",
+            ((f"user{i}", i % 100, json.dumps({"phone_numbers": [f"+91{i:010d}"]})) for i in range(accounts))
+        )
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threats", type=int, default=1000000)
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--path", help="Where to generate the database; defaults to a temporary directory")
+    args = parser.parse_args()
+    
+    path = args.path or str(Path(tempfile.mkdtemp()) / "pindar.db")
+    start = time.perf_counter()
+    generate(path, args.threats, args.accounts)
+    print(f"generated {args.threats} threats and {args.accounts} accounts in {time.perf_counter() - start:.1f}s")
+    
+    stop = threading.Event()
+    latencies = []
+    
+    def write():
+        conn = sqlite3.connect(path, timeout=600)
+        while not stop.is_set():
+            began = time.perf_counter()
+            with conn:
+                conn.execute(INSERT_THREAT, ("telegram", "live", 50, "low", "{}"))
+            latencies.append(time.perf_counter() - began)
+            time.sleep(0.001)
+        conn.close()
+    
+    writer = threading.Thread(target=write)
+    writer.start()
+    start = time.perf_counter()
+    database = Database(path)
+    migration = time.perf_counter() - start
+    stop.set()
+    writer.join()
+    
+    print(f"migrated to schema version {database.schema_version()} in {migration:.1f}s")
+    print(
+        f"concurrent writer: {len(latencies)} inserts, "
+        f"median {statistics.median(latencies) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms"
+    )
+    statistics_row = database.get_statistics()
+    print(f"statistics: {statistics_row['total_threats']} threats, {statistics_row['total_accounts']} accounts")
+    database.close()
+
+if __name__ == "__main__":
+    main()
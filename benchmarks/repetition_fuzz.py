@@ -0,0 +1,107 @@
+"""
+Worst-case latency of BotDetector repetition detection on adversarial posts
+
+Run from the repository root:
+
+    python -m benchmarks.repetition_fuzz [--fuzz 2000] [--max-size 262144]
+
+Adversarial families grow until max-size and are timed with the default
+size/time budget, without the size cap, and with the backreference
+reference patterns the detector replaced. Then random fuzz posts are timed.
+"""
+import re
+import time
+import random
+import argparse
+import statistics
+from typing import Callable, Dict, List
+
+from core.detection.bot_detector import BotDetector
+
+DIGITS = ["0123456789", "٠١٢٣٤٥٦٧٨٩", "०१२३४५६७८९"]
+
+FAMILIES: Dict[str, Callable[[int, random.Random], str]] = {
+    "random_digits": lambda size, rng: "".join(rng.choice(DIGITS[0]) for _ in range(size)),
+    "random_devanagari_digits": lambda size, rng: "".join(rng.choice(DIGITS[2]) for _ in range(size)),
+    "near_repeated_digits": lambda size, rng: "12" * (size // 2 - 1) + "13",
+    "repeated_words_broken": lambda size, rng: "vote vote " * (size // 10) + "rally",
+    "distinct_words": lambda size, rng: " ".join(f"w{i}" for i in range(size // 6)),
+    "punctuation_pairs": lambda size, rng: "!?" * (size // 2)
+}
+
+def _time(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def _fuzz_post(rng: random.Random, max_size: int) -> str:
+    """Random post mixing digit runs, repeated words and punctuation"""
+    parts = []
+    while sum(map(len, parts)) < rng.randint(1, max_size):
+        kind = rng.random()
+        if kind < 0.4:
+            digits = rng.choice(DIGITS)
+            group = "".join(rng.choice(digits) for _ in range(rng.randint(1, 12)))
+            parts.append(group * rng.randint(1, 2) + "".join(rng.choice(digits) for _ in range(rng.randint(0, 4000))))
+        elif kind < 0.7:
+            parts.append(" ".join([rng.choice(["vote", "rally", "मतदान", "now"])] * rng.randint(1, 2)) + " ")
+        elif kind < 0.85:
+            parts.append("".join(rng.choice("!?.,;") for _ in range(rng.randint(1, 50))))
+        else:
+            parts.append(" ".join(f"w{rng.randint(0, 10 ** 6)}" for _ in range(rng.randint(1, 500))) + " ")
+    return "".join(parts)[:max_size]
+
+def run_families(max_size: int, legacy_limit: float) -> None:
+    bounded = BotDetector()
+    uncapped = BotDetector(max_message_chars=None)
+    legacy = [re.compile(pattern) for pattern in bounded.bot_patterns["repetitive_content"]]
+    rng = random.Random(0)
+    
+    print(f"{'family':<26}{'chars':>8}{'default ms':>12}{'uncapped ms':>13}{'legacy ms':>12}")
+    for name, generate in FAMILIES.items():
+        legacy_enabled = True
+        size = 1024
+        while size <= max_size:
+            post = generate(size, rng)
+            default_ms = _time(lambda: bounded._extract_message_features(post, "unknown")) * 1000
+            uncapped_ms = _time(lambda: uncapped._is_repetitive_content(post)) * 1000
+            legacy_ms = "skipped"
+            if legacy_enabled:
+                seconds = _time(lambda: any(pattern.search(post) for pattern in legacy))
+                legacy_ms = f"{seconds * 1000:.1f}"
+                # Larger inputs would only take longer
+                legacy_enabled = seconds < legacy_limit
+            print(f"{name:<26}{len(post):>8}{default_ms:>12.2f}{uncapped_ms:>13.2f}{legacy_ms:>12}")
+            size *= 4
+    print(f"time budget exceeded (uncapped): {uncapped.budget_exceeded} posts")
+
+def run_fuzz(count: int, max_size: int, seed: int) -> None:
+    detector = BotDetector()
+    rng = random.Random(seed)
+    timings: List[float] = []
+    for _ in range(count):
+        post = _fuzz_post(rng, max_size)
+        timings.append(_time(lambda: detector._extract_message_features(post, "unknown")))
+    
+    timings.sort()
+    print(
+        f"fuzz: {count} posts up to {max_size} chars, "
+        f"median {statistics.median(timings) * 1000:.2f} ms, "
+        f"p99 {timings[int(0.99 * (len(timings) - 1))] * 1000:.2f} ms, "
+        f"max {timings[-1] * 1000:.2f} ms, "
+        f"time budget exceeded {detector.budget_exceeded}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-size", type=int, default=262144, help="Largest adversarial post in characters")
+    parser.add_argument("--legacy-limit", type=float, default=2.0, help="Stop timing a reference family past this many seconds")
+    parser.add_argument("--fuzz", type=int, default=2000, help="Number of random fuzz posts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    run_families(args.max_size, args.legacy_limit)
+    run_fuzz(args.fuzz, args.max_size, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Throughput of the SQLite, DuckDB and PostgreSQL storage backends
+
+Run from the repository root:
+
+    python -m benchmarks.storage_backends [--threats 100000] [--postgres postgresql://localhost/pindar_bench]
+
+Each backend bulk-inserts the same generated threats, then serves repeated
+get_recent_threats and search_threats calls, and finally runs a cleanup
+that deletes the older half. PostgreSQL runs only when --postgres is given;
+its tables go into a temporary schema that is dropped afterwards.
+"""
+import time
+import uuid
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.storage_backend import StorageBackend, create_database
+
+KEYWORDS = "vote rally booth election protest march meeting police".split()
+QUERIES = ["rally", "vote AND booth", "protest*"]
+
+def generate_threats(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    threats = []
+    for i in range(count):
+        score = rng.randint(0, 100)
+        threats.append({
+            "platform": rng.choice(["telegram", "whatsapp", "instagram"]),
+            "channel": f"channel{rng.randint(0, 50)}",
+            # Mostly everyday vocabulary, with a keyword in about one message in five
+            "message": " ".join(
+                rng.choice(KEYWORDS) if rng.random() < 0.02 else f"w{rng.randint(0, 5000)}"
+                for _ in range(rng.randint(4, 20))
+            ),
+            "threat_score": score,
+            "risk_level": "high" if score >= 80 else "medium" if score >= 50 else "low",
+            "metadata": {"sequence": i, "hashtags": [f"#{rng.choice(KEYWORDS)}"]},
+            "analysis_result": {"threat_score": score}
+        })
+    return threats
+
+def backdate(db: StorageBackend, days: int) -> None:
+    """Move every stored threat back in time, in the backend's SQL dialect"""
+    name = type(db).__name__
+    if name == "PostgresDatabase":
+        with db._cursor() as cursor:
+            cursor.execute(f"UPDATE threats SET timestamp = timestamp - interval '{days} days'")
+    elif name == "DuckDBDatabase":
+        db._get_connection().execute(f"UPDATE threats SET timestamp = timestamp - INTERVAL {days} DAY")
+    else:
+        conn = db._get_connection()
+        with conn:
+            conn.execute(f"UPDATE threats SET timestamp = datetime(timestamp, '-{days} days')")
+
+def run(name: str, db: StorageBackend, threats: List[Dict[str, Any]], reads: int) -> None:
+    half = len(threats) // 2
+    
+    start = time.perf_counter()
+    db.store_threats_many(threats[:half])
+    elapsed = time.perf_counter() - start
+    # The older half becomes due for cleanup
+    backdate(db, 60)
+    start = time.perf_counter()
+    db.store_threats_many(threats[half:])
+    insert = len(threats) / (elapsed + time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    for _ in range(reads):
+        db.get_recent_threats(limit=50)
+    recent = reads / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    for i in range(reads):
+        db.search_threats(QUERIES[i % len(QUERIES)], limit=50)
+    search = reads / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    deleted = db.cleanup_old_data(days=30)
+    cleanup = time.perf_counter() - start
+    
+    print(f"{name:<10}{insert:>14,.0f}{recent:>12,.0f}{search:>12,.0f}{cleanup:>12.2f}{deleted:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threats", type=int, default=100000)
+    parser.add_argument("--reads", type=int, default=200, help="get_recent_threats and search_threats calls")
+    parser.add_argument("--postgres", help="PostgreSQL DSN to include the PostgreSQL backend")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    threats = generate_threats(args.threats, args.seed)
+    directory = Path(tempfile.mkdtemp())
+    print(f"{'backend':<10}{'inserts/s':>14}{'recent/s':>12}{'search/s':>12}{'cleanup s':>12}{'deleted':>10}")
+    
+    db = create_database(f"sqlite:///{directory}/pindar.db")
+    run("sqlite", db, threats, args.reads)
+    db.close()
+    
+    try:
+        db = create_database(f"duckdb:///{directory}/pindar.duckdb")
+    except RuntimeError as e:
+        print(f"duckdb    skipped: {e}")
+    else:
+        run("duckdb", db, threats, args.reads)
+        db.close()
+    
+    if args.postgres:
+        import psycopg2
+        
+        schema = f"pindar_bench_{uuid.uuid4().hex}"
+        admin = psycopg2.connect(args.postgres)
+        admin.autocommit = True
+        admin.cursor().execute(f"CREATE SCHEMA {schema}")
+        separator = "&" if "?" in args.postgres else "?"
+        try:
+            db = create_database(f"{args.postgres}{separator}options=-csearch_path%3D{schema}")
+            run("postgres", db, threats, args.reads)
+            db.close()
+        finally:
+            admin.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+            admin.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,106 @@
 import re
 import time
-from typing import Dict, List, Any, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple, Iterable
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
 
 class BotDetector:
     """
     Bot detection system for identifying automated behavior patterns
     """
     
-    def __init__(self):
+    # Column layout of the per-message feature matrix
+    MESSAGE_FEATURES = (
+        "repetitive_content",
+        "template_usage",
+        "emoji_count",
+        "char_count",
+        "url",
+        "hashtag",
+        "formal_language",
+        "casual_language",
+        "mixed_language",
+        "spelling_errors",
+        "capitalization",
+        "bot_commands",
+        "platform_specific",
+        "cross_platform"
+    )
+    FEATURE_INDEX = {name: i for i, name in enumerate(MESSAGE_FEATURES)}
+    
+    # Account-level features shared by every scoring path (batch, incremental, windowed)
+    ACCOUNT_FEATURES = (
+        ("content", "repetitive_content"),
+        ("content", "template_usage"),
+        ("content", "emoji_density"),
+        ("content", "identical_messages"),
+        ("content", "url_density"),
+        ("content", "hashtag_density"),
+        ("timing", "message_frequency"),
+        ("timing", "response_time"),
+        ("timing", "regular_posting"),
+        ("timing", "burst_posting"),
+        ("timing", "interval_cv"),
+        ("timing", "burst_ratio"),
+        ("timing", "hour_entropy"),
+        ("language", "formal_language"),
+        ("language", "casual_language"),
+        ("language", "mixed_language"),
+        ("language", "spelling_errors"),
+        ("language", "capitalization"),
+        ("platform", "bot_commands"),
+        ("platform", "platform_specific"),
+        ("platform", "cross_platform")
+    )
+    
+    _EPOCH = datetime(1970, 1, 1)
+    _MICROSECOND = timedelta(microseconds=1)
+    
+    def __init__(self, model_path: str = None, max_message_chars: int = 4096, message_time_budget: float = 0.005):
+        """
+        Args:
+            model_path: Optional path to a trained BotModel replacing the hand weights
+            max_message_chars: Longest prefix of a message, or of one digit run,
+                searched for repeated words and digit groups
+            message_time_budget: Seconds allowed for repetition search in one message;
+                a message that runs out of time counts as repetitive
+        """
+        self.max_message_chars = max_message_chars
+        self.message_time_budget = message_time_budget
+        self.budget_exceeded = 0
+        
         self.bot_patterns = self._load_bot_patterns()
         self.behavior_thresholds = self._load_behavior_thresholds()
         self.template_phrases = self._load_template_phrases()
+        self.language_indicators = self._load_language_indicators()
+        self.platform_indicators = self._load_platform_indicators()
+        self.generic_phrases = self._load_generic_phrases()
+        
+        # Compile every pattern set once; each text is then scanned a single time per bank
+        self._word_regex = re.compile(r'\w+')
+        self._digit_run_regex = re.compile(r'\d{3,}')
+        self._punctuation_run_regex = re.compile(r'([^\w\s])\1\1')
+        self._bot_command_regex = re.compile(
+            self._combine_patterns(self.bot_patterns["bot_commands"]), re.IGNORECASE
+        )
+        self._phrase_regex, self._phrase_categories = self._compile_phrase_bank()
+        self._url_regex = re.compile(r'https?://\S+|www\.\S+')
+        self._hashtag_regex = re.compile(r'#\w+')
+        self._repeated_char_regex = re.compile(r'(.)\1{2,}')
+        
+        # Optional trained model that replaces the hand-tuned weights
+        self.model = None
+        if model_path:
+            from core.detection.bot_model import load_bot_model
+            self.model = load_bot_model(model_path)
         
     def _load_bot_patterns(self) -> Dict[str, List[str]]:
         """Load patterns that indicate bot behavior"""
         return {
+            # Reference definitions; matched in linear time by _is_repetitive_content
             "repetitive_content": [
                 r'(\b\w+\b)(?:\s+\1){2,}',  # Repeated words
                 r'([^\w\s])\1{2,}',  # Repeated punctuation
@@ -91,6 +175,106 @@ class BotDetector:
             "trusted dealer"
         ]
     
+    def _load_language_indicators(self) -> Dict[str, List[str]]:
+        """Load phrases that indicate formal or casual writing style"""
+        return {
+            "formal": [
+                "please", "kindly", "regards", "sincerely", "thank you",
+                "would you", "could you", "may i", "shall we"
+            ],
+            "casual": [
+                "hey", "hi", "yo", "what's up", "cool", "awesome",
+                "lol", "omg", "wtf", "btw", "imo", "tbh"
+            ]
+        }
+    
+    def _load_platform_indicators(self) -> Dict[str, List[str]]:
+        """Load platform-specific content indicators"""
+        return {
+            "telegram": ["@", "t.me", "/start", "/help"],
+            "whatsapp": ["wa.me", "whatsapp", "group"],
+            "instagram": ["#", "@", "instagram", "ig", "story"]
+        }
+    
+    def _load_generic_phrases(self) -> List[str]:
+        """Load generic phrases used for cross-platform content"""
+        return [
+            "contact for details", "dm for info", "available now",
+            "best quality", "delivery available", "cash only"
+        ]
+    
+    def _combine_patterns(self, patterns: List[str]) -> str:
+        """Join regex patterns into one alternation, renumbering backreferences"""
+        combined = []
+        offset = 0
+        for pattern in patterns:
+            shifted = re.sub(r'\\(\d+)', lambda match: '\\' + str(int(match.group(1)) + offset), pattern)
+            combined.append(f"(?:{shifted})")
+            offset += re.compile(pattern).groups
+        return "|".join(combined)
+    
+    def _compile_phrase_bank(self) -> Tuple[re.Pattern, Dict[str, frozenset]]:
+        """
+        Compile every phrase set into one multi-pattern matcher
+        
+        The matcher is a lookahead alternation, so it reports a match at every
+        position (overlapping phrases are not lost) and prefers the longest
+        phrase there. Each phrase maps to its own categories plus those of every
+        phrase that is a prefix of it, which keeps substring semantics exact.
+        
+        Returns:
+            Tuple of (compiled matcher, phrase -> categories)
+        """
+        categories = defaultdict(set)
+        phrase_sets = [
+            ("template", self.template_phrases),
+            ("formal", self.language_indicators["formal"]),
+            ("casual", self.language_indicators["casual"]),
+            ("cross_platform", self.generic_phrases)
+        ]
+        phrase_sets.extend(
+            (f"platform:{platform}", indicators)
+            for platform, indicators in self.platform_indicators.items()
+        )
+        for category, phrases in phrase_sets:
+            for phrase in phrases:
+                categories[phrase].add(category)
+        
+        closed = {
+            phrase: frozenset().union(*(
+                categories[prefix] for prefix in categories if phrase.startswith(prefix)
+            ))
+            for phrase in categories
+        }
+        
+        alternation = "|".join(re.escape(phrase) for phrase in sorted(categories, key=len, reverse=True))
+        return re.compile(f"(?=({alternation}))"), closed
+    
+    def scan_text_categories(self, text: str, platform: str = "unknown") -> Dict[str, bool]:
+        """
+        Classify a text against every phrase and command bank in one scan
+        
+        Args:
+            text: Message text
+            platform: Platform where the message was found
+            
+        Returns:
+            Dictionary of category flags
+        """
+        platform = platform.lower()
+        found = set()
+        for match in self._phrase_regex.finditer(text.lower()):
+            found |= self._phrase_categories[match.group(1)]
+        
+        return {
+            "template_usage": "template" in found,
+            "formal_language": "formal" in found,
+            "casual_language": "casual" in found,
+            "cross_platform": "cross_platform" in found,
+            "platform_specific": f"platform:{platform}" in found,
+            "bot_commands": platform == "telegram" and self._bot_command_regex.search(text) is not None
+        }
+    
     def detect_bot_behavior(self, messages: List[Dict[str, Any]], platform: str = "unknown") -> Dict[str, Any]:
         """
         Detect bot behavior from a list of messages
@@ -105,38 +289,269 @@ class BotDetector:
         if not messages:
             return self._empty_detection_result()
         
-        # Initialize detection results
-        detection = {
-            "is_bot": False,
-            "confidence": 0.0,
-            "indicators": [],
-            "behavior_patterns": {},
-            "risk_score": 0,
-            "timestamp": datetime.now().isoformat()
-        }
-        
         # Extract text content
         texts = [msg.get("text", "") for msg in messages]
         timestamps = [msg.get("timestamp", datetime.now()) for msg in messages]
         
-        # 1. Content Analysis
-        content_analysis = self._analyze_content_patterns(texts)
-        detection["behavior_patterns"]["content"] = content_analysis
+        # Single feature-extraction pass over every message
+        features = self._build_feature_matrix(texts, platform)
+        
+        behavior_patterns = {
+            # 1. Content Analysis
+            "content": self._analyze_content_patterns(features, texts),
+            # 2. Timing Analysis
+            "timing": self._analyze_timing_patterns(timestamps),
+            # 3. Language Analysis
+            "language": self._analyze_language_patterns(features),
+            # 4. Platform-specific Analysis
+            "platform": self._analyze_platform_patterns(features)
+        }
+        
+        return self._detection_from_patterns(behavior_patterns)
+    
+    def detect_bot_behavior_windowed(
+        self,
+        messages: List[Dict[str, Any]],
+        platform: str = "unknown",
+        window: timedelta = timedelta(hours=24),
+        step: timedelta = None,
+        half_life: timedelta = None,
+        jump_threshold: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """
+        Score an account's messages as a time series of windows
+        
+        Args:
+            messages: List of message dictionaries with text, timestamp, etc.
+            platform: Platform where messages were found
+            window: Length of each scoring window
+            step: Distance between window ends; None gives tumbling windows
+            half_life: Optional half-life for exponential decay inside a window
+            jump_threshold: Score change that is flagged as a regime change
+            
+        Returns:
+            List of score points ordered by window end
+        """
+        from core.detection.bot_window import WindowedBotDetector
+        
+        windowed = WindowedBotDetector(
+            window=window,
+            step=step,
+            half_life=half_life,
+            jump_threshold=jump_threshold,
+            platform=platform,
+            detector=self
+        )
+        series = windowed.score_series(messages, key=None)
+        return series.get(None, [])
+    
+    def detect_many(
+        self,
+        messages: List[Dict[str, Any]],
+        key: str = "sender",
+        platform: str = "unknown",
+        processes: int = None
+    ) -> pd.DataFrame:
+        """
+        Detect bot behavior for many accounts in one batch
+        
+        Args:
+            messages: List of message dictionaries from any number of accounts
+            key: Message field that identifies the account
+            platform: Platform where messages were found
+            processes: Number of worker processes; None or 1 runs in-process
+            
+        Returns:
+            DataFrame with one row per account
+        """
+        if processes and processes > 1:
+            return self._detect_many_parallel(messages, key, platform, processes)
+        
+        # Group messages by account in one pass
+        account_index = {}
+        groups = np.empty(len(messages), dtype=np.int64)
+        texts = []
+        timestamps = []
+        for i, msg in enumerate(messages):
+            groups[i] = account_index.setdefault(msg.get(key, "unknown"), len(account_index))
+            texts.append(msg.get("text", ""))
+            timestamps.append(msg.get("timestamp", datetime.now()))
+        
+        # An empty batch flows through the same path, so it has the same columns
+        accounts = list(account_index)
+        
+        # Feature extraction over the whole batch, then per-account column totals
+        features = self._build_feature_matrix(texts, platform)
+        counts = np.bincount(groups, minlength=len(accounts)).astype(np.float64)
+        totals = np.column_stack([
+            np.bincount(groups, weights=features[:, j], minlength=len(accounts))
+            for j in range(features.shape[1])
+        ])
+        
+        # Identical messages per account
+        seen = set()
+        identical = np.zeros(len(accounts))
+        for group, text in zip(groups.tolist(), texts):
+            if (group, text) in seen:
+                identical[group] += 1
+            seen.add((group, text))
+        
+        behavior_patterns = {
+            "content": self._content_from_totals(totals.T, counts, identical),
+            "timing": self._timing_batch(groups, timestamps, len(accounts)),
+            "language": self._language_from_totals(totals.T, counts),
+            "platform": self._platform_from_totals(totals.T, counts)
+        }
+        probabilities = self._score_behavior_patterns(behavior_patterns)
+        
+        results = pd.DataFrame({
+            "account": accounts if accounts else pd.Series([], dtype=object),
+            "message_count": counts.astype(np.int64),
+            "bot_probability": probabilities,
+            "is_bot": probabilities > 0.7,
+            "risk_score": (probabilities * 100).astype(np.int64)
+        })
+        for section, analysis in behavior_patterns.items():
+            for name, values in analysis.items():
+                results[f"{section}_{name}"] = values
+        
+        return results
+    
+    def _detect_many_parallel(self, messages: List[Dict[str, Any]], key: str, platform: str, processes: int) -> pd.DataFrame:
+        """Split a batch by account across worker processes"""
+        chunks = [[] for _ in range(processes)]
+        assignment = {}
+        for msg in messages:
+            account = msg.get(key, "unknown")
+            if account not in assignment:
+                assignment[account] = len(assignment) % processes
+            chunks[assignment[account]].append(msg)
+        
+        chunks = [chunk for chunk in chunks if chunk]
+        if len(chunks) <= 1:
+            return self.detect_many(messages, key, platform)
+        
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            frames = list(executor.map(
+                _detect_many_worker,
+                [(self, chunk, key, platform) for chunk in chunks]
+            ))
+        
+        return pd.concat(frames, ignore_index=True)
+    
+    def _timing_batch(self, groups: np.ndarray, timestamps: List[Any], account_count: int) -> Dict[str, np.ndarray]:
+        """Per-account timing analysis for a grouped batch of timestamps"""
+        epochs = np.fromiter(
+            (self._epoch_microseconds(ts) for ts in timestamps),
+            dtype=np.int64,
+            count=len(timestamps)
+        )
+        
+        # Sort by account, then time, so each account is a contiguous run
+        order = np.lexsort((epochs, groups))
+        groups = groups[order]
+        epochs = epochs[order]
+        
+        counts = np.bincount(groups, minlength=account_count)
+        starts = np.cumsum(counts) - counts
+        first = epochs[starts]
+        last = epochs[starts + counts - 1]
+        
+        # Intervals within the same account only
+        same_account = groups[1:] == groups[:-1]
+        interval_groups = groups[1:][same_account]
+        intervals = (np.diff(epochs) / 1e6)[same_account]
+        
+        interval_counts = np.bincount(interval_groups, minlength=account_count)
+        interval_sums = np.bincount(interval_groups, weights=intervals, minlength=account_count)
+        interval_sq_sums = np.bincount(interval_groups, weights=intervals ** 2, minlength=account_count)
+        short_counts = np.bincount(interval_groups, weights=intervals < 60, minlength=account_count)
+        
+        has_intervals = interval_counts > 0
+        mean_interval = np.divide(interval_sums, interval_counts, out=np.zeros(account_count), where=has_intervals)
+        variance = np.maximum(0.0, np.divide(
+            interval_sq_sums, interval_counts, out=np.zeros(account_count), where=has_intervals
+        ) - mean_interval ** 2)
+        
+        interval_min = np.full(account_count, np.inf)
+        interval_max = np.full(account_count, -np.inf)
+        np.minimum.at(interval_min, interval_groups, intervals)
+        np.maximum.at(interval_max, interval_groups, intervals)
         
-        # 2. Timing Analysis
-        timing_analysis = self._analyze_timing_patterns(timestamps, texts)
-        detection["behavior_patterns"]["timing"] = timing_analysis
+        time_span = (last - first) / 1e6 / 3600
+        positive_mean = mean_interval > 0
         
-        # 3. Language Analysis
-        language_analysis = self._analyze_language_patterns(texts)
-        detection["behavior_patterns"]["language"] = language_analysis
+        hours = (epochs // 3_600_000_000) % 24
+        hour_counts = np.bincount(groups * 24 + hours, minlength=account_count * 24).reshape(account_count, 24)
+        probabilities = hour_counts / counts[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.nansum(np.where(hour_counts > 0, probabilities * np.log2(probabilities), 0.0), axis=1)
         
-        # 4. Platform-specific Analysis
-        platform_analysis = self._analyze_platform_patterns(texts, platform)
-        detection["behavior_patterns"]["platform"] = platform_analysis
+        return {
+            "message_frequency": np.divide(counts, time_span, out=np.zeros(account_count), where=time_span > 0),
+            "response_time": mean_interval,
+            "regular_posting": (
+                (interval_counts >= 2) & positive_mean &
+                (interval_min > 0.8 * mean_interval) & (interval_max < 1.2 * mean_interval)
+            ),
+            "burst_posting": (interval_counts >= 2) & (short_counts >= counts * 0.3),
+            "interval_cv": np.divide(np.sqrt(variance), mean_interval, out=np.zeros(account_count), where=positive_mean),
+            "burst_ratio": np.divide(short_counts, interval_counts, out=np.zeros(account_count), where=has_intervals),
+            "hour_entropy": np.where(counts >= 2, entropy / np.log2(24), 0.0)
+        }
+    
+    def detect_bot_behavior_stream(
+        self,
+        messages: Iterable[Dict[str, Any]],
+        platform: str = "unknown",
+        sample_size: int = 10000,
+        confidence_level: float = 0.95,
+        seed: int = None
+    ) -> Dict[str, Any]:
+        """
+        Detect bot behavior from a message iterator in bounded memory
+        
+        Args:
+            messages: Iterable of message dictionaries, in time order
+            platform: Platform where messages were found
+            sample_size: Number of messages sampled for the text features
+            confidence_level: Confidence level of the reported error bounds
+            seed: Optional random seed for reproducible samples
+            
+        Returns:
+            Bot detection results with sampling error bounds
+        """
+        from core.detection.bot_stream import StreamingBotDetector
+        
+        streaming = StreamingBotDetector(
+            sample_size=sample_size,
+            confidence_level=confidence_level,
+            seed=seed,
+            detector=self
+        )
+        return streaming.detect(messages, platform)
+    
+    def _detection_from_patterns(self, behavior_patterns: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score behavior patterns and build the detection result
+        
+        Args:
+            behavior_patterns: Content, timing, language and platform analyses
+            
+        Returns:
+            Bot detection results with confidence and indicators
+        """
+        detection = {
+            "is_bot": False,
+            "confidence": 0.0,
+            "indicators": [],
+            "behavior_patterns": behavior_patterns,
+            "risk_score": 0,
+            "timestamp": datetime.now().isoformat()
+        }
         
         # 5. Calculate overall bot probability
-        bot_probability = self._calculate_bot_probability(detection["behavior_patterns"])
+        bot_probability = self._calculate_bot_probability(behavior_patterns)
         detection["confidence"] = bot_probability
         
         # 6. Determine if it's a bot
@@ -146,174 +561,273 @@ class BotDetector:
         detection["risk_score"] = int(bot_probability * 100)
         
         # 8. Generate indicators
-        detection["indicators"] = self._generate_indicators(detection["behavior_patterns"])
+        detection["indicators"] = self._generate_indicators(behavior_patterns)
         
         return detection
     
-    def _analyze_content_patterns(self, texts: List[str]) -> Dict[str, Any]:
-        """Analyze content for repetitive patterns"""
-        analysis = {
-            "repetitive_content": 0.0,
-            "template_usage": 0.0,
-            "emoji_density": 0.0,
-            "identical_messages": 0.0,
-            "url_density": 0.0,
-            "hashtag_density": 0.0
-        }
+    def _build_feature_matrix(self, texts: List[str], platform: str = "unknown") -> np.ndarray:
+        """
+        Build the per-message feature matrix
         
-        if not texts:
-            return analysis
+        Args:
+            texts: Message texts
+            platform: Platform where messages were found
+            
+        Returns:
+            Array of shape (len(texts), len(MESSAGE_FEATURES))
+        """
+        platform = platform.lower()
+        rows = [self._extract_message_features(text, platform) for text in texts]
+        if not rows:
+            return np.zeros((0, len(self.MESSAGE_FEATURES)), dtype=np.float64)
+        return np.array(rows, dtype=np.float64)
+    
+    def _extract_message_features(self, text: str, platform: str) -> Tuple[float, ...]:
+        """Extract the fixed-width feature row for one message in a single pass"""
+        flags = self.scan_text_categories(text, platform)
+        formal = flags["formal_language"]
+        casual = not formal and flags["casual_language"]
         
-        # Repetitive content
-        repetitive_count = 0
-        for text in texts:
-            if self._is_repetitive_content(text):
-                repetitive_count += 1
-        analysis["repetitive_content"] = repetitive_count / len(texts)
-        
-        # Template usage
-        template_count = 0
-        for text in texts:
-            if self._contains_template_phrases(text):
-                template_count += 1
-        analysis["template_usage"] = template_count / len(texts)
-        
-        # Emoji density
-        total_emojis = sum(self._count_emojis(text) for text in texts)
-        total_chars = sum(len(text) for text in texts)
-        analysis["emoji_density"] = total_emojis / total_chars if total_chars > 0 else 0.0
-        
-        # Identical messages
+        char_count = len(text)
+        upper_count = sum(1 for char in text if char.isupper()) if char_count >= 10 else 0
+        
+        return (
+            float(self._is_repetitive_content(text)),
+            float(flags["template_usage"]),
+            float(sum(1 for char in text if ord(char) > 127)),
+            float(char_count),
+            float(self._url_regex.search(text) is not None),
+            float(self._hashtag_regex.search(text) is not None),
+            float(formal),
+            float(casual),
+            float(not formal and not casual),
+            float(self._repeated_char_regex.search(text) is not None),
+            float(char_count >= 10 and upper_count / char_count > 0.7),
+            float(flags["bot_commands"]),
+            float(flags["platform_specific"]),
+            float(flags["cross_platform"])
+        )
+    
+    def _safe_ratio(self, numerator: Any, denominator: Any) -> Any:
+        """Elementwise numerator / denominator, 0.0 where the denominator is not positive"""
+        numerator = np.asarray(numerator, dtype=np.float64)
+        denominator = np.asarray(denominator, dtype=np.float64)
+        out = np.zeros(np.broadcast(numerator, denominator).shape)
+        np.divide(numerator, denominator, out=out, where=denominator > 0)
+        return float(out) if out.ndim == 0 else out
+    
+    def _ratios_from_totals(self, totals: np.ndarray, count: Any, names: List[str]) -> Dict[str, Any]:
+        """
+        Per-message ratios for the named features from feature column totals
+        
+        totals may be a single totals row with a scalar count, or a
+        (features x accounts) matrix with an array of counts.
+        """
+        return {name: self._safe_ratio(totals[self.FEATURE_INDEX[name]], count) for name in names}
+    
+    def _content_from_totals(self, totals: np.ndarray, count: Any, identical_count: Any) -> Dict[str, Any]:
+        """Build the content analysis from feature column totals"""
+        ratios = self._ratios_from_totals(totals, count, ["repetitive_content", "template_usage", "url", "hashtag"])
+        
+        # Emoji density is a ratio of totals, not a mean of per-message ratios
+        total_chars = totals[self.FEATURE_INDEX["char_count"]]
+        total_emojis = totals[self.FEATURE_INDEX["emoji_count"]]
+        
+        return {
+            "repetitive_content": ratios["repetitive_content"],
+            "template_usage": ratios["template_usage"],
+            "emoji_density": self._safe_ratio(total_emojis, total_chars),
+            "identical_messages": self._safe_ratio(identical_count, count),
+            "url_density": ratios["url"],
+            "hashtag_density": ratios["hashtag"]
+        }
+    
+    def _analyze_content_patterns(self, features: np.ndarray, texts: List[str]) -> Dict[str, Any]:
+        """Analyze content for repetitive patterns"""
         text_counter = Counter(texts)
         identical_count = sum(count - 1 for count in text_counter.values() if count > 1)
-        analysis["identical_messages"] = identical_count / len(texts)
-        
-        # URL density
-        url_count = sum(1 for text in texts if self._contains_urls(text))
-        analysis["url_density"] = url_count / len(texts)
+        return self._content_from_totals(features.sum(axis=0), len(texts), identical_count)
+    
+    def _timestamps_to_epoch(self, timestamps: List[Any]) -> np.ndarray:
+        """
+        Convert timestamps to a sorted int64 array of epoch microseconds
         
-        # Hashtag density
-        hashtag_count = sum(1 for text in texts if self._contains_hashtags(text))
-        analysis["hashtag_density"] = hashtag_count / len(texts)
+        Args:
+            timestamps: datetimes (naive or aware), ISO strings or epoch seconds
+            
+        Returns:
+            Sorted int64 array
+        """
+        if not timestamps:
+            return np.zeros(0, dtype=np.int64)
         
-        return analysis
+        epochs = np.fromiter(
+            (self._epoch_microseconds(ts) for ts in timestamps),
+            dtype=np.int64,
+            count=len(timestamps)
+        )
+        epochs.sort()
+        return epochs
+    
+    def _epoch_microseconds(self, ts: Any) -> int:
+        """Convert a single timestamp to epoch microseconds"""
+        if isinstance(ts, datetime):
+            if ts.tzinfo is not None:
+                ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+            return (ts - self._EPOCH) // self._MICROSECOND
+        if isinstance(ts, str):
+            return self._epoch_microseconds(datetime.fromisoformat(ts))
+        return int(round(float(ts) * 1_000_000))
     
-    def _analyze_timing_patterns(self, timestamps: List[datetime], texts: List[str]) -> Dict[str, Any]:
+    def _analyze_timing_patterns(self, timestamps: List[Any]) -> Dict[str, Any]:
         """Analyze timing patterns for bot behavior"""
+        return self._timing_from_epochs(self._timestamps_to_epoch(timestamps))
+    
+    def _timing_from_epochs(self, epochs: np.ndarray) -> Dict[str, Any]:
+        """Timing analysis from a sorted array of epoch microseconds"""
         analysis = {
             "message_frequency": 0.0,
             "response_time": 0.0,
             "regular_posting": False,
-            "burst_posting": False
+            "burst_posting": False,
+            "interval_cv": 0.0,
+            "burst_ratio": 0.0,
+            "hour_entropy": 0.0,
+            "periodicity": 0.0,
+            "dominant_period": 0.0
         }
         
-        if len(timestamps) < 2:
+        if len(epochs) < 2:
             return analysis
         
-        # Sort by timestamp
-        sorted_data = sorted(zip(timestamps, texts), key=lambda x: x[0])
-        timestamps = [t for t, _ in sorted_data]
+        intervals = np.diff(epochs) / 1e6  # seconds
         
         # Calculate message frequency (messages per hour)
-        time_span = (timestamps[-1] - timestamps[0]).total_seconds() / 3600
-        analysis["message_frequency"] = len(timestamps) / time_span if time_span > 0 else 0.0
-        
-        # Calculate average response time
-        response_times = []
-        for i in range(1, len(timestamps)):
-            response_time = (timestamps[i] - timestamps[i-1]).total_seconds()
-            response_times.append(response_time)
+        time_span = (epochs[-1] - epochs[0]) / 1e6 / 3600
+        analysis["message_frequency"] = len(epochs) / time_span if time_span > 0 else 0.0
         
-        if response_times:
-            analysis["response_time"] = sum(response_times) / len(response_times)
+        # Inter-arrival statistics
+        mean_interval = float(intervals.mean())
+        analysis["response_time"] = mean_interval
+        analysis["interval_cv"] = float(intervals.std() / mean_interval) if mean_interval > 0 else 0.0
+        analysis["burst_ratio"] = float(np.count_nonzero(intervals < 60) / len(intervals))
         
-        # Check for regular posting patterns
-        analysis["regular_posting"] = self._is_regular_posting(timestamps)
-        
-        # Check for burst posting
-        analysis["burst_posting"] = self._is_burst_posting(timestamps)
+        analysis["regular_posting"] = self._is_regular_posting(intervals)
+        analysis["burst_posting"] = self._is_burst_posting(intervals)
+        analysis["hour_entropy"] = self._hour_of_day_entropy(epochs)
+        analysis["periodicity"], analysis["dominant_period"] = self._posting_periodicity(epochs)
         
         return analysis
     
-    def _analyze_language_patterns(self, texts: List[str]) -> Dict[str, Any]:
+    def _analyze_language_patterns(self, features: np.ndarray) -> Dict[str, Any]:
         """Analyze language patterns for bot indicators"""
-        analysis = {
-            "formal_language": 0.0,
-            "casual_language": 0.0,
-            "mixed_language": 0.0,
-            "spelling_errors": 0.0,
-            "capitalization": 0.0
-        }
-        
-        if not texts:
-            return analysis
-        
-        for text in texts:
-            # Check language style
-            if self._is_formal_language(text):
-                analysis["formal_language"] += 1
-            elif self._is_casual_language(text):
-                analysis["casual_language"] += 1
-            else:
-                analysis["mixed_language"] += 1
-            
-            # Check spelling errors
-            if self._has_spelling_errors(text):
-                analysis["spelling_errors"] += 1
-            
-            # Check excessive capitalization
-            if self._has_excessive_capitalization(text):
-                analysis["capitalization"] += 1
-        
-        # Normalize counts
-        total = len(texts)
-        for key in analysis:
-            analysis[key] = analysis[key] / total
-        
-        return analysis
+        return self._language_from_totals(features.sum(axis=0), len(features))
+    
+    def _language_from_totals(self, totals: np.ndarray, count: int) -> Dict[str, Any]:
+        """Build the language analysis from feature column totals"""
+        return self._ratios_from_totals(totals, count, [
+            "formal_language",
+            "casual_language",
+            "mixed_language",
+            "spelling_errors",
+            "capitalization"
+        ])
     
-    def _analyze_platform_patterns(self, texts: List[str], platform: str) -> Dict[str, Any]:
+    def _analyze_platform_patterns(self, features: np.ndarray) -> Dict[str, Any]:
         """Analyze platform-specific patterns"""
-        analysis = {
-            "bot_commands": 0.0,
-            "platform_specific": 0.0,
-            "cross_platform": 0.0
-        }
+        return self._platform_from_totals(features.sum(axis=0), len(features))
+    
+    def _platform_from_totals(self, totals: np.ndarray, count: int) -> Dict[str, Any]:
+        """Build the platform analysis from feature column totals"""
+        return self._ratios_from_totals(totals, count, [
+            "bot_commands",
+            "platform_specific",
+            "cross_platform"
+        ])
+    
+    def _is_repetitive_content(self, text: str) -> bool:
+        """
+        Check if text contains repetitive patterns
         
-        if not texts:
-            return analysis
+        Only the repeated word and digit group searches are capped; when the
+        digit search runs out of time the message is reported as repetitive,
+        since a post that long made of digits is suspect either way.
+        """
+        if self._punctuation_run_regex.search(text):
+            return True
+        if self._has_repeated_words(text):
+            return True
+        
+        deadline = time.perf_counter() + self.message_time_budget
+        for match in self._digit_run_regex.finditer(text):
+            found = self._has_repeated_digit_group(match.group(), deadline)
+            if found is None:
+                self.budget_exceeded += 1
+                return True
+            if found:
+                return True
+        return False
+    
+    def _has_repeated_words(self, text: str) -> bool:
+        """
+        Detect a word repeated three times in a row via token run-length
         
-        for text in texts:
-            # Check for bot commands
-            if self._contains_bot_commands(text, platform):
-                analysis["bot_commands"] += 1
+        Same semantics as the repeated-words reference pattern, including the
+        final repetition being a prefix of a longer word, in linear time.
+        """
+        text = text[:self.max_message_chars]
+        previous_word = None
+        previous_end = 0
+        run = 0
+        for match in self._word_regex.finditer(text):
+            word = match.group().lower()
+            separated = previous_word is not None and text[previous_end:match.start()].isspace()
             
-            # Check for platform-specific patterns
-            if self._is_platform_specific(text, platform):
-                analysis["platform_specific"] += 1
+            if separated and run >= 2 and word.startswith(previous_word):
+                return True
+            if separated and word == previous_word:
+                run += 1
+            else:
+                run = 1
             
-            # Check for cross-platform content
-            if self._is_cross_platform_content(text):
-                analysis["cross_platform"] += 1
+            previous_word = word
+            previous_end = match.end()
+        return False
+    
+    def _has_repeated_digit_group(self, digits: str, deadline: float) -> Any:
+        """
+        Detect a digit group repeated three times in a row (reference pattern)
         
-        # Normalize counts
-        total = len(texts)
-        for key in analysis:
-            analysis[key] = analysis[key] / total
+        A cube of period p exists iff 2p consecutive positions satisfy
+        digits[i] == digits[i + p], so each period is a linear scan.
         
-        return analysis
-    
-    def _is_repetitive_content(self, text: str) -> bool:
-        """Check if text contains repetitive patterns"""
-        for pattern in self.bot_patterns["repetitive_content"]:
-            if re.search(pattern, text, re.IGNORECASE):
+        Returns:
+            True/False, or None when the time budget ran out
+        """
+        digits = digits[:self.max_message_chars]
+        length = len(digits)
+        if length <= 64:
+            for period in range(1, length // 3 + 1):
+                run = 0
+                for i in range(length - period):
+                    run = run + 1 if digits[i] == digits[i + period] else 0
+                    if run >= 2 * period:
+                        return True
+            return False
+        
+        # Code points, since \d also matches non-ASCII digits such as Devanagari
+        values = np.fromiter(map(ord, digits), dtype=np.uint32, count=length)
+        for period in range(1, length // 3 + 1):
+            equal = np.concatenate(([0], np.cumsum(values[period:] == values[:-period])))
+            if np.any(equal[2 * period:] - equal[:-2 * period] == 2 * period):
                 return True
+            if time.perf_counter() > deadline:
+                return None
         return False
     
     def _contains_template_phrases(self, text: str) -> bool:
         """Check if text contains template phrases"""
-        text_lower = text.lower()
-        return any(phrase in text_lower for phrase in self.template_phrases)
+        return self.scan_text_categories(text)["template_usage"]
     
     def _count_emojis(self, text: str) -> int:
         """Count emoji characters in text"""
@@ -321,70 +835,98 @@ class BotDetector:
     
     def _contains_urls(self, text: str) -> bool:
         """Check if text contains URLs"""
-        url_pattern = r'https?://\S+|www\.\S+'
-        return bool(re.search(url_pattern, text))
+        return bool(self._url_regex.search(text))
     
     def _contains_hashtags(self, text: str) -> bool:
         """Check if text contains hashtags"""
-        hashtag_pattern = r'#\w+'
-        return bool(re.search(hashtag_pattern, text))
+        return bool(self._hashtag_regex.search(text))
     
-    def _is_regular_posting(self, timestamps: List[datetime]) -> bool:
+    def _is_regular_posting(self, intervals: np.ndarray) -> bool:
         """Check if posting follows a regular pattern"""
-        if len(timestamps) < 3:
+        if len(intervals) < 2:
             return False
         
-        intervals = []
-        for i in range(1, len(timestamps)):
-            interval = (timestamps[i] - timestamps[i-1]).total_seconds()
-            intervals.append(interval)
-        
         # Check if intervals are consistent (within 20% variation)
-        if len(intervals) < 2:
+        avg_interval = intervals.mean()
+        if avg_interval <= 0:
             return False
         
-        avg_interval = sum(intervals) / len(intervals)
-        variations = [abs(interval - avg_interval) / avg_interval for interval in intervals]
-        
-        return all(variation < 0.2 for variation in variations)
+        return bool(np.all(np.abs(intervals - avg_interval) / avg_interval < 0.2))
     
-    def _is_burst_posting(self, timestamps: List[datetime]) -> bool:
+    def _is_burst_posting(self, intervals: np.ndarray) -> bool:
         """Check if posting shows burst patterns"""
-        if len(timestamps) < 3:
+        if len(intervals) < 2:
             return False
         
-        # Check for multiple posts within short time intervals
-        short_intervals = 0
-        for i in range(1, len(timestamps)):
-            interval = (timestamps[i] - timestamps[i-1]).total_seconds()
-            if interval < 60:  # Less than 1 minute
-                short_intervals += 1
+        # Check for multiple posts within short time intervals (less than 1 minute)
+        short_intervals = np.count_nonzero(intervals < 60)
+        return bool(short_intervals >= (len(intervals) + 1) * 0.3)
+    
+    def _hour_of_day_entropy(self, epochs: np.ndarray) -> float:
+        """Normalized Shannon entropy of the hour-of-day posting distribution"""
+        if len(epochs) == 0:
+            return 0.0
         
-        return short_intervals >= len(timestamps) * 0.3
+        hours = (epochs // 3_600_000_000) % 24
+        counts = np.bincount(hours, minlength=24)
+        probabilities = counts[counts > 0] / len(epochs)
+        entropy = -np.sum(probabilities * np.log2(probabilities))
+        return float(entropy / np.log2(24))
+    
+    def _posting_periodicity(self, epochs: np.ndarray, max_bins: int = 65536) -> Tuple[float, float]:
+        """
+        Detect periodic posting from the autocorrelation of the activity series
+        
+        Args:
+            epochs: Sorted epoch microseconds
+            max_bins: Upper bound on the number of time bins
+            
+        Returns:
+            Tuple of (peak autocorrelation in 0-1, period in seconds)
+        """
+        span = (epochs[-1] - epochs[0]) / 1e6
+        bin_width = max(60.0, span / max_bins)
+        
+        bins = ((epochs - epochs[0]) / 1e6 // bin_width).astype(np.int64)
+        series = np.bincount(bins).astype(np.float64)
+        if len(series) < 6:
+            return 0.0, 0.0
+        
+        centered = series - series.mean()
+        variance = float(np.dot(centered, centered))
+        if variance == 0:
+            return 0.0, 0.0
+        
+        # Autocorrelation via FFT, zero-padded to avoid circular wrap-around
+        size = 1 << (2 * len(centered) - 1).bit_length()
+        spectrum = np.fft.rfft(centered, size)
+        autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(centered)] / variance
+        
+        # Ignore lag 1 so that plain bursts are not reported as periodic
+        candidates = autocorrelation[2:len(centered) // 2 + 1]
+        if len(candidates) == 0:
+            return 0.0, 0.0
+        
+        # Report the shortest lag that is close to the strongest peak, so that
+        # harmonics of the true period are not reported instead of the period itself
+        strongest = float(candidates.max())
+        if strongest <= 0:
+            return 0.0, 0.0
+        peak = int(np.argmax(candidates >= 0.9 * strongest))
+        return strongest, (peak + 2) * bin_width
     
     def _is_formal_language(self, text: str) -> bool:
         """Check if text uses formal language"""
-        formal_indicators = [
-            "please", "kindly", "regards", "sincerely", "thank you",
-            "would you", "could you", "may i", "shall we"
-        ]
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in formal_indicators)
+        return self.scan_text_categories(text)["formal_language"]
     
     def _is_casual_language(self, text: str) -> bool:
         """Check if text uses casual language"""
-        casual_indicators = [
-            "hey", "hi", "yo", "what's up", "cool", "awesome",
-            "lol", "omg", "wtf", "btw", "imo", "tbh"
-        ]
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in casual_indicators)
+        return self.scan_text_categories(text)["casual_language"]
     
     def _has_spelling_errors(self, text: str) -> bool:
         """Check for obvious spelling errors"""
         # Simple heuristic - check for repeated characters
-        repeated_chars = re.findall(r'(.)\1{2,}', text)
-        return len(repeated_chars) > 0
+        return bool(self._repeated_char_regex.search(text))
     
     def _has_excessive_capitalization(self, text: str) -> bool:
         """Check for excessive capitalization"""
@@ -397,34 +939,32 @@ class BotDetector:
     def _contains_bot_commands(self, text: str, platform: str) -> bool:
         """Check for bot commands"""
         if platform.lower() == "telegram":
-            for pattern in self.bot_patterns["bot_commands"]:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return True
+            return self._bot_command_regex.search(text) is not None
         return False
     
     def _is_platform_specific(self, text: str, platform: str) -> bool:
         """Check for platform-specific content"""
-        platform_indicators = {
-            "telegram": ["@", "t.me", "/start", "/help"],
-            "whatsapp": ["wa.me", "whatsapp", "group"],
-            "instagram": ["#", "@", "instagram", "ig", "story"]
-        }
-        
-        indicators = platform_indicators.get(platform.lower(), [])
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return self.scan_text_categories(text, platform)["platform_specific"]
     
     def _is_cross_platform_content(self, text: str) -> bool:
         """Check if content is generic enough for cross-platform use"""
-        generic_phrases = [
-            "contact for details", "dm for info", "available now",
-            "best quality", "delivery available", "cash only"
-        ]
-        text_lower = text.lower()
-        return any(phrase in text_lower for phrase in generic_phrases)
+        return self.scan_text_categories(text)["cross_platform"]
     
     def _calculate_bot_probability(self, behavior_patterns: Dict[str, Any]) -> float:
         """Calculate overall bot probability from behavior patterns"""
+        return float(self._score_behavior_patterns(behavior_patterns))
+    
+    def _score_behavior_patterns(self, behavior_patterns: Dict[str, Any]) -> Any:
+        """
+        Weighted bot score of behavior patterns
+        
+        Pattern values may be scalars or NumPy arrays (one entry per account),
+        so the same weights score a single account or a whole batch.
+        """
+        if self.model is not None:
+            probabilities = self.model.predict_proba(self._account_feature_matrix(behavior_patterns))
+            return probabilities if self._is_batch(behavior_patterns) else probabilities[0]
+        
         probability = 0.0
         weights = {
             "content": 0.4,
@@ -446,12 +986,9 @@ class BotDetector:
         # Timing analysis weight
         timing = behavior_patterns.get("timing", {})
         timing_score = 0.0
-        if timing.get("message_frequency", 0) > self.behavior_thresholds["message_frequency"]:
-            timing_score += 0.5
-        if timing.get("response_time", 0) < self.behavior_thresholds["response_time"]:
-            timing_score += 0.3
-        if timing.get("regular_posting", False):
-            timing_score += 0.2
+        timing_score += (np.asarray(timing.get("message_frequency", 0)) > self.behavior_thresholds["message_frequency"]) * 0.5
+        timing_score += (np.asarray(timing.get("response_time", 0)) < self.behavior_thresholds["response_time"]) * 0.3
+        timing_score += np.asarray(timing.get("regular_posting", False), dtype=bool) * 0.2
         probability += timing_score * weights["timing"]
         
         # Language analysis weight
@@ -471,7 +1008,61 @@ class BotDetector:
         )
         probability += platform_score * weights["platform"]
         
-        return min(1.0, probability)
+        return np.minimum(1.0, probability)
+    
+    def _is_batch(self, behavior_patterns: Dict[str, Any]) -> bool:
+        """Whether behavior patterns hold per-account arrays rather than scalars"""
+        return any(
+            np.ndim(value) > 0
+            for analysis in behavior_patterns.values()
+            for value in analysis.values()
+        )
+    
+    def _account_feature_matrix(self, behavior_patterns: Dict[str, Any]) -> np.ndarray:
+        """
+        Stack behavior patterns into an account feature matrix
+        
+        Args:
+            behavior_patterns: Scalar patterns for one account or array patterns for many
+            
+        Returns:
+            Array of shape (accounts, len(ACCOUNT_FEATURES))
+        """
+        columns = [
+            np.atleast_1d(np.asarray(behavior_patterns.get(section, {}).get(name, 0.0), dtype=np.float64))
+            for section, name in self.ACCOUNT_FEATURES
+        ]
+        length = max(len(column) for column in columns)
+        return np.column_stack([np.broadcast_to(column, (length,)) for column in columns])
+    
+    def account_features_from_frame(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Account feature matrix from a detect_many result
+        
+        Args:
+            frame: DataFrame returned by detect_many
+            
+        Returns:
+            Array of shape (len(frame), len(ACCOUNT_FEATURES))
+        """
+        return frame[[f"{section}_{name}" for section, name in self.ACCOUNT_FEATURES]].to_numpy(dtype=np.float64)
+    
+    def patterns_from_account_features(self, features: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Rebuild array behavior patterns from an account feature matrix
+        
+        Args:
+            features: Array of shape (accounts, len(ACCOUNT_FEATURES))
+            
+        Returns:
+            Behavior patterns with one array entry per account
+        """
+        patterns = defaultdict(dict)
+        for column, (section, name) in enumerate(self.ACCOUNT_FEATURES):
+            patterns[section][name] = features[:, column]
+        for name in ("regular_posting", "burst_posting"):
+            patterns["timing"][name] = patterns["timing"][name].astype(bool)
+        return dict(patterns)
     
     def _generate_indicators(self, behavior_patterns: Dict[str, Any]) -> List[str]:
         """Generate human-readable indicators"""
@@ -501,6 +1092,8 @@ class BotDetector:
             indicators.append("Mechanical posting schedule")
         if timing.get("burst_posting", False):
             indicators.append("Burst posting patterns")
+        if timing.get("periodicity", 0) > 0.8:
+            indicators.append("Periodic posting cycle")
         
         # Language indicators
         if language.get("formal_language", 0) > 0.7:
@@ -527,4 +1120,9 @@ class BotDetector:
             "behavior_patterns": {},
             "risk_score": 0,
             "timestamp": datetime.now().isoformat()
-        } 
\ No newline at end of file
+        }
+
+def _detect_many_worker(args: Tuple[BotDetector, List[Dict[str, Any]], str, str]) -> pd.DataFrame:
+    """Process-pool entry point for BotDetector.detect_many"""
+    detector, messages, key, platform = args
+    return detector.detect_many(messages, key, platform)
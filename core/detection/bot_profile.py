@@ -0,0 +1,237 @@
+import hashlib
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+from collections import Counter
+import numpy as np
+
+from core.detection.bot_detector import BotDetector
+
+class BotProfile:
+    """
+    Incremental bot scoring state for a single account
+    """
+    
+    def __init__(self, account: str, platform: str = "unknown", detector: BotDetector = None):
+        # Only running counters are kept, never the message history
+        self.account = account
+        self.platform = platform
+        self.detector = detector or BotDetector()
+        
+        # Content, language and platform counters
+        self.message_count = 0
+        self.feature_totals = np.zeros(len(BotDetector.MESSAGE_FEATURES), dtype=np.float64)
+        self.text_hashes = Counter()
+        self.identical_count = 0
+        
+        # Timing counters (epoch microseconds / seconds)
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.interval_count = 0
+        self.interval_sum = 0.0
+        self.interval_sum_sq = 0.0
+        self.interval_min = None
+        self.interval_max = None
+        self.short_interval_count = 0
+        self.hour_counts = np.zeros(24, dtype=np.int64)
+    
+    def update(self, message: Dict[str, Any], text_features: bool = True) -> None:
+        """
+        Fold a new message into the profile
+        
+        Messages are expected roughly in time order. An out-of-order message
+        still counts towards content, frequency and hour-of-day statistics but
+        does not contribute an inter-arrival interval.
+        
+        Args:
+            message: Message dictionary with text and timestamp
+            text_features: Whether to extract text features; when False only
+                the message count and timing statistics are updated
+        """
+        timestamp = self.detector._epoch_microseconds(message.get("timestamp", datetime.now()))
+        self.message_count += 1
+        
+        if text_features:
+            text = message.get("text", "")
+            self.feature_totals += self.detector._extract_message_features(text, self.platform.lower())
+            
+            text_hash = self._hash_text(text)
+            if text_hash in self.text_hashes:
+                self.identical_count += 1
+            self.text_hashes[text_hash] += 1
+        
+        self.hour_counts[(timestamp // 3_600_000_000) % 24] += 1
+        self._update_intervals(timestamp)
+    
+    def update_many(self, messages: List[Dict[str, Any]]) -> None:
+        """Fold a batch of messages into the profile"""
+        for message in messages:
+            self.update(message)
+    
+    def _update_intervals(self, timestamp: int) -> None:
+        """Update the running interval moments with a new timestamp"""
+        if self.first_timestamp is None:
+            self.first_timestamp = self.last_timestamp = timestamp
+            return
+        
+        self.first_timestamp = min(self.first_timestamp, timestamp)
+        if timestamp < self.last_timestamp:
+            return
+        
+        interval = (timestamp - self.last_timestamp) / 1e6
+        self.last_timestamp = timestamp
+        
+        self.interval_count += 1
+        self.interval_sum += interval
+        self.interval_sum_sq += interval * interval
+        self.interval_min = interval if self.interval_min is None else min(self.interval_min, interval)
+        self.interval_max = interval if self.interval_max is None else max(self.interval_max, interval)
+        if interval < 60:
+            self.short_interval_count += 1
+    
+    def _hash_text(self, text: str) -> str:
+        """Compact hash used to count identical messages"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+    
+    def behavior_patterns(self) -> Dict[str, Any]:
+        """
+        Current behavior patterns, in the same layout as detect_bot_behavior
+        
+        Returns:
+            Content, timing, language and platform analyses
+        """
+        return {
+            "content": self.detector._content_from_totals(
+                self.feature_totals, self.message_count, self.identical_count
+            ),
+            "timing": self.timing_patterns(),
+            "language": self.detector._language_from_totals(self.feature_totals, self.message_count),
+            "platform": self.detector._platform_from_totals(self.feature_totals, self.message_count)
+        }
+    
+    def timing_patterns(self) -> Dict[str, Any]:
+        """
+        Timing analysis from the running interval moments
+        
+        Periodicity needs the autocorrelation of the full posting history,
+        which the profile does not keep, so it is always reported as 0.0.
+        """
+        analysis = {
+            "message_frequency": 0.0,
+            "response_time": 0.0,
+            "regular_posting": False,
+            "burst_posting": False,
+            "interval_cv": 0.0,
+            "burst_ratio": 0.0,
+            "hour_entropy": 0.0,
+            "periodicity": 0.0,
+            "dominant_period": 0.0
+        }
+        
+        if self.message_count < 2:
+            return analysis
+        
+        time_span = (self.last_timestamp - self.first_timestamp) / 1e6 / 3600
+        analysis["message_frequency"] = self.message_count / time_span if time_span > 0 else 0.0
+        analysis["hour_entropy"] = self._hour_entropy()
+        
+        if self.interval_count == 0:
+            return analysis
+        
+        mean_interval = self.interval_sum / self.interval_count
+        variance = max(0.0, self.interval_sum_sq / self.interval_count - mean_interval ** 2)
+        analysis["response_time"] = mean_interval
+        analysis["interval_cv"] = variance ** 0.5 / mean_interval if mean_interval > 0 else 0.0
+        analysis["burst_ratio"] = self.short_interval_count / self.interval_count
+        
+        # Every interval within 20% of the mean <=> min and max within 20% of the mean
+        analysis["regular_posting"] = (
+            self.interval_count >= 2 and mean_interval > 0 and
+            self.interval_min > 0.8 * mean_interval and
+            self.interval_max < 1.2 * mean_interval
+        )
+        analysis["burst_posting"] = (
+            self.interval_count >= 2 and
+            self.short_interval_count >= self.message_count * 0.3
+        )
+        
+        return analysis
+    
+    def _hour_entropy(self) -> float:
+        """Normalized entropy of the hour-of-day histogram"""
+        counts = self.hour_counts[self.hour_counts > 0]
+        probabilities = counts / self.message_count
+        return float(-np.sum(probabilities * np.log2(probabilities)) / np.log2(24))
+    
+    def bot_probability(self) -> float:
+        """Current bot probability (0-1)"""
+        if self.message_count == 0:
+            return 0.0
+        return self.detector._calculate_bot_probability(self.behavior_patterns())
+    
+    def get_detection(self) -> Dict[str, Any]:
+        """
+        Current detection result for the account
+        
+        Returns:
+            Bot detection results in the same format as detect_bot_behavior
+        """
+        if self.message_count == 0:
+            detection = self.detector._empty_detection_result()
+        else:
+            detection = self.detector._detection_from_patterns(self.behavior_patterns())
+        detection["account"] = self.account
+        detection["message_count"] = self.message_count
+        return detection
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the profile to a JSON-compatible dictionary
+        
+        Returns:
+            Profile state
+        """
+        return {
+            "account": self.account,
+            "platform": self.platform,
+            "message_count": self.message_count,
+            "feature_totals": self.feature_totals.tolist(),
+            "text_hashes": dict(self.text_hashes),
+            "identical_count": self.identical_count,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "interval_count": self.interval_count,
+            "interval_sum": self.interval_sum,
+            "interval_sum_sq": self.interval_sum_sq,
+            "interval_min": self.interval_min,
+            "interval_max": self.interval_max,
+            "short_interval_count": self.short_interval_count,
+            "hour_counts": self.hour_counts.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], detector: BotDetector = None) -> "BotProfile":
+        """
+        Restore a profile serialized with to_dict
+        
+        Args:
+            data: Profile state
+            detector: Optional shared BotDetector instance
+        
+        Returns:
+            Restored profile
+        """
+        profile = cls(data["account"], data.get("platform", "unknown"), detector)
+        profile.message_count = data["message_count"]
+        profile.feature_totals = np.array(data["feature_totals"], dtype=np.float64)
+        profile.text_hashes = Counter(data["text_hashes"])
+        profile.identical_count = data["identical_count"]
+        profile.first_timestamp = data["first_timestamp"]
+        profile.last_timestamp = data["last_timestamp"]
+        profile.interval_count = data["interval_count"]
+        profile.interval_sum = data["interval_sum"]
+        profile.interval_sum_sq = data["interval_sum_sq"]
+        profile.interval_min = data["interval_min"]
+        profile.interval_max = data["interval_max"]
+        profile.short_interval_count = data["short_interval_count"]
+        profile.hour_counts = np.array(data["hour_counts"], dtype=np.int64)
+        return profile
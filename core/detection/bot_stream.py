@@ -0,0 +1,192 @@
+import heapq
+import hashlib
+import random
+from statistics import NormalDist
+from typing import Dict, List, Any, Iterable
+from datetime import datetime
+import numpy as np
+
+from core.detection.bot_detector import BotDetector
+from core.detection.bot_profile import BotProfile
+
+class StreamingBotDetector:
+    """
+    Bounded-memory bot detection over a message iterator using reservoir sampling
+    """
+    
+    def __init__(self, sample_size: int = 10000, confidence_level: float = 0.95, seed: int = None, detector: BotDetector = None):
+        """
+        Args:
+            sample_size: Number of messages kept for the text features
+            confidence_level: Confidence level of the reported error bounds
+            seed: Optional random seed for reproducible samples
+            detector: Optional shared BotDetector instance
+        """
+        self.sample_size = sample_size
+        self.confidence_level = confidence_level
+        self.random = random.Random(seed)
+        self.detector = detector or BotDetector()
+    
+    def detect(self, messages: Iterable[Dict[str, Any]], platform: str = "unknown") -> Dict[str, Any]:
+        """
+        Detect bot behavior from a message iterator in bounded memory
+        
+        Message count and timing statistics are exact (messages are expected in
+        time order). Text features come from a uniform reservoir sample, and the
+        identical-message ratio from a k-minimum-values distinct-count sketch.
+        
+        Args:
+            messages: Iterable of message dictionaries with text, timestamp, etc.
+            platform: Platform where messages were found
+        
+        Returns:
+            Bot detection results with a "sampling" section holding error bounds
+        """
+        timing = BotProfile("stream", platform, self.detector)
+        reservoir = []
+        sketch = []
+        sketch_members = set()
+        
+        for message in messages:
+            timing.update(message, text_features=False)
+            
+            # Algorithm R: every message ends up in the sample with equal probability
+            if len(reservoir) < self.sample_size:
+                reservoir.append(message)
+            else:
+                slot = self.random.randrange(timing.message_count)
+                if slot < self.sample_size:
+                    reservoir[slot] = message
+            
+            self._update_sketch(sketch, sketch_members, message.get("text", ""))
+        
+        if timing.message_count == 0:
+            return self.detector._empty_detection_result()
+        
+        count = timing.message_count
+        texts = [message.get("text", "") for message in reservoir]
+        features = self.detector._build_feature_matrix(texts, platform)
+        
+        distinct, distinct_bound = self._estimate_distinct(sketch, count)
+        identical_count = count - distinct
+        
+        totals = features.sum(axis=0) * (count / len(reservoir))
+        behavior_patterns = {
+            "content": self.detector._content_from_totals(totals, count, identical_count),
+            "timing": timing.timing_patterns(),
+            "language": self.detector._language_from_totals(totals, count),
+            "platform": self.detector._platform_from_totals(totals, count)
+        }
+        
+        # Periodicity survives uniform thinning, so it is estimated from the sample
+        sampled_epochs = self.detector._timestamps_to_epoch(
+            [message.get("timestamp", datetime.now()) for message in reservoir]
+        )
+        if len(sampled_epochs) >= 2:
+            sampled_timing = self.detector._timing_from_epochs(sampled_epochs)
+            behavior_patterns["timing"]["periodicity"] = sampled_timing["periodicity"]
+            behavior_patterns["timing"]["dominant_period"] = sampled_timing["dominant_period"]
+        
+        detection = self.detector._detection_from_patterns(behavior_patterns)
+        
+        error_bounds = self._feature_error_bounds(features, count)
+        error_bounds["content"]["identical_messages"] = distinct_bound / count
+        detection["sampling"] = {
+            "sampled": len(reservoir) < count,
+            "sample_size": len(reservoir),
+            "message_count": count,
+            "confidence_level": self.confidence_level,
+            "error_bounds": error_bounds,
+            "bot_probability_bound": self._probability_bound(behavior_patterns, error_bounds)
+        }
+        
+        return detection
+    
+    def _update_sketch(self, sketch: List[float], members: set, text: str) -> None:
+        """Keep the k smallest normalized text hashes (k-minimum-values sketch)"""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big") / 2 ** 64
+        if value in members:
+            return
+        if len(sketch) < self.sample_size:
+            heapq.heappush(sketch, -value)
+            members.add(value)
+        elif value < -sketch[0]:
+            members.discard(-heapq.heappushpop(sketch, -value))
+            members.add(value)
+    
+    def _estimate_distinct(self, sketch: List[float], count: int) -> tuple:
+        """Distinct-text estimate and its error bound from the KMV sketch"""
+        if len(sketch) < self.sample_size:
+            return len(sketch), 0.0
+        
+        kth_smallest = -sketch[0]
+        estimate = min(count, (self.sample_size - 1) / kth_smallest)
+        relative_error = self._z_score() / np.sqrt(max(1, self.sample_size - 2))
+        return estimate, estimate * relative_error
+    
+    def _z_score(self) -> float:
+        """Two-sided normal quantile for the configured confidence level"""
+        return NormalDist().inv_cdf(0.5 + self.confidence_level / 2)
+    
+    def _feature_error_bounds(self, features: np.ndarray, count: int) -> Dict[str, Dict[str, float]]:
+        """Confidence half-widths of the sampled feature ratios"""
+        sample = len(features)
+        if sample >= count or sample < 2:
+            correction = 0.0
+        else:
+            correction = np.sqrt((count - sample) / (count - 1))
+        z = self._z_score()
+        
+        def ratio_bound(name: str) -> float:
+            p = features[:, self.detector.FEATURE_INDEX[name]].mean()
+            return float(z * np.sqrt(p * (1 - p) / sample) * correction)
+        
+        # Ratio estimator (delta method) for emoji density
+        chars = features[:, self.detector.FEATURE_INDEX["char_count"]]
+        emojis = features[:, self.detector.FEATURE_INDEX["emoji_count"]]
+        emoji_bound = 0.0
+        if chars.sum() > 0 and sample >= 2:
+            ratio = emojis.sum() / chars.sum()
+            residuals = emojis - ratio * chars
+            emoji_bound = float(z * np.sqrt(residuals.var(ddof=1) / sample) / chars.mean() * correction)
+        
+        return {
+            "content": {
+                "repetitive_content": ratio_bound("repetitive_content"),
+                "template_usage": ratio_bound("template_usage"),
+                "emoji_density": emoji_bound,
+                "url_density": ratio_bound("url"),
+                "hashtag_density": ratio_bound("hashtag")
+            },
+            "language": {
+                name: ratio_bound(name)
+                for name in ["formal_language", "casual_language", "mixed_language", "spelling_errors", "capitalization"]
+            },
+            "platform": {
+                name: ratio_bound(name)
+                for name in ["bot_commands", "platform_specific", "cross_platform"]
+            }
+        }
+    
+    def _probability_bound(self, behavior_patterns: Dict[str, Any], error_bounds: Dict[str, Dict[str, float]]) -> float:
+        """
+        Propagate feature error bounds to the bot probability
+        
+        Each sampled feature is moved by its bound in both directions and the
+        largest resulting change in probability is summed over features, which
+        is conservative for both the weighted heuristic and a trained model.
+        """
+        base = self.detector._calculate_bot_probability(behavior_patterns)
+        bound = 0.0
+        for section, bounds in error_bounds.items():
+            for name, half_width in bounds.items():
+                if half_width == 0:
+                    continue
+                changes = []
+                for direction in (-1, 1):
+                    perturbed = {key: dict(value) for key, value in behavior_patterns.items()}
+                    perturbed[section][name] = max(0.0, perturbed[section][name] + direction * half_width)
+                    changes.append(abs(self.detector._calculate_bot_probability(perturbed) - base))
+                bound += max(changes)
+        return bound
@@ -0,0 +1,212 @@
+import hashlib
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+from collections import deque, defaultdict
+import numpy as np
+
+from core.detection.bot_detector import BotDetector
+
+class WindowedBotDetector:
+    """
+    Sliding-window bot scoring with time-decayed features
+    """
+    
+    def __init__(
+        self,
+        window: timedelta = timedelta(hours=24),
+        step: timedelta = None,
+        half_life: timedelta = None,
+        capacity: int = 10000,
+        jump_threshold: float = 0.3,
+        history: int = 1000,
+        platform: str = "unknown",
+        detector: BotDetector = None
+    ):
+        """
+        Args:
+            window: Length of each scoring window
+            step: Distance between window ends; None gives tumbling windows
+            half_life: Half-life of the exponential decay applied inside a window
+            capacity: Maximum messages buffered per account
+            jump_threshold: Score change that is flagged as a regime change
+            history: Maximum score points kept per account
+            platform: Platform where messages were found
+            detector: Optional shared BotDetector instance
+        """
+        self.window = int(window.total_seconds() * 1_000_000)
+        self.step = int((step or window).total_seconds() * 1_000_000)
+        self.half_life = half_life.total_seconds() * 1_000_000 if half_life else None
+        self.capacity = capacity
+        self.jump_threshold = jump_threshold
+        self.history = history
+        self.platform = platform
+        self.detector = detector or BotDetector()
+        
+        # Per-account ring buffers of (epoch microseconds, feature row, text hash)
+        self.buffers = defaultdict(lambda: deque(maxlen=self.capacity))
+        self.next_window_end = {}
+        self.last_score = {}
+        self.series = defaultdict(lambda: deque(maxlen=self.history))
+    
+    def update(self, account: str, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Add a message for an account and emit any windows it closes
+        
+        Messages for an account are expected in time order.
+        
+        Args:
+            account: Account identifier
+            message: Message dictionary with text and timestamp
+        
+        Returns:
+            Score points for the windows closed by this message
+        """
+        text = message.get("text", "")
+        timestamp = self.detector._epoch_microseconds(message.get("timestamp", datetime.now()))
+        
+        points = []
+        if account not in self.next_window_end:
+            self.next_window_end[account] = self._first_end_after(timestamp)
+        
+        buffer = self.buffers[account]
+        while self.next_window_end[account] <= timestamp:
+            if not buffer:
+                self.next_window_end[account] = self._first_end_after(timestamp)
+                break
+            
+            # Windows ending at or before the oldest buffered message are empty;
+            # jump to the first end whose window contains it
+            if self.next_window_end[account] <= buffer[0][0]:
+                self.next_window_end[account] = self._first_end_after(buffer[0][0])
+                continue
+            
+            points.append(self._emit(account, self.next_window_end[account]))
+            self.next_window_end[account] += self.step
+        
+        features = self.detector._extract_message_features(text, self.platform.lower())
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+        self.buffers[account].append((timestamp, np.array(features), text_hash))
+        
+        return [point for point in points if point is not None]
+    
+    def score_series(self, messages: List[Dict[str, Any]], key: Optional[str] = "sender") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Score a batch of messages into per-account time series
+        
+        Args:
+            messages: List of message dictionaries
+            key: Message field that identifies the account, or None when
+                all messages belong to a single account
+        
+        Returns:
+            Dictionary mapping account to its score points, including the
+            final partial window
+        """
+        ordered = sorted(
+            messages,
+            key=lambda msg: self.detector._epoch_microseconds(msg.get("timestamp", datetime.now()))
+        )
+        
+        series = defaultdict(list)
+        for message in ordered:
+            account = message.get(key, "unknown") if key else None
+            series[account].extend(self.update(account, message))
+        
+        for account, point in self.flush().items():
+            series[account].append(point)
+        
+        return dict(series)
+    
+    def flush(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Score the in-progress window of every account
+        
+        Intended for the end of a batch or shutdown. The open windows are
+        scored provisionally: buffered messages, the recorded series and the
+        last score are left untouched, so flushing again gives the same points.
+        
+        Returns:
+            Dictionary mapping account to its provisional score point
+        """
+        points = {}
+        for account, window_end in self.next_window_end.items():
+            point = self._score(account, window_end)
+            if point is not None:
+                points[account] = point
+        return points
+    
+    def get_series(self, account: str) -> List[Dict[str, Any]]:
+        """Score points emitted so far for an account (bounded by history)"""
+        return list(self.series.get(account, []))
+    
+    def _first_end_after(self, epoch: int) -> int:
+        """Earliest step-aligned window end strictly after epoch"""
+        return (epoch // self.step + 1) * self.step
+    
+    def _emit(self, account: str, window_end: int) -> Optional[Dict[str, Any]]:
+        """Score the window ending at window_end, record the point and evict expired messages"""
+        point = self._score(account, window_end)
+        
+        # Drop entries that fall before the start of the next window
+        buffer = self.buffers[account]
+        next_window_start = window_end + self.step - self.window
+        while buffer and buffer[0][0] < next_window_start:
+            buffer.popleft()
+        
+        if point is not None:
+            self.last_score[account] = point["bot_probability"]
+            self.series[account].append(point)
+        return point
+    
+    def _score(self, account: str, window_end: int) -> Optional[Dict[str, Any]]:
+        """Score the window ending at window_end without changing any state"""
+        buffer = self.buffers[account]
+        window_start = window_end - self.window
+        
+        entries = [entry for entry in buffer if window_start <= entry[0] < window_end]
+        if not entries:
+            return None
+        
+        epochs = np.array([entry[0] for entry in entries], dtype=np.int64)
+        features = np.vstack([entry[1] for entry in entries])
+        
+        if self.half_life:
+            weights = np.power(0.5, (window_end - epochs) / self.half_life)
+        else:
+            weights = np.ones(len(entries))
+        
+        seen = set()
+        duplicate = np.zeros(len(entries))
+        for i, entry in enumerate(entries):
+            if entry[2] in seen:
+                duplicate[i] = 1.0
+            seen.add(entry[2])
+        
+        totals = weights @ features
+        effective_count = float(weights.sum())
+        behavior_patterns = {
+            "content": self.detector._content_from_totals(totals, effective_count, float(weights @ duplicate)),
+            "timing": self.detector._timing_from_epochs(epochs),
+            "language": self.detector._language_from_totals(totals, effective_count),
+            "platform": self.detector._platform_from_totals(totals, effective_count)
+        }
+        score = self.detector._calculate_bot_probability(behavior_patterns)
+        
+        previous = self.last_score.get(account)
+        change = score - previous if previous is not None else 0.0
+        
+        point = {
+            "account": account,
+            "window_start": self._to_iso(window_start),
+            "window_end": self._to_iso(window_end),
+            "message_count": len(entries),
+            "bot_probability": score,
+            "score_change": change,
+            "regime_change": abs(change) >= self.jump_threshold,
+            "indicators": self.detector._generate_indicators(behavior_patterns)
+        }
+        return point
+    
+    def _to_iso(self, epoch: int) -> str:
+        """Format epoch microseconds as an ISO timestamp"""
+        return (datetime(1970, 1, 1) + timedelta(microseconds=int(epoch))).isoformat()
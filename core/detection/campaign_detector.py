@@ -0,0 +1,221 @@
+import re
+import hashlib
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+from collections import defaultdict
+
+from core.detection.bot_detector import BotDetector
+
+class CampaignDetector:
+    """
+    Cross-account detection of coordinated campaigns via shared message templates
+    """
+    
+    def __init__(
+        self,
+        bucket_size: timedelta = timedelta(hours=1),
+        min_template_length: int = 20,
+        detector: BotDetector = None
+    ):
+        """
+        Args:
+            bucket_size: Width of the time buckets used to measure co-timed posting
+            min_template_length: Templates shorter than this (after masking) are ignored
+            detector: Optional shared BotDetector instance
+        """
+        self.bucket_size = int(bucket_size.total_seconds() * 1_000_000)
+        self.min_template_length = min_template_length
+        self.detector = detector or BotDetector()
+        
+        # All slot patterns are compiled into one alternation so each message is scanned once
+        slot_patterns = self._load_slot_patterns()
+        self._slot_placeholders = {f"slot{i}": placeholder for i, (_, placeholder) in enumerate(slot_patterns)}
+        self._slot_regex = re.compile(
+            "|".join(f"(?P<slot{i}>{pattern})" for i, (pattern, _) in enumerate(slot_patterns)),
+            re.IGNORECASE
+        )
+        self._whitespace_regex = re.compile(r'\s+')
+        
+        # fingerprint -> template statistics
+        self.templates = {}
+    
+    def _load_slot_patterns(self) -> List[tuple]:
+        """Load (pattern, placeholder) pairs for the variable slots in a template, in priority order"""
+        return [
+            (r'https?://\S+|www\.\S+|t\.me/\S+|wa\.me/\S+', '<url>'),
+            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', '<email>'),
+            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z]{2,}\b', '<upi>'),
+            (r'@[A-Za-z0-9_.]+', '<handle>'),
+            (r'\b(?:bc1|[13])[a-km-zA-HJ-NP-Z0-9]{25,39}\b|\b0x[a-fA-F0-9]{40}\b', '<crypto>'),
+            (r'\+?\d[\d\s-]{7,}\d', '<phone>'),
+            (r'\d+', '<num>')
+        ]
+    
+    def normalize_template(self, text: str) -> str:
+        """
+        Mask variable slots (phone, UPI, handles, URLs, numbers) in a message
+        
+        Args:
+            text: Message text
+        
+        Returns:
+            Normalized template text
+        """
+        text = self._slot_regex.sub(lambda match: self._slot_placeholders[match.lastgroup], text)
+        return self._whitespace_regex.sub(' ', text.lower()).strip()
+    
+    def fingerprint(self, template: str) -> str:
+        """Stable fingerprint of a normalized template"""
+        return hashlib.blake2b(template.encode("utf-8"), digest_size=8).hexdigest()
+    
+    def add_message(self, message: Dict[str, Any], key: str = "sender") -> Optional[str]:
+        """
+        Index a single message
+        
+        Args:
+            message: Message dictionary with text, timestamp and account field
+            key: Message field that identifies the account
+        
+        Returns:
+            Template fingerprint, or None if the template is too short to index
+        """
+        template = self.normalize_template(message.get("text", ""))
+        if len(template) < self.min_template_length:
+            return None
+        
+        fingerprint = self.fingerprint(template)
+        account = message.get(key, "unknown")
+        timestamp = self.detector._epoch_microseconds(message.get("timestamp", datetime.now()))
+        
+        entry = self.templates.get(fingerprint)
+        if entry is None:
+            entry = {
+                "template": template,
+                "accounts": set(),
+                "buckets": defaultdict(set),
+                "message_count": 0,
+                "first_seen": timestamp,
+                "last_seen": timestamp
+            }
+            self.templates[fingerprint] = entry
+        
+        entry["accounts"].add(account)
+        entry["buckets"][timestamp // self.bucket_size].add(account)
+        entry["message_count"] += 1
+        entry["first_seen"] = min(entry["first_seen"], timestamp)
+        entry["last_seen"] = max(entry["last_seen"], timestamp)
+        
+        return fingerprint
+    
+    def add_messages(self, messages: List[Dict[str, Any]], key: str = "sender") -> int:
+        """
+        Index a batch of messages
+        
+        Args:
+            messages: List of message dictionaries
+            key: Message field that identifies the account
+        
+        Returns:
+            Number of messages indexed
+        """
+        indexed = 0
+        for message in messages:
+            if self.add_message(message, key) is not None:
+                indexed += 1
+        return indexed
+    
+    def get_campaigns(self, min_accounts: int = 3, min_bucket_accounts: int = None) -> List[Dict[str, Any]]:
+        """
+        Cluster accounts that share message templates into coordinated groups
+        
+        Accounts are linked when they post the same template; linked accounts
+        are merged with union-find, so the cost is linear in the number of
+        (template, account) memberships rather than pairwise in accounts.
+        
+        Args:
+            min_accounts: Minimum distinct accounts for a template and for a group
+            min_bucket_accounts: Optionally require this many accounts posting a
+                template within a single time bucket
+        
+        Returns:
+            List of coordinated groups, largest first
+        """
+        candidates = {}
+        for fingerprint, entry in self.templates.items():
+            if len(entry["accounts"]) < min_accounts:
+                continue
+            peak = max(len(accounts) for accounts in entry["buckets"].values())
+            if min_bucket_accounts and peak < min_bucket_accounts:
+                continue
+            candidates[fingerprint] = peak
+        
+        # Union-find over accounts linked by a shared template
+        parent = {}
+        
+        def find(account):
+            root = account
+            while parent[root] != root:
+                root = parent[root]
+            while parent[account] != root:
+                parent[account], account = root, parent[account]
+            return root
+        
+        for fingerprint in candidates:
+            accounts = iter(self.templates[fingerprint]["accounts"])
+            first = next(accounts)
+            parent.setdefault(first, first)
+            root = find(first)
+            for account in accounts:
+                parent.setdefault(account, account)
+                other = find(account)
+                if other != root:
+                    parent[other] = root
+        
+        groups = defaultdict(list)
+        for fingerprint in candidates:
+            first = next(iter(self.templates[fingerprint]["accounts"]))
+            groups[find(first)].append(fingerprint)
+        
+        campaigns = []
+        for fingerprints in groups.values():
+            accounts = set()
+            for fingerprint in fingerprints:
+                accounts |= self.templates[fingerprint]["accounts"]
+            if len(accounts) < min_accounts:
+                continue
+            campaigns.append(self._build_campaign(accounts, fingerprints, candidates))
+        
+        campaigns.sort(key=lambda campaign: (campaign["account_count"], campaign["message_count"]), reverse=True)
+        return campaigns
+    
+    def _build_campaign(self, accounts: set, fingerprints: List[str], peaks: Dict[str, int]) -> Dict[str, Any]:
+        """Summarize a coordinated group"""
+        templates = []
+        for fingerprint in fingerprints:
+            entry = self.templates[fingerprint]
+            templates.append({
+                "fingerprint": fingerprint,
+                "template": entry["template"],
+                "account_count": len(entry["accounts"]),
+                "message_count": entry["message_count"],
+                "peak_bucket_accounts": peaks[fingerprint],
+                "first_seen": self._to_iso(entry["first_seen"]),
+                "last_seen": self._to_iso(entry["last_seen"])
+            })
+        templates.sort(key=lambda template: template["account_count"], reverse=True)
+        
+        peak = max(peaks[fingerprint] for fingerprint in fingerprints)
+        return {
+            "accounts": sorted(accounts, key=str),
+            "account_count": len(accounts),
+            "templates": templates,
+            "message_count": sum(template["message_count"] for template in templates),
+            "peak_bucket_accounts": peak,
+            "coordination_score": peak / len(accounts),
+            "first_seen": min(template["first_seen"] for template in templates),
+            "last_seen": max(template["last_seen"] for template in templates)
+        }
+    
+    def _to_iso(self, epoch: int) -> str:
+        """Format epoch microseconds as an ISO timestamp"""
+        return (datetime(1970, 1, 1) + timedelta(microseconds=int(epoch))).isoformat()
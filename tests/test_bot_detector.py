@@ -0,0 +1,212 @@
+import re
+import time
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.detection.bot_detector import BotDetector
+
+REPEATED_DIGITS = re.compile(r'(\d+)\1{2,}')
+
+@pytest.fixture(scope="module")
+def detector():
+    return BotDetector()
+
+def test_repeated_non_ascii_digit_group(detector):
+    # \d matches Devanagari digits; runs over 64 characters take the vectorized path
+    post = "१२३४५६७८९०" * 7
+    assert detector._is_repetitive_content(post)
+    result = detector.detect_bot_behavior([{"text": post, "sender": "a"}])
+    assert result["behavior_patterns"]["content"]["repetitive_content"] == 1.0
+
+@pytest.mark.parametrize("digits", ["٠١٢٣٤٥٦٧٨٩", "०१२३४५६७८९", "0123456789"])
+def test_digit_groups_match_reference_pattern(detector, digits):
+    rng = random.Random(7)
+    for _ in range(200):
+        run = "".join(rng.choice(digits) for _ in range(rng.randint(65, 150)))
+        assert detector._has_repeated_digit_group(run, float("inf")) == bool(REPEATED_DIGITS.search(run))
+
+def test_detect_many_empty_batch_has_result_columns(detector):
+    empty = detector.detect_many([])
+    scored = detector.detect_many([{"text": "hello", "sender": "a"}, {"text": "hi", "sender": "b"}])
+    
+    assert empty.empty
+    assert list(empty.columns) == list(scored.columns)
+    assert (empty.dtypes == scored.dtypes).all()
+
+def _sample_messages(accounts: int = 12, seed: int = 3):
+    """Messages of several accounts with mixed content and posting rhythms"""
+    rng = random.Random(seed)
+    texts = [
+        "Join now!!! https://t.me/vote #rally",
+        "vote vote vote for change",
+        "मतदान करें आज 1231231231",
+        "Kindly attend the meeting tomorrow, regards",
+        "lol ok see u there 😂😂",
+        "/start click here to win",
+        "Best quality, delivery available, contact for details",
+        "RALLY AT THE SQUARE TONIGHT"
+    ]
+    start = datetime(2026, 10, 1, 8, 0)
+    messages = []
+    for account in range(accounts):
+        moment = start
+        # Every third account posts like clockwork
+        regular = account % 3 == 0
+        for _ in range(rng.randint(1, 30)):
+            moment += timedelta(seconds=60 if regular else rng.choice([1, 5, 60, 3600]) * rng.randint(1, 4))
+            messages.append({"sender": f"a{account}", "text": rng.choice(texts), "timestamp": moment})
+    rng.shuffle(messages)
+    return messages
+
+def test_detect_many_matches_per_account_detection(detector):
+    messages = _sample_messages()
+    batch = detector.detect_many(messages, platform="telegram").set_index("account")
+    
+    for account, frame_row in batch.iterrows():
+        own = [message for message in messages if message["sender"] == account]
+        single = detector.detect_bot_behavior(own, platform="telegram")
+        
+        assert frame_row["message_count"] == len(own)
+        for section, name in BotDetector.ACCOUNT_FEATURES:
+            assert frame_row[f"{section}_{name}"] == pytest.approx(single["behavior_patterns"][section][name]), (account, name)
+        assert frame_row["bot_probability"] == pytest.approx(single["confidence"])
+        assert frame_row["is_bot"] == single["is_bot"]
+
+def test_bot_model_scores_like_its_estimator(detector, tmp_path):
+    pytest.importorskip("sklearn")
+    from core.detection.bot_model import BotModel, compare_with_heuristic
+    
+    frame = detector.detect_many(_sample_messages(accounts=40))
+    features = detector.account_features_from_frame(frame)
+    labels = (frame["content_repetitive_content"] + frame["content_template_usage"] > 0.6).to_numpy()
+    
+    model = BotModel().fit(features, labels)
+    model.save(str(tmp_path / "bot.joblib"))
+    loaded = BotModel.load(str(tmp_path / "bot.joblib"))
+    np.testing.assert_allclose(loaded.predict_proba(features), model.predict_proba(features))
+    
+    scored = BotDetector(model_path=str(tmp_path / "bot.joblib")).detect_many(_sample_messages(accounts=40))
+    np.testing.assert_allclose(scored["bot_probability"], model.predict_proba(features))
+    
+    results = compare_with_heuristic(model, features, labels, repeats=1)
+    assert set(results) == {"heuristic", "model"}
+    assert results["model"]["accuracy"] >= 0.9
+    
+    with pytest.raises(ValueError):
+        model.predict_proba(features[:, :-1])
+
+def test_retrained_model_saved_over_the_old_file_is_reloaded(detector, tmp_path):
+    pytest.importorskip("sklearn")
+    from core.detection.bot_model import BotModel, load_bot_model
+    
+    frame = detector.detect_many(_sample_messages(accounts=40))
+    features = detector.account_features_from_frame(frame)
+    labels = (frame["content_repetitive_content"] + frame["content_template_usage"] > 0.6).to_numpy()
+    path = str(tmp_path / "bot.joblib")
+    
+    BotModel().fit(features, labels).save(path)
+    first = load_bot_model(path)
+    assert load_bot_model(path) is first
+    
+    retrained = BotModel("gradient_boosting").fit(features, ~labels)
+    retrained.save(path)
+    reloaded = load_bot_model(path)
+    assert reloaded is not first
+    assert reloaded.kind == "gradient_boosting"
+    np.testing.assert_allclose(reloaded.predict_proba(features), retrained.predict_proba(features))
+
+@pytest.mark.parametrize("post", [
+    "1" * 200000 + "x",
+    "12" * 50000 + "3",
+    "ab " * 40000 + "ab",
+    "a" * 50000 + "!" * 50000,
+    " ".join(f"w{i % 997}" for i in range(30000))
+])
+def test_adversarial_posts_stay_within_budget(detector, post):
+    start = time.perf_counter()
+    detector.detect_bot_behavior([{"text": post, "sender": "a"}])
+    # Far above the per-message budget, far below regex backtracking on these inputs
+    assert time.perf_counter() - start < 0.5
+
+def test_size_cap_only_limits_the_repetition_search(detector):
+    post = "x" * 5000 + " https://t.me/vote #rally"
+    features = dict(zip(detector.MESSAGE_FEATURES, detector._extract_message_features(post, "telegram")))
+    # Length, URL and hashtag come from the whole message, past max_message_chars
+    assert features["char_count"] == len(post)
+    assert features["url"] == features["hashtag"] == 1.0
+    
+    capped = BotDetector(max_message_chars=100)
+    assert detector._is_repetitive_content("x" * 200 + " vote vote vote")
+    assert not capped._is_repetitive_content("x" * 200 + " vote vote vote")
+    # Each digit run gets its own cap
+    assert capped._is_repetitive_content("x" * 200 + " 123123123")
+    # The linear punctuation check still sees the whole message
+    assert capped._is_repetitive_content("x" * 200 + " !!!")
+
+def test_exhausted_time_budget_counts_as_repetitive():
+    detector = BotDetector(message_time_budget=0)
+    # The Thue-Morse sequence has no cube, but the search gives up before finding that out
+    run = "".join("12"[bin(i).count("1") % 2] for i in range(3000))
+    assert not REPEATED_DIGITS.search(run)
+    assert detector._is_repetitive_content(run)
+    assert detector.budget_exceeded == 1
+    assert not BotDetector(message_time_budget=float("inf"))._is_repetitive_content(run)
+
+def _baseline_categories(detector, text, platform):
+    """Per-category substring and regex checks that scan_text_categories replaced"""
+    text_lower = text.lower()
+    platform = platform.lower()
+    return {
+        "template_usage": any(phrase in text_lower for phrase in detector.template_phrases),
+        "formal_language": any(indicator in text_lower for indicator in detector.language_indicators["formal"]),
+        "casual_language": any(indicator in text_lower for indicator in detector.language_indicators["casual"]),
+        "cross_platform": any(phrase in text_lower for phrase in detector.generic_phrases),
+        "platform_specific": any(indicator in text_lower for indicator in detector.platform_indicators.get(platform, [])),
+        "bot_commands": platform == "telegram" and any(
+            re.search(pattern, text, re.IGNORECASE) for pattern in detector.bot_patterns["bot_commands"]
+        )
+    }
+
+def _phrase_texts(detector, count: int = 300, seed: int = 11):
+    """Phrases alone, embedded, truncated and overlapping each other"""
+    phrases = sorted({
+        *detector.template_phrases,
+        *detector.language_indicators["formal"],
+        *detector.language_indicators["casual"],
+        *detector.generic_phrases,
+        *(indicator for indicators in detector.platform_indicators.values() for indicator in indicators),
+        "/start", "/help now", "/menu", "/info", "/contact"
+    })
+    texts = ["", "nothing to see", "HEY THERE", "/startle", "ʜɪ İstanbul"]
+    for phrase in phrases:
+        texts += [phrase, f"So {phrase.upper()}!", phrase[:-1], phrase[1:]]
+    rng = random.Random(seed)
+    for _ in range(count):
+        pieces = []
+        for _ in range(rng.randint(1, 4)):
+            phrase = rng.choice(phrases)
+            start = rng.randint(0, len(phrase) // 2)
+            pieces.append(phrase[start:])
+        # Joined without spaces, phrase tails run into each other
+        texts.append(rng.choice(["", " ", "-"]).join(pieces))
+    return texts
+
+def _overlapping_detector():
+    """Detector whose banks hold phrases that are prefixes of phrases in other banks"""
+    detector = BotDetector()
+    detector.language_indicators["casual"] += ["hi there", "dm"]
+    detector.template_phrases += ["hi there friend", "dm for"]
+    detector.platform_indicators["telegram"] += ["hi there friend, join"]
+    detector._phrase_regex, detector._phrase_categories = detector._compile_phrase_bank()
+    return detector
+
+@pytest.mark.parametrize("platform", ["telegram", "WhatsApp", "instagram", "unknown"])
+@pytest.mark.parametrize("banks", ["default", "overlapping"])
+def test_phrase_bank_scan_matches_per_category_checks(detector, platform, banks):
+    if banks == "overlapping":
+        detector = _overlapping_detector()
+    for text in _phrase_texts(detector):
+        assert detector.scan_text_categories(text, platform) == _baseline_categories(detector, text, platform), text
@@ -0,0 +1,72 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.detection.bot_detector import BotDetector
+from core.detection.bot_profile import BotProfile
+
+TEXTS = [
+    "Join now!!! https://t.me/vote #rally",
+    "vote vote vote for change",
+    "मतदान करें आज 1231231231",
+    "Kindly attend the meeting tomorrow, regards",
+    "lol ok see u there 😂😂",
+    "Best quality, delivery available, contact for details"
+]
+
+@pytest.fixture(scope="module")
+def detector():
+    return BotDetector()
+
+def _history(seed: int, regular: bool):
+    """One account's messages in time order"""
+    rng = random.Random(seed)
+    moment = datetime(2026, 10, 1, 8, 0)
+    messages = []
+    for _ in range(rng.randint(5, 60)):
+        moment += timedelta(seconds=60 if regular else rng.choice([2, 30, 600, 5400]) * rng.randint(1, 3))
+        messages.append({"text": rng.choice(TEXTS), "timestamp": moment})
+    return messages
+
+@pytest.mark.parametrize("seed, regular", [(1, False), (2, True), (3, False), (4, True)])
+def test_incremental_updates_match_batch_detection(detector, seed, regular):
+    messages = _history(seed, regular)
+    profile = BotProfile("a", platform="telegram", detector=detector)
+    for message in messages:
+        profile.update(message)
+    
+    batch = detector.detect_bot_behavior(messages, platform="telegram")
+    incremental = profile.get_detection()
+    for section, patterns in batch["behavior_patterns"].items():
+        for name, value in patterns.items():
+            # The autocorrelation needs the message history, which a profile does not keep
+            if name in ("periodicity", "dominant_period"):
+                continue
+            assert incremental["behavior_patterns"][section][name] == pytest.approx(value), (section, name)
+    assert incremental["confidence"] == pytest.approx(batch["confidence"])
+    assert incremental["is_bot"] == batch["is_bot"]
+    assert incremental["message_count"] == len(messages)
+
+def test_serialized_profile_resumes_where_it_left_off(detector):
+    messages = _history(5, regular=False)
+    half = len(messages) // 2
+    profile = BotProfile("a", platform="telegram", detector=detector)
+    profile.update_many(messages[:half])
+    
+    restored = BotProfile.from_dict(json.loads(json.dumps(profile.to_dict())), detector)
+    assert restored.to_dict() == profile.to_dict()
+    assert {**restored.get_detection(), "timestamp": None} == {**profile.get_detection(), "timestamp": None}
+    
+    for message in messages[half:]:
+        profile.update(message)
+        restored.update(message)
+    assert restored.to_dict() == profile.to_dict()
+    assert restored.bot_probability() == profile.bot_probability()
+
+def test_empty_profile(detector):
+    profile = BotProfile("a", detector=detector)
+    assert profile.bot_probability() == 0.0
+    assert profile.get_detection()["message_count"] == 0
+    assert BotProfile.from_dict(profile.to_dict(), detector).to_dict() == profile.to_dict()
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.detection.bot_detector import BotDetector
+from core.detection.bot_stream import StreamingBotDetector
+
+START = datetime(2026, 10, 1, 8, 0)
+
+@pytest.fixture(scope="module")
+def detector():
+    return BotDetector()
+
+def _stream(count: int, distinct: int, seed: int):
+    """Messages in time order drawing from a fixed number of distinct texts"""
+    rng = random.Random(seed)
+    texts = [f"post {seed}.{i} about the rally" + (" https://t.me/x" if i % 4 == 0 else "") for i in range(distinct)]
+    # Every distinct text appears at least once
+    order = list(range(distinct)) + [rng.randrange(distinct) for _ in range(count - distinct)]
+    rng.shuffle(order)
+    for i, text in enumerate(order):
+        yield {"text": texts[text], "timestamp": START + timedelta(seconds=30 * i)}
+
+def test_distinct_estimate_stays_within_its_error_bound(detector):
+    stream = StreamingBotDetector(sample_size=256, detector=detector)
+    within = 0
+    seeds = range(20)
+    for seed in seeds:
+        count, distinct = 20000, random.Random(seed).randint(2000, 12000)
+        sketch, members = [], set()
+        for message in _stream(count, distinct, seed):
+            stream._update_sketch(sketch, members, message["text"])
+        
+        # The sketch never holds more than sample_size hashes
+        assert len(sketch) == len(members) == 256
+        estimate, bound = stream._estimate_distinct(sketch, count)
+        assert bound == pytest.approx(estimate * stream._z_score() / (256 - 2) ** 0.5)
+        within += abs(estimate - distinct) <= bound
+    
+    # A 95% interval may miss now and then, but not often
+    assert within >= 17
+
+def test_reservoir_is_bounded_and_ratios_stay_within_bounds(detector):
+    stream = StreamingBotDetector(sample_size=500, seed=3, detector=detector)
+    result = stream.detect(_stream(30000, 8000, seed=3), platform="telegram")
+    
+    sampling = result["sampling"]
+    assert sampling["sampled"]
+    assert sampling["sample_size"] == 500
+    assert sampling["message_count"] == 30000
+    
+    # A quarter of the distinct texts carry a URL
+    url_density = result["behavior_patterns"]["content"]["url_density"]
+    assert abs(url_density - 0.25) <= 2 * sampling["error_bounds"]["content"]["url_density"]
+    identical = result["behavior_patterns"]["content"]["identical_messages"]
+    assert abs(identical - (30000 - 8000) / 30000) <= sampling["error_bounds"]["content"]["identical_messages"]
+    assert 0 < sampling["bot_probability_bound"] < 1
+
+def test_short_stream_is_exact(detector):
+    messages = list(_stream(300, 120, seed=1))
+    result = StreamingBotDetector(sample_size=1000, detector=detector).detect(iter(messages), platform="telegram")
+    batch = detector.detect_bot_behavior(messages, platform="telegram")
+    
+    assert not result["sampling"]["sampled"]
+    assert result["sampling"]["bot_probability_bound"] == 0.0
+    assert result["confidence"] == pytest.approx(batch["confidence"])
+    assert result["behavior_patterns"]["content"] == pytest.approx(batch["behavior_patterns"]["content"])
@@ -0,0 +1,80 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.detection.bot_detector import BotDetector
+from core.detection.bot_window import WindowedBotDetector
+
+START = datetime(2026, 10, 1)
+
+@pytest.fixture(scope="module")
+def detector():
+    return BotDetector()
+
+def _reference_points(detector, messages, window, step):
+    """Score every step-aligned window that holds messages, one window at a time"""
+    step_seconds = step.total_seconds()
+    first = min(message["timestamp"] for message in messages)
+    last = max(message["timestamp"] for message in messages)
+    end = START + timedelta(seconds=((first - START).total_seconds() // step_seconds + 1) * step_seconds)
+    
+    points = []
+    # The last window is the provisional one that contains the newest message
+    while end - step <= last:
+        inside = [message for message in messages if end - window <= message["timestamp"] < end]
+        if inside:
+            points.append((end.isoformat(), len(inside), detector.detect_bot_behavior(inside)["confidence"]))
+        end += step
+    return points
+
+@pytest.mark.parametrize("window, step", [
+    (timedelta(hours=24), timedelta(hours=1)),
+    (timedelta(hours=6), timedelta(hours=2)),
+    (timedelta(hours=4), None)
+])
+def test_windows_match_brute_force_reference(detector, window, step):
+    rng = random.Random(5)
+    texts = ["vote now", "hi there lol", "Join https://t.me/x #rally", "VOTE VOTE VOTE"]
+    # Bursts separated by gaps longer than a window
+    messages = []
+    for offset in (0, 10, 30, 31, 80):
+        for _ in range(rng.randint(1, 6)):
+            moment = START + timedelta(hours=offset, minutes=rng.randint(0, 90))
+            messages.append({"sender": "a", "text": rng.choice(texts), "timestamp": moment})
+    
+    windowed = WindowedBotDetector(window=window, step=step, detector=detector)
+    points = [
+        (point["window_end"], point["message_count"], point["bot_probability"])
+        for point in windowed.score_series(messages)["a"]
+    ]
+    
+    reference = _reference_points(detector, messages, window, step or window)
+    assert [point[:2] for point in points] == [point[:2] for point in reference]
+    assert [point[2] for point in points] == pytest.approx([point[2] for point in reference])
+
+def test_sliding_windows_cover_every_message(detector):
+    windowed = WindowedBotDetector(window=timedelta(hours=24), step=timedelta(hours=1), detector=detector)
+    messages = [{"sender": "a", "text": "vote now", "timestamp": START + timedelta(hours=hours)} for hours in (0, 10, 30)]
+    
+    points = windowed.score_series(messages)["a"]
+    # Windows end hourly from 01:00 until the provisional 07:00 window of the next day
+    assert len(points) == 31
+    assert [point["message_count"] for point in points] == [1] * 10 + [2] * 14 + [1] * 6 + [2]
+
+def test_flush_is_idempotent(detector):
+    windowed = WindowedBotDetector(window=timedelta(hours=2), detector=detector)
+    for hours in (0, 1, 3, 5):
+        windowed.update("a", {"text": "vote now", "timestamp": START + timedelta(hours=hours)})
+    
+    series = windowed.get_series("a")
+    last_score = windowed.last_score["a"]
+    first = windowed.flush()
+    assert windowed.flush() == first
+    assert windowed.get_series("a") == series
+    assert windowed.last_score["a"] == last_score
+    
+    # The provisional window is recorded once it actually closes
+    closed = windowed.update("a", {"text": "vote now", "timestamp": START + timedelta(hours=7)})
+    assert closed == [first["a"]]
+    assert windowed.get_series("a") == series + closed
@@ -0,0 +1,104 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.detection.campaign_detector import CampaignDetector
+
+START = datetime(2026, 10, 1, 8, 0)
+
+@pytest.fixture
+def detector():
+    return CampaignDetector()
+
+def _post(sender: str, text: str, minutes: int = 0) -> dict:
+    return {"sender": sender, "text": text, "timestamp": START + timedelta(minutes=minutes)}
+
+@pytest.mark.parametrize("first, second", [
+    ("Send 500 to ravi@okaxis for the rally pass", "Send 1200 to meena@ybl for the rally pass"),
+    ("Call +91 98765 43210 to join the rally tonight", "Call 080-2345-6789 to join the rally tonight"),
+    ("Join the rally tonight https://t.me/rally_1 now", "Join the rally tonight https://bit.ly/x9 now"),
+    ("Ask @organizer_one about the rally tonight", "Ask @second.admin about the rally tonight"),
+    ("Donate to 1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2 for the rally", "Donate to 0x52908400098527886E0F7030069857D2E4169EE7 for the rally"),
+    ("Mail volunteer@example.in to   JOIN the rally", "mail team.lead@pindar.org to join the rally")
+])
+def test_variants_differing_only_in_slots_share_a_fingerprint(detector, first, second):
+    assert detector.normalize_template(first) == detector.normalize_template(second)
+    assert detector.add_message(_post("a", first)) == detector.add_message(_post("b", second))
+    assert len(detector.templates) == 1
+
+def test_different_wording_gets_its_own_template(detector):
+    first = detector.add_message(_post("a", "Send 500 to ravi@okaxis for the rally pass"))
+    second = detector.add_message(_post("b", "Send 500 to ravi@okaxis for the protest pass"))
+    assert first != second
+    # Nothing but a masked slot is left, which is too short to index
+    assert detector.add_message(_post("c", "+91 98765 43210")) is None
+
+def test_shared_templates_merge_transitively(detector):
+    chain = {
+        "Join the rally at the square tonight": ["a", "b", "c"],
+        "Bring your friends to the square, vote for change": ["c", "d", "e"],
+        "Share this message with 10 groups before the vote": ["e", "f", "g"],
+        "Completely separate campaign about free recharge offers": ["x", "y", "z"],
+        # Two accounts are below min_accounts, so this template links nothing
+        "Meet at the station and bring the banners along": ["a", "x"]
+    }
+    for text, senders in chain.items():
+        for minutes, sender in enumerate(senders):
+            detector.add_message(_post(sender, text, minutes))
+    
+    campaigns = detector.get_campaigns(min_accounts=3)
+    assert [campaign["accounts"] for campaign in campaigns] == [list("abcdefg"), list("xyz")]
+    assert len(campaigns[0]["templates"]) == 3
+    assert campaigns[0]["message_count"] == 9
+
+def test_min_bucket_accounts_requires_co_timed_posting(detector):
+    for sender, minutes in [("a", 0), ("b", 5), ("c", 10), ("d", 600), ("e", 1200), ("f", 1800)]:
+        text = "Join the rally at the square tonight" if sender in "abc" else "Vote early and bring three friends along"
+        detector.add_message(_post(sender, text, minutes))
+    
+    assert len(detector.get_campaigns(min_accounts=3)) == 2
+    campaigns = detector.get_campaigns(min_accounts=3, min_bucket_accounts=3)
+    assert [campaign["accounts"] for campaign in campaigns] == [["a", "b", "c"]]
+    assert campaigns[0]["coordination_score"] == 1.0
+
+def _reference_groups(detector, min_accounts):
+    """Connected components of the pairwise shared-template graph"""
+    neighbours = {}
+    for entry in detector.templates.values():
+        if len(entry["accounts"]) < min_accounts:
+            continue
+        for account in entry["accounts"]:
+            neighbours.setdefault(account, set()).update(entry["accounts"])
+    
+    groups, seen = [], set()
+    for start in neighbours:
+        if start in seen:
+            continue
+        component, stack = set(), [start]
+        while stack:
+            account = stack.pop()
+            if account not in component:
+                component.add(account)
+                stack.extend(neighbours[account] - component)
+        seen |= component
+        if len(component) >= min_accounts:
+            groups.append(sorted(component))
+    return sorted(groups)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_union_find_matches_pairwise_reference(detector, seed):
+    rng = random.Random(seed)
+    words = ["red", "blue", "green", "north", "south", "east", "square", "station", "market"]
+    # Numbers are masked, so templates differ in their words
+    templates = [" ".join(rng.sample(words, 5)) + " join the rally" for _ in range(40)]
+    for _ in range(300):
+        template = rng.randrange(len(templates))
+        # Each template mostly circulates within one of eight communities
+        community = template % 8 if rng.random() < 0.99 else rng.randrange(8)
+        detector.add_message(_post(f"u{community * 20 + rng.randint(0, 19)}", templates[template], rng.randint(0, 600)))
+    
+    campaigns = detector.get_campaigns(min_accounts=3)
+    reference = _reference_groups(detector, 3)
+    assert len(reference) > 1
+    assert sorted(campaign["accounts"] for campaign in campaigns) == reference
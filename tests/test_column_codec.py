@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from utils.column_codec import ColumnCodec
+from utils.database import Database
+
+SMALL = {"source": "scraper", "tags": ["rally", "मतदान"], "score": 0.75}
+LARGE = {"messages": [{"text": f"vote at booth {i} 😀", "id": i} for i in range(200)], "nested": {"empty": []}}
+
+CODECS = [
+    ("json", None),
+    ("json", 1024),
+    ("json", 0),
+    ("msgpack", None),
+    ("msgpack", 1024)
+]
+
+def _codec(format: str, compress_threshold):
+    if format == "msgpack":
+        pytest.importorskip("msgpack")
+    return ColumnCodec(format, compress_threshold=compress_threshold)
+
+@pytest.mark.parametrize("format, compress_threshold", CODECS)
+def test_round_trip(format, compress_threshold):
+    codec = _codec(format, compress_threshold)
+    for value in (SMALL, LARGE, [], {}, "text", 3, None):
+        assert codec.decode(codec.encode(value)) == value
+
+@pytest.mark.parametrize("format, compress_threshold", CODECS)
+def test_legacy_json_text_stays_readable(format, compress_threshold):
+    codec = _codec(format, compress_threshold)
+    # Rows written before the codec existed hold json.dumps output
+    assert codec.decode(json.dumps(LARGE)) == LARGE
+    assert codec.to_text(json.dumps(SMALL)) == json.dumps(SMALL)
+    assert codec.decode_or_raw("raw scraper text") == "raw scraper text"
+
+def test_compression_threshold():
+    codec = ColumnCodec(compress_threshold=1024)
+    assert isinstance(codec.encode(SMALL), str)
+    assert codec.encode(LARGE)[:1] == ColumnCodec.ZLIB_JSON
+    assert len(codec.encode(LARGE)) < len(json.dumps(LARGE))
+    assert json.loads(codec.to_text(codec.encode(LARGE))) == LARGE
+
+def test_msgpack_tags():
+    pytest.importorskip("msgpack")
+    codec = ColumnCodec("msgpack", compress_threshold=1024)
+    assert codec.encode(SMALL)[:1] == ColumnCodec.MSGPACK
+    assert codec.encode(LARGE)[:1] == ColumnCodec.ZLIB_MSGPACK
+    assert json.loads(codec.to_text(codec.encode(SMALL))) == SMALL
+
+@pytest.mark.parametrize("format, compress_threshold", CODECS)
+def test_database_reads_rows_of_every_encoding(tmp_path, format, compress_threshold):
+    path = str(tmp_path / "pindar.db")
+    # Rows from the default codec and from plain json.dumps, read back with another codec
+    writer = Database(path)
+    writer.store_threat({"message": "compact", "metadata": LARGE})
+    conn = writer._get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO threats (platform, channel, message, threat_score, risk_level, metadata) "
+            "VALUES ('telegram', 'c', 'legacy', 0, 'low', ?)",
+            (json.dumps(SMALL, indent=2),)
+        )
+    writer.close()
+    
+    db = Database(path, codec=_codec(format, compress_threshold))
+    db.store_threat({"message": "new", "metadata": LARGE})
+    
+    metadata = {threat["message"]: threat["metadata"] for threat in db.iter_threats()}
+    assert metadata == {"compact": LARGE, "legacy": SMALL, "new": LARGE}
+    db.close()
@@ -0,0 +1,182 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.database import Database
+
+@pytest.fixture
+def database(tmp_path):
+    db = Database(str(tmp_path / "pindar.db"))
+    yield db
+    db.close()
+
+def test_account_statistics_accept_null_scores(database):
+    database.store_account({"username": "a", "platform": "tg", "threat_score": None, "bot_confidence": None})
+    database.store_accounts_many([
+        {"username": "a", "platform": "tg", "threat_score": 90, "bot_confidence": None},
+        {"username": "b", "platform": "tg", "threat_score": None, "bot_confidence": 0.9}
+    ])
+    database.store_account({"username": "b", "platform": "tg", "threat_score": None, "bot_confidence": None})
+    
+    statistics = database.get_statistics()
+    assert statistics["total_accounts"] == 2
+    assert statistics["high_risk_accounts"] == 1
+    assert statistics["bot_accounts"] == 0
+
+def test_legacy_free_text_analysis_logs_stay_readable(database):
+    conn = database._get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO analysis_logs (analysis_type, input_data, result) VALUES (?, ?, ?)",
+            ("legacy", "raw scraper text", '{"score": 3}')
+        )
+    
+    (record,) = database.iter_table("analysis_logs", lazy=False)
+    assert record["input_data"] == "raw scraper text"
+    assert record["result"] == {"score": 3}
+    assert database.export_data("analysis_logs")["analysis_logs"][0]["input_data"] == "raw scraper text"
+
+def _store_old_threats(database, days: int, count: int) -> str:
+    """Write threats into the partition of a past day, returning its name"""
+    day = datetime.utcnow() - timedelta(days=days)
+    conn = database._get_connection()
+    with conn:
+        name = database.partitions.ensure(conn, day)
+        first_id = database.partitions.allocate_ids(conn, count)
+        conn.executemany(
+            f"INSERT INTO {name} (id, platform, channel, message, threat_score, risk_level, timestamp) "
+            "VALUES (?, 'telegram', 'c', 'old rally', 10, 'low', ?)",
+            [(first_id + i, f"{day:%Y-%m-%d} 12:00:00") for i in range(count)]
+        )
+    return name
+
+def test_partitions_created_by_another_handle_are_read(tmp_path):
+    path = str(tmp_path / "pindar.db")
+    writer = Database(path, partition_threats="day")
+    reader = Database(path, partition_threats="day")
+    
+    writer.store_threat({"platform": "telegram", "message": "rally at noon"})
+    _store_old_threats(writer, 3, 2)
+    
+    assert [threat["message"] for threat in reader.get_recent_threats()] == ["rally at noon", "old rally", "old rally"]
+    assert sorted(threat["message"] for threat in reader.search_threats("rally")) == ["old rally", "old rally", "rally at noon"]
+    assert len(list(reader.iter_table("threats"))) == 3
+    
+    writer.close()
+    reader.close()
+
+def test_partitions_dropped_by_another_handle_are_skipped(tmp_path):
+    path = str(tmp_path / "pindar.db")
+    writer = Database(path, partition_threats="day")
+    reader = Database(path, partition_threats="day")
+    writer.store_threat({"platform": "telegram", "message": "rally at noon"})
+    old = _store_old_threats(writer, 40, 2)
+    
+    # The reader lists both partitions before the old one is dropped
+    threats = reader.iter_threats(batch_size=1)
+    assert next(threats)["message"] == "rally at noon"
+    assert writer.cleanup_old_data(30) == 2
+    
+    assert list(threats) == []
+    assert reader.partitions.drop(old) == 0
+    assert reader.partitions.expired(f"{datetime.utcnow():%Y-%m-%d %H:%M:%S}") == []
+    assert [threat["message"] for threat in reader.get_recent_threats()] == ["rally at noon"]
+    
+    writer.close()
+    reader.close()
+
+def test_thread_connections_close_when_threads_exit(database):
+    opened = []
+    
+    def work():
+        database.get_recent_threats()
+        opened.append(database._get_connection())
+    
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(opened) == 4
+    assert database._connections == {database._get_connection()}
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+SEARCH_THREATS = [
+    ("telegram", "Rally at the square tonight, vote for change"),
+    ("telegram", "The square was quiet, no rally today"),
+    ("whatsapp", "Voting booth opens at seven, bring your ID"),
+    ("whatsapp", "protest march towards the square"),
+    ("twitter", "मतदान केंद्र पर रैली"),
+    ("twitter", "Café meeting about the rally")
+]
+
+@pytest.fixture(params=[None, "day"])
+def searchable(request, tmp_path):
+    db = Database(str(tmp_path / "pindar.db"), partition_threats=request.param)
+    db.store_threats_many([{"platform": platform, "message": message} for platform, message in SEARCH_THREATS])
+    yield db
+    db.close()
+
+def _found(db, query, **filters):
+    return sorted(threat["message"] for threat in db.search_threats(query, **filters))
+
+def test_search_phrase_prefix_and_negation(searchable):
+    assert _found(searchable, '"rally at the square"') == ["Rally at the square tonight, vote for change"]
+    assert _found(searchable, "vot*") == ["Rally at the square tonight, vote for change", "Voting booth opens at seven, bring your ID"]
+    assert _found(searchable, "square NOT rally") == ["protest march towards the square"]
+    assert _found(searchable, "rally AND (vote OR quiet)") == [
+        "Rally at the square tonight, vote for change", "The square was quiet, no rally today"
+    ]
+    # Diacritics are folded and non-Latin scripts are tokenized
+    assert _found(searchable, "cafe") == ["Café meeting about the rally"]
+    assert _found(searchable, "मतदान") == ["मतदान केंद्र पर रैली"]
+    
+    with pytest.raises(ValueError):
+        searchable.search_threats('"unbalanced')
+
+def test_search_filters(searchable):
+    assert _found(searchable, "square", platform="telegram") == [
+        "Rally at the square tonight, vote for change", "The square was quiet, no rally today"
+    ]
+    assert _found(searchable, "rally", since=f"{datetime.utcnow() + timedelta(days=1):%Y-%m-%d}") == []
+    assert len(_found(searchable, "rally", since=f"{datetime.utcnow() - timedelta(days=1):%Y-%m-%d}")) == 3
+    assert len(searchable.search_threats("rally", limit=2)) == 2
+
+def test_search_snippets_and_ranking(searchable):
+    searchable.store_threat({"platform": "telegram", "message": "rally rally rally"})
+    results = searchable.search_threats("rally")
+    
+    assert results[0]["message"] == "rally rally rally"
+    assert [result["rank"] for result in results] == sorted(result["rank"] for result in results)
+    snippets = {result["message"]: result["snippet"] for result in results}
+    assert snippets["The square was quiet, no rally today"] == "The square was quiet, no **rally** today"
+    assert snippets["Rally at the square tonight, vote for change"].startswith("**Rally** at")
+
+def test_search_catches_up_on_rows_written_around_the_database(searchable):
+    conn = searchable._get_connection()
+    with conn:
+        # Raw writes only queue rows for the index
+        conn.executemany(
+            "INSERT INTO threats (platform, channel, message, threat_score, risk_level) VALUES ('telegram', 'c', ?, 0, 'low')",
+            [(f"bulk flood warning {i}",) for i in range(500)]
+        )
+    assert conn.execute("SELECT COUNT(*) FROM threats_fts_pending").fetchone()[0] == 500
+    
+    assert len(searchable.search_threats("flood", limit=1000)) == 500
+    assert conn.execute("SELECT COUNT(*) FROM threats_fts_pending").fetchone()[0] == 0
+    
+    with conn:
+        conn.execute("UPDATE threats SET message = 'calm evening' WHERE message = 'bulk flood warning 7'")
+    assert conn.execute("SELECT COUNT(*) FROM threats_fts_pending").fetchone()[0] == 1
+    assert _found(searchable, "calm") == ["calm evening"]
+    assert len(searchable.search_threats("flood", limit=1000)) == 499
+    
+    with conn:
+        conn.execute("DELETE FROM threats WHERE message LIKE 'bulk%'")
+    assert searchable.search_threats("flood") == []
+    assert _found(searchable, "calm") == ["calm evening"]
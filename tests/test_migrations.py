@@ -0,0 +1,222 @@
+import json
+import math
+import shutil
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.database import Database
+
+# Tables as created before Database had migrations, JSON written by json.dumps
+LEGACY_SCHEMA = [
+    """
+    CREATE TABLE threats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        channel TEXT NOT NULL,
+        message TEXT NOT NULL,
+        threat_score INTEGER NOT NULL,
+        risk_level TEXT NOT NULL,
+        bot_detected BOOLEAN DEFAULT FALSE,
+        metadata TEXT,
+        analysis_result TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        platform TEXT NOT NULL,
+        threat_score INTEGER DEFAULT 0,
+        risk_level TEXT DEFAULT 'low',
+        bot_confidence REAL DEFAULT 0.0,
+        metadata TEXT,
+        first_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+        last_seen DATETIME DEFAULT CURRENT_TIMESTAMP,
+        message_count INTEGER DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        alert_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        message TEXT NOT NULL,
+        details TEXT,
+        acknowledged BOOLEAN DEFAULT FALSE,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE network_connections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account1_id INTEGER,
+        account2_id INTEGER,
+        connection_type TEXT NOT NULL,
+        shared_metadata TEXT,
+        strength REAL DEFAULT 0.0,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (account1_id) REFERENCES accounts (id),
+        FOREIGN KEY (account2_id) REFERENCES accounts (id)
+    )
+    """,
+    """
+    CREATE TABLE analysis_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        analysis_type TEXT NOT NULL,
+        input_data TEXT,
+        result TEXT,
+        processing_time REAL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+THREATS = 20000
+ACCOUNTS = 12000
+START = datetime(2026, 1, 1)
+
+def _threat_metadata(i: int):
+    return {"source": "scraper", "sequence": i, "tags": ["rally", f"t{i % 7}"]}
+
+@pytest.fixture(scope="module")
+def legacy_database(tmp_path_factory):
+    """Path of a generated database in the legacy schema"""
+    path = str(tmp_path_factory.mktemp("legacy") / "pindar.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        for statement in LEGACY_SCHEMA:
+            conn.execute(statement)
+        conn.executemany("""
+            INSERT INTO threats (
+                platform, channel, message, threat_score, risk_level,
+                bot_detected, metadata, analysis_result, timestamp
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (
+                ("telegram", "whatsapp", "twitter")[i % 3], "c", f"rally token{i}", i % 100,
+                "high" if i % 100 >= 80 else "low", i % 2 == 0, json.dumps(_threat_metadata(i)),
+                json.dumps({"score": i % 100}),
+                # Ten threats share each timestamp
+                f"{START + timedelta(minutes=i // 10):%Y-%m-%d %H:%M:%S}"
+            )
+            for i in range(THREATS)
+        ))
+        conn.executemany("""
+            INSERT INTO accounts (username, platform, threat_score, bot_confidence, metadata, message_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            (
+                f"user{i}", "telegram", i % 100, (i % 10) / 10,
+                json.dumps({"phone_numbers": [f"+91{i:010d}"], "email_addresses": []}), i % 5
+            )
+            for i in range(ACCOUNTS)
+        ))
+    conn.close()
+    return path
+
+@pytest.fixture
+def database_path(legacy_database, tmp_path):
+    """Fresh copy of the legacy database for a test to migrate"""
+    path = str(tmp_path / "pindar.db")
+    shutil.copy(legacy_database, path)
+    return path
+
+def test_migrations_upgrade_generated_database(database_path):
+    db = Database(database_path)
+    conn = db._get_connection()
+    
+    assert db.schema_version() == len(Database.MIGRATIONS)
+    assert conn.execute("SELECT COUNT(*) FROM schema_version WHERE backfilled_at IS NULL").fetchone()[0] == 0
+    
+    # Backfilled full-text index and identifiers
+    assert [threat["id"] for threat in db.search_threats("token19999")] == [THREATS]
+    accounts = db.find_accounts_by_identifier("phone_numbers", "+910000011999")
+    assert [account["username"] for account in accounts] == ["user11999"]
+    
+    statistics = db.get_statistics()
+    assert statistics["total_threats"] == THREATS
+    assert statistics["high_risk_threats"] == THREATS // 5
+    assert statistics["total_accounts"] == ACCOUNTS
+    assert statistics["high_risk_accounts"] == ACCOUNTS // 5
+    
+    # Legacy rows written by json.dumps stay readable
+    assert db.get_recent_threats(1)[0]["metadata"] == _threat_metadata(THREATS - 1)
+    db.close()
+    
+    reopened = Database(database_path)
+    assert reopened.schema_version() == len(Database.MIGRATIONS)
+    reopened.close()
+
+def test_interrupted_backfill_resumes(database_path, monkeypatch):
+    calls = []
+    link_identifiers = Database._link_identifiers
+    
+    def fail_second_batch(self, conn, identifiers):
+        calls.append(len(identifiers))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("interrupted")
+        return link_identifiers(self, conn, identifiers)
+    
+    monkeypatch.setattr(Database, "_link_identifiers", fail_second_batch)
+    with pytest.raises(sqlite3.OperationalError):
+        Database(database_path)
+    monkeypatch.undo()
+    
+    db = Database(database_path)
+    conn = db._get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM schema_version WHERE backfilled_at IS NULL").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(DISTINCT account_id) FROM account_identifiers").fetchone()[0] == ACCOUNTS
+    db.close()
+
+def test_backfill_runs_in_batches_and_resumes(database_path):
+    db = Database(database_path)
+    batches = []
+    
+    updated = db.backfill(
+        "threats", "risk_level = ?", "risk_level != ?",
+        params=("reviewed",), where_params=("reviewed",), batch_size=3000, pause=0,
+        progress=lambda done, total: batches.append(done)
+    )
+    
+    assert updated == THREATS
+    assert len(batches) == math.ceil(THREATS / 3000)
+    assert db.backfill(
+        "threats", "risk_level = ?", "risk_level != ?", params=("reviewed",), where_params=("reviewed",), pause=0
+    ) == 0
+    db.close()
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000, THREATS + 1])
+def test_keyset_pages_match_a_single_query(database_path, batch_size):
+    db = Database(database_path)
+    conn = db._get_connection()
+    since = f"{START + timedelta(minutes=500):%Y-%m-%d %H:%M:%S}"
+    until = f"{START + timedelta(minutes=560):%Y-%m-%d %H:%M:%S}"
+    
+    expected = [row[0] for row in conn.execute(
+        "SELECT id FROM threats WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp DESC, id DESC", (since, until)
+    )]
+    assert len(expected) == 600
+    threats = db.iter_threats(since=since, until=until, batch_size=batch_size)
+    assert [threat["id"] for threat in threats] == expected
+    
+    expected = [row[0] for row in conn.execute(
+        "SELECT id FROM threats WHERE timestamp >= ? AND timestamp < ? ORDER BY id", (since, until)
+    )]
+    assert [threat["id"] for threat in db.iter_table("threats", since, until, batch_size=batch_size)] == expected
+    db.close()
+
+def test_lazy_records_match_decoded_rows(database_path):
+    db = Database(database_path)
+    
+    lazy = list(db.iter_threats(batch_size=500))
+    decoded = list(db.iter_threats(batch_size=500, lazy=False))
+    assert len(lazy) == len(decoded) == THREATS
+    
+    record = lazy[0]
+    assert record.raw("metadata") == json.dumps(_threat_metadata(THREATS - 1))
+    assert record["metadata"] == _threat_metadata(THREATS - 1)
+    assert all(dict(record) == row for record, row in zip(lazy, decoded))
+    db.close()
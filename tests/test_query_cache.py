@@ -0,0 +1,168 @@
+import time
+
+import pytest
+
+from utils.database import Database
+from utils.query_cache import QueryCache
+
+class Loader:
+    """Query stand-in that counts its calls"""
+    
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result
+    
+    def __call__(self):
+        self.calls += 1
+        return self.result if self.result is not None else {"call": self.calls}
+
+def test_results_expire_after_ttl():
+    cache = QueryCache(ttl=0.05)
+    load = Loader()
+    assert cache.get_or_load("threats", "recent", (50,), load) == {"call": 1}
+    assert cache.get_or_load("threats", "recent", (50,), load) == {"call": 1}
+    time.sleep(0.06)
+    assert cache.get_or_load("threats", "recent", (50,), load) == {"call": 2}
+
+def test_least_recently_used_result_is_evicted():
+    cache = QueryCache(max_entries=2)
+    loads = {name: Loader() for name in "abc"}
+    for name in "ab":
+        cache.get_or_load("threats", name, (), loads[name])
+    cache.get_or_load("threats", "a", (), loads["a"])
+    cache.get_or_load("threats", "c", (), loads["c"])
+    
+    # b was used least recently
+    assert sorted(key[1] for key in cache._entries) == ["a", "c"]
+    assert cache.metrics()["evictions"] == 1
+    cache.get_or_load("threats", "b", (), loads["b"])
+    assert {name: load.calls for name, load in loads.items()} == {"a": 1, "b": 2, "c": 1}
+
+def test_invalidation_is_per_table():
+    cache = QueryCache()
+    threats, accounts = Loader(), Loader()
+    cache.get_or_load("threats", "recent", (), threats)
+    cache.get_or_load("accounts", "high_risk", (80,), accounts)
+    
+    cache.invalidate("threats")
+    cache.get_or_load("threats", "recent", (), threats)
+    cache.get_or_load("accounts", "high_risk", (80,), accounts)
+    assert (threats.calls, accounts.calls) == (2, 1)
+
+def test_arguments_are_part_of_the_key_and_results_are_copies():
+    cache = QueryCache()
+    load = Loader(result=[{"id": 1}])
+    first = cache.get_or_load("threats", "recent", (10,), load)
+    first.append({"id": 2})
+    
+    assert cache.get_or_load("threats", "recent", (10,), load) == [{"id": 1}]
+    cache.get_or_load("threats", "recent", (20,), load)
+    assert load.calls == 2
+
+def test_metrics():
+    cache = QueryCache()
+    load = Loader()
+    for _ in range(3):
+        cache.get_or_load("threats", "recent", (), load)
+    cache.invalidate("threats", "alerts")
+    
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["redis_hits"]) == (2, 1, 0)
+    assert metrics["hit_ratio"] == pytest.approx(2 / 3)
+    assert metrics["invalidations"] == 2
+    assert metrics["entries"] == 0
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    
+    def connect(namespace="pindar"):
+        cache = QueryCache(namespace=namespace)
+        cache.redis = fakeredis.FakeRedis(server=server)
+        return cache
+    return server, connect
+
+def test_redis_tier_is_shared_between_processes(redis_server):
+    _, connect = redis_server
+    first, second = connect(), connect()
+    load = Loader()
+    
+    first.get_or_load("threats", "recent", (50,), load)
+    assert second.get_or_load("threats", "recent", (50,), load) == {"call": 1}
+    assert second.metrics()["redis_hits"] == 1
+    
+    # A write in one process makes the other's cached copy stale too
+    first.invalidate("threats")
+    assert second.get_or_load("threats", "recent", (50,), load) == {"call": 2}
+    
+    # Namespaces keep databases apart
+    assert connect("other").get_or_load("threats", "recent", (50,), load) == {"call": 3}
+
+def test_unreachable_redis_bypasses_the_cache(redis_server):
+    server, connect = redis_server
+    cache = connect()
+    load = Loader()
+    cache.get_or_load("threats", "recent", (), load)
+    
+    server.connected = False
+    cache.get_or_load("threats", "recent", (), load)
+    cache.invalidate("threats")
+    assert load.calls == 2
+    assert cache.metrics()["redis_errors"] == 2
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "pindar.db"), cache=QueryCache(ttl=60))
+    database.store_threat({"message": "first"})
+    database.store_account({"username": "first", "platform": "telegram", "threat_score": 90})
+    database.store_alert({"message": "first", "severity": "high"})
+    yield database
+    database.close()
+
+def _backdate_threats(db):
+    conn = db._get_connection()
+    with conn:
+        conn.execute("UPDATE threats SET timestamp = datetime(timestamp, '-60 days')")
+    # The raw update bypasses the write methods
+    db.cache.invalidate("threats")
+
+WRITES = {
+    "store_threat": (lambda db: db.store_threat({"message": "new"}), lambda db: db.get_recent_threats()),
+    "store_threats_many": (lambda db: db.store_threats_many([{"message": "new"}]), lambda db: db.get_recent_threats()),
+    "store_account": (
+        lambda db: db.store_account({"username": "new", "platform": "telegram", "threat_score": 95}),
+        lambda db: db.get_high_risk_accounts()
+    ),
+    "store_accounts_many": (
+        lambda db: db.store_accounts_many([{"username": "first", "platform": "telegram", "threat_score": 10}]),
+        lambda db: db.get_high_risk_accounts()
+    ),
+    "store_alert": (lambda db: db.store_alert({"message": "new"}), lambda db: db.get_unacknowledged_alerts()),
+    "store_alerts_many": (lambda db: db.store_alerts_many([{"message": "new"}]), lambda db: db.get_unacknowledged_alerts()),
+    "acknowledge_alert": (lambda db: db.acknowledge_alert(1), lambda db: db.get_unacknowledged_alerts()),
+    "cleanup_old_data": (lambda db: db.cleanup_old_data(30), lambda db: db.get_recent_threats())
+}
+
+@pytest.mark.parametrize("name", WRITES)
+def test_writes_make_cached_reads_stale(db, name):
+    write, read = WRITES[name]
+    if name == "cleanup_old_data":
+        _backdate_threats(db)
+    cached = read(db)
+    assert read(db) == cached
+    
+    write(db)
+    fresh = read(db)
+    assert fresh != cached
+    # The fresh result is what the database holds
+    db.cache.clear()
+    assert read(db) == fresh
+
+@pytest.mark.parametrize("write", [
+    lambda db: db.store_network_connection({"account1_id": 1, "account2_id": 1}),
+    lambda db: db.store_network_connections_many([{"account1_id": 1, "account2_id": 1}])
+])
+def test_network_connection_writes_invalidate_their_table(db, write):
+    write(db)
+    assert db.cache._generations["network_connections"] == 1
@@ -0,0 +1,69 @@
+import pytest
+
+from utils.database import Database
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    db = Database(str(tmp_path_factory.mktemp("plans") / "pindar.db"))
+    db.store_threats_many({"platform": "telegram", "threat_score": i % 100} for i in range(200))
+    db.store_accounts_many(
+        {"username": f"u{i}", "platform": "telegram", "threat_score": i, "metadata": {"phone_numbers": [f"+91{i}"]}}
+        for i in range(100)
+    )
+    db.store_alerts_many({"message": "m", "severity": "low"} for _ in range(50))
+    db.store_network_connections_many(
+        {"account1_id": i % 10 + 1, "account2_id": i % 7 + 1, "strength": i / 100} for i in range(100)
+    )
+    yield db
+    db.close()
+
+def _query_plans(database, call):
+    """EXPLAIN QUERY PLAN of every SELECT a call runs, with its parameters bound"""
+    statements = []
+    conn = database._get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return {
+        sql: database.query_plan(sql)
+        for sql in statements if sql.lstrip().upper().startswith("SELECT")
+    }
+
+# (query, whether its ORDER BY must be served by an index). Paged queries run
+# once per page, so sorting there would re-sort the remaining rows every page;
+# find_accounts_by_identifier sorts only the accounts holding one identifier.
+HOT_QUERIES = {
+    "recent_threats": (lambda db: db.get_recent_threats(10), True),
+    "iter_threats": (lambda db: list(db.iter_threats(since="2000-01-01", batch_size=50)), True),
+    "high_risk_accounts": (lambda db: db.get_high_risk_accounts(80), True),
+    "unacknowledged_alerts": (lambda db: db.get_unacknowledged_alerts(), True),
+    "network_connections_of_account": (lambda db: db.get_network_connections(3), True),
+    "network_connections": (lambda db: db.get_network_connections(), True),
+    "find_accounts_by_identifier": (lambda db: db.find_accounts_by_identifier("phone_numbers", "+915"), False),
+    "iter_table": (lambda db: list(db.iter_table("threats", batch_size=50)), True)
+}
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(database, name):
+    call, ordered_by_index = HOT_QUERIES[name]
+    plans = _query_plans(database, lambda: call(database))
+    assert plans
+    for sql, plan in plans.items():
+        for step in plan:
+            # An index walk in key order shows as "SCAN ... USING INDEX"
+            assert not (step.startswith("SCAN") and "INDEX" not in step), (sql, plan)
+            if ordered_by_index:
+                assert "TEMP B-TREE" not in step, (sql, plan)
+
+def test_network_connections_of_account(database):
+    connections = database.get_network_connections(3)
+    # Includes connections of the account with itself, which match both branches
+    expected = sorted(
+        (c for c in database.get_network_connections() if 3 in (c["account1_id"], c["account2_id"])),
+        key=lambda c: (c["strength"], c["id"]),
+        reverse=True
+    )
+    assert [connection["id"] for connection in connections] == [connection["id"] for connection in expected]
+    assert [c["id"] for c in database.iter_network_connections(3, batch_size=3)] == [c["id"] for c in connections]
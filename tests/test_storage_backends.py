@@ -0,0 +1,268 @@
+import os
+import uuid
+import csv
+
+import pytest
+
+from utils.storage_backend import create_database
+from utils.batch_writer import BatchWriter
+from utils.data_exporter import DataExporter
+from utils.helpers import create_network_graph
+from utils.identifiers import IDENTIFIER_KINDS
+
+# The PostgreSQL cases run only against a server given here, e.g. postgresql://localhost/pindar_test
+POSTGRES_DSN = os.environ.get("PINDAR_TEST_POSTGRES_DSN")
+
+THREATS = [
+    {
+        "platform": platform,
+        "channel": "c",
+        "message": message,
+        "threat_score": score,
+        "risk_level": "high" if score >= 80 else "low",
+        "bot_detected": score % 2 == 0,
+        "metadata": {"k": i},
+        "analysis_result": {"score": score}
+    }
+    for i, (platform, message, score) in enumerate([
+        ("telegram", "vote rally tonight at the square", 90),
+        ("whatsapp", "peaceful protest tomorrow", 40),
+        ("telegram", "rally rally vote now", 85),
+        ("twitter", "nothing here", 10)
+    ] * 3)
+]
+
+ACCOUNTS = [
+    {
+        "username": f"u{i % 5}",
+        "platform": "telegram",
+        "threat_score": 50 + i * 5,
+        "bot_confidence": 0.1 * i,
+        "metadata": {"phone_numbers": [f"+91{i % 3}"], "email_addresses": ["a@b.in"] if i % 2 else []}
+    }
+    for i in range(10)
+]
+
+@pytest.fixture(params=["sqlite", "duckdb", "postgres"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        db = create_database(f"sqlite:///{tmp_path}/pindar.db")
+        yield db
+        db.close()
+    elif request.param == "duckdb":
+        pytest.importorskip("duckdb")
+        db = create_database(f"duckdb:///{tmp_path}/pindar.duckdb")
+        yield db
+        db.close()
+    else:
+        psycopg2 = pytest.importorskip("psycopg2")
+        if not POSTGRES_DSN:
+            pytest.skip("PINDAR_TEST_POSTGRES_DSN is not set")
+        # Each test gets its own schema, dropped afterwards
+        schema = f"pindar_test_{uuid.uuid4().hex}"
+        admin = psycopg2.connect(POSTGRES_DSN)
+        admin.autocommit = True
+        admin.cursor().execute(f"CREATE SCHEMA {schema}")
+        separator = "&" if "?" in POSTGRES_DSN else "?"
+        db = create_database(f"{POSTGRES_DSN}{separator}options=-csearch_path%3D{schema}")
+        yield db
+        db.close()
+        admin.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+def _backdate(db, table: str, days: int):
+    """Move every row of a table back in time, in the backend's SQL dialect"""
+    name = type(db).__name__
+    if name == "PostgresDatabase":
+        with db._cursor() as cursor:
+            cursor.execute(f"UPDATE {table} SET timestamp = timestamp - interval '{days} days'")
+    elif name == "DuckDBDatabase":
+        db._get_connection().execute(f"UPDATE {table} SET timestamp = timestamp - INTERVAL {days} DAY")
+    else:
+        conn = db._get_connection()
+        with conn:
+            conn.execute(f"UPDATE {table} SET timestamp = datetime(timestamp, '-{days} days')")
+
+def _populate(db):
+    db.store_threat(THREATS[0])
+    db.store_threats_many(THREATS[1:], batch_size=4)
+    db.store_account(ACCOUNTS[0])
+    db.store_accounts_many(ACCOUNTS, batch_size=3)
+    alert_id = db.store_alert({"alert_type": "x", "severity": "high", "message": "m", "details": {"a": 1}})
+    db.store_alerts_many([{"alert_type": "y", "severity": "low", "message": "m2"}] * 3)
+    ids = {account["username"]: account["id"] for account in db.iter_table("accounts", lazy=False)}
+    db.store_network_connections_many([
+        {"account1_id": ids["u0"], "account2_id": ids["u1"], "strength": 0.5, "shared_metadata": ["phone_numbers"]}
+    ])
+    return alert_id, ids
+
+def test_store_and_query(backend):
+    alert_id, ids = _populate(backend)
+    
+    assert backend.acknowledge_alert(alert_id)
+    assert not backend.acknowledge_alert(99999)
+    assert len(backend.get_unacknowledged_alerts()) == 3
+    
+    recent = backend.get_recent_threats(5)
+    assert len(recent) == 5
+    assert recent[0]["message"] == THREATS[-1]["message"]
+    assert recent[0]["metadata"] == THREATS[-1]["metadata"]
+    
+    assert [account["username"] for account in backend.get_high_risk_accounts(80)] == ["u4", "u3", "u2", "u1"]
+    assert sorted(a["username"] for a in backend.find_accounts_by_identifier("phone_numbers", "+910")) == ["u1", "u4"]
+    assert len(backend.get_network_connections(ids["u0"])) == 1
+    
+    results = backend.search_threats("rally vote")
+    assert {result["message"] for result in results} == {"vote rally tonight at the square", "rally rally vote now"}
+
+def test_iteration(backend):
+    _populate(backend)
+    
+    assert len(list(backend.iter_threats(batch_size=2))) == len(THREATS)
+    accounts = sorted(
+        (account["username"], account["message_count"], account["metadata"]["phone_numbers"][0])
+        for account in backend.iter_table("accounts", batch_size=2, lazy=False)
+    )
+    assert accounts == [("u0", 2, "+912"), ("u1", 1, "+910"), ("u2", 1, "+911"), ("u3", 1, "+912"), ("u4", 1, "+910")]
+    assert {table: len(rows) for table, rows in backend.export_data().items()}["threats"] == len(THREATS)
+
+def test_statistics(backend):
+    _populate(backend)
+    
+    statistics = backend.get_statistics()
+    assert statistics["total_threats"] == len(THREATS)
+    assert statistics["high_risk_threats"] == 6
+    assert statistics["average_threat_score"] == pytest.approx(56.25)
+    assert statistics["total_accounts"] == 5
+    assert statistics["high_risk_accounts"] == 4
+    assert statistics["bot_accounts"] == 3
+    assert statistics["unacknowledged_alerts"] == 4
+    assert statistics["high_severity_alerts"] == 1
+    assert statistics["platform_distribution"] == {"telegram": 6, "whatsapp": 3, "twitter": 3}
+
+def test_cleanup(backend, tmp_path):
+    backend.store_threats_many([{"message": f"m{i}"} for i in range(7)])
+    backend.store_alerts_many([{"message": "a", "severity": severity} for severity in ("high", "low")])
+    _backdate(backend, "threats", 40)
+    _backdate(backend, "alerts", 40)
+    backend.store_threat({"message": "fresh"})
+    backend.batch_size = 3
+    
+    steps = []
+    deleted = backend.cleanup_old_data(30, archive_dir=str(tmp_path / "archive"), progress=steps.append)
+    
+    # High severity alerts are kept
+    assert deleted == 8
+    assert len(steps) > 2
+    assert [threat["message"] for threat in backend.get_recent_threats()] == ["fresh"]
+    assert backend.get_statistics()["total_threats"] == 1
+    assert [alert["severity"] for alert in backend.get_unacknowledged_alerts()] == ["high"]
+
+def test_export_columns(backend, tmp_path):
+    _populate(backend)
+    exporter = DataExporter(backend, batch_size=5)
+    
+    assert exporter.export("threats", str(tmp_path / "threats.csv"), "csv") == len(THREATS)
+    with open(tmp_path / "threats.csv", newline="") as f:
+        header, first = list(csv.reader(f))[:2]
+    assert header == [name for name, _ in backend.get_columns("threats")]
+    assert first[header.index("message")] == THREATS[0]["message"]
+    
+    pq = pytest.importorskip("pyarrow.parquet")
+    assert exporter.export("threats", str(tmp_path / "threats.parquet"), "parquet") == len(THREATS)
+    table = pq.read_table(tmp_path / "threats.parquet")
+    assert table.column("threat_score").to_pylist()[:2] == [90, 40]
+    assert table.column("bot_detected").to_pylist()[:2] == [True, True]
+
+def test_account_message_count(backend):
+    backend.store_account({"username": "alice", "platform": "telegram"})
+    backend.store_account({"username": "alice", "platform": "telegram"})
+    # Repeats within one batch count like separate writes
+    backend.store_accounts_many([{"username": name, "platform": "telegram"} for name in ("alice", "alice", "bob")])
+    backend.store_accounts_many([{"username": "bob", "platform": "telegram"}], batch_size=1)
+    
+    counts = {account["username"]: account["message_count"] for account in backend.iter_table("accounts", lazy=False)}
+    assert counts == {"alice": 3, "bob": 1}
+
+def _without(record: dict, *names: str) -> dict:
+    return {key: value for key, value in record.items() if key not in ("id", "timestamp", "first_seen", "last_seen", *names)}
+
+def test_batch_and_single_row_writes_agree(backend):
+    for mode in ("single", "batch"):
+        threats = [{**threat, "channel": mode} for threat in THREATS]
+        accounts = [{**account, "username": f"{mode}_{account['username']}"} for account in ACCOUNTS]
+        alerts = [{"alert_type": mode, "severity": "high", "message": f"m{i}", "details": {"i": i}} for i in range(4)]
+        if mode == "single":
+            for threat in threats:
+                backend.store_threat(threat)
+            for account in accounts:
+                backend.store_account(account)
+            for alert in alerts:
+                backend.store_alert(alert)
+        else:
+            backend.store_threats_many(threats, batch_size=5)
+            backend.store_accounts_many(accounts, batch_size=3)
+            backend.store_alerts_many(alerts, batch_size=3)
+    
+    threats = {"single": [], "batch": []}
+    for threat in backend.iter_table("threats", lazy=False):
+        threats[threat["channel"]].append(_without(threat, "channel"))
+    assert threats["single"] == threats["batch"]
+    
+    accounts = {"single": {}, "batch": {}}
+    for account in backend.iter_table("accounts", lazy=False):
+        mode, username = account["username"].split("_")
+        accounts[mode][username] = _without(account, "username")
+    assert accounts["single"] == accounts["batch"]
+    
+    alerts = {"single": [], "batch": []}
+    for alert in backend.iter_table("alerts", lazy=False):
+        alerts[alert["alert_type"]].append(_without(alert, "alert_type"))
+    assert alerts["single"] == alerts["batch"]
+    
+    for kind, value in [("phone_numbers", "+910"), ("phone_numbers", "+912"), ("email_addresses", "a@b.in")]:
+        linked = {"single": set(), "batch": set()}
+        for account in backend.find_accounts_by_identifier(kind, value):
+            mode, username = account["username"].split("_")
+            linked[mode].add(username)
+        assert linked["single"] == linked["batch"] and linked["single"], (kind, value)
+
+def test_batch_writer_flushes_by_size_and_on_exit(backend):
+    with BatchWriter(backend, batch_size=4, flush_interval=60) as writer:
+        for threat in THREATS[:6]:
+            writer.add_threat(threat)
+        # The first four were written when the batch filled up
+        assert writer.pending()["threats"] == 2
+        assert backend.get_statistics()["total_threats"] == 4
+        for account in ACCOUNTS:
+            writer.add_account(account)
+    
+    assert writer.pending() == {kind: 0 for kind in writer.pending()}
+    assert writer.rows_written == 6 + len(ACCOUNTS)
+    assert backend.get_statistics()["total_threats"] == 6
+    counts = {account["username"]: account["message_count"] for account in backend.iter_table("accounts", lazy=False)}
+    assert counts == {"u0": 1, "u1": 1, "u2": 1, "u3": 1, "u4": 1}
+
+def test_network_graph_edges_come_from_shared_identifiers(backend):
+    _populate(backend)
+    backend.store_account({"username": "loner", "platform": "telegram", "metadata": {"phone_numbers": ["+919"]}})
+    accounts = list(backend.iter_table("accounts", lazy=False))
+    graph = create_network_graph(accounts, backend)
+    
+    # Pairwise comparison of the stored metadata lists
+    expected = {}
+    for i, first in enumerate(accounts):
+        for second in accounts[i + 1:]:
+            kinds = [
+                kind for kind in IDENTIFIER_KINDS
+                if set(first["metadata"].get(kind, [])) & set(second["metadata"].get(kind, []))
+            ]
+            if kinds:
+                expected[frozenset((first["id"], second["id"]))] = kinds
+    edges = {frozenset((edge["from"], edge["to"])): edge["shared_metadata"] for edge in graph["edges"]}
+    assert len(expected) > 1
+    assert edges == expected
+    assert graph["statistics"]["total_nodes"] == 6
+    
+    # Only the accounts passed in are linked
+    assert create_network_graph(accounts[:1], backend)["edges"] == []
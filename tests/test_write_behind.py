@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from utils.database import Database
+from utils.write_behind import WriteBehindWriter
+
+def _threat(i: int) -> dict:
+    return {"platform": "telegram", "channel": "c", "message": f"rally {i}", "threat_score": i % 100}
+
+def _messages(db: Database) -> list:
+    return sorted(threat["message"] for threat in db.iter_threats())
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "pindar.db"))
+    yield database
+    database.close()
+
+def test_queued_rows_are_group_committed(db):
+    with WriteBehindWriter(db, batch_size=100, flush_interval=0.05) as writer:
+        for i in range(250):
+            writer.store_threat(_threat(i))
+        writer.store_account({"username": "alice", "platform": "telegram"})
+        writer.flush()
+        
+        assert writer.queue.qsize() == 0
+        assert len(_messages(db)) == 250
+        assert db.get_statistics()["total_accounts"] == 1
+        
+        metrics = writer.metrics()
+        assert metrics["rows_written"] == 251
+        assert 3 <= metrics["commits"] < 251
+        assert metrics["errors"] == 0 and metrics["failed_rows"] == 0
+
+def test_close_commits_remaining_rows(db):
+    # Without close the rows would wait for the full flush interval
+    writer = WriteBehindWriter(db, batch_size=1000, flush_interval=30)
+    for i in range(10):
+        writer.store_threat(_threat(i))
+    writer.close(timeout=5)
+    
+    assert not writer._thread.is_alive()
+    assert _messages(db) == sorted(f"rally {i}" for i in range(10))
+    with pytest.raises(RuntimeError):
+        writer.store_threat(_threat(10))
+
+def test_full_queue_blocks_producers(db):
+    release = threading.Event()
+    writer = WriteBehindWriter(db, max_queue=2, batch_size=1, flush_interval=0.01)
+    store = writer.writers["threats"]
+    writer.writers["threats"] = lambda rows, batch_size: release.wait() and store(rows, batch_size=batch_size)
+    
+    producer = threading.Thread(target=lambda: [writer.store_threat(_threat(i)) for i in range(6)])
+    producer.start()
+    producer.join(0.3)
+    assert producer.is_alive()
+    
+    release.set()
+    producer.join()
+    writer.close()
+    assert writer.metrics()["blocked_puts"] >= 1
+    assert len(_messages(db)) == 6
+
+def test_transient_failures_are_retried(db):
+    writer = WriteBehindWriter(db, flush_interval=0.01, retries=3, retry_backoff=0.001)
+    store = writer.writers["threats"]
+    attempts = []
+    
+    def flaky(rows, batch_size):
+        attempts.append(len(rows))
+        if len(attempts) < 3:
+            raise RuntimeError("database is locked")
+        return store(rows, batch_size=batch_size)
+    
+    writer.writers["threats"] = flaky
+    for i in range(5):
+        writer.store_threat(_threat(i))
+    writer.close()
+    
+    assert len(_messages(db)) == 5
+    assert writer.metrics()["errors"] == 2
+    assert writer.failed == []
+
+def test_failed_rows_are_kept_and_reported(db):
+    writer = WriteBehindWriter(db, flush_interval=0.01, retries=1, retry_backoff=0.001)
+    store = writer.writers["threats"]
+    
+    def broken(rows, batch_size):
+        raise RuntimeError("disk I/O error")
+    
+    writer.writers["threats"] = broken
+    for i in range(5):
+        writer.store_threat(_threat(i))
+    
+    with pytest.raises(RuntimeError) as raised:
+        writer.flush()
+    assert isinstance(raised.value.__cause__, RuntimeError)
+    assert writer.metrics()["failed_rows"] == 5
+    # The failure is reported once
+    writer.flush()
+    
+    # The caller can resubmit the kept rows once the database recovers
+    writer.writers["threats"] = store
+    for kind, row in writer.take_failed():
+        writer.submit(kind, row)
+    writer.close()
+    assert _messages(db) == sorted(f"rally {i}" for i in range(5))
+    assert writer.failed == []
+
+def test_failure_on_close_is_raised(db):
+    writer = WriteBehindWriter(db, batch_size=1000, flush_interval=30, retries=0)
+    writer.writers["threats"] = lambda rows, batch_size: 1 / 0
+    writer.store_threat(_threat(0))
+    
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert writer.take_failed() == [("threats", _threat(0))]
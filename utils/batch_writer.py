@@ -0,0 +1,100 @@
+import time
+from typing import Dict, List, Any
+
+from utils.database import Database
+
+class BatchWriter:
+    """
+    Buffers rows in memory and writes them to the database in batches
+    """
+    
+    def __init__(self, database: Database, batch_size: int = 5000, flush_interval: float = 1.0):
+        """
+        Args:
+            database: Database the rows are written to
+            batch_size: Buffered rows of one kind that trigger a flush
+            flush_interval: Seconds after which buffered rows are flushed on the next add
+        """
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        # kind -> bulk store method
+        self.writers = {
+            "threats": database.store_threats_many,
+            "accounts": database.store_accounts_many,
+            "alerts": database.store_alerts_many,
+            "network_connections": database.store_network_connections_many
+        }
+        self.buffers = {kind: [] for kind in self.writers}
+        self.last_flush = time.monotonic()
+        self.rows_written = 0
+    
+    def add(self, kind: str, row: Dict[str, Any]) -> None:
+        """
+        Buffer a row, flushing when the batch is full or the interval has elapsed
+        
+        Args:
+            kind: "threats", "accounts", "alerts" or "network_connections"
+            row: Row dictionary in the format of the matching store_* method
+        """
+        if kind not in self.writers:
+            raise ValueError(f"Unknown row kind: {kind}")
+        
+        buffer = self.buffers[kind]
+        buffer.append(row)
+        
+        if len(buffer) >= self.batch_size:
+            self._flush_kind(kind)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+    
+    def add_threat(self, threat_data: Dict[str, Any]) -> None:
+        """Buffer a threat"""
+        self.add("threats", threat_data)
+    
+    def add_account(self, account_data: Dict[str, Any]) -> None:
+        """Buffer an account upsert"""
+        self.add("accounts", account_data)
+    
+    def add_alert(self, alert_data: Dict[str, Any]) -> None:
+        """Buffer an alert"""
+        self.add("alerts", alert_data)
+    
+    def add_network_connection(self, connection_data: Dict[str, Any]) -> None:
+        """Buffer a network connection"""
+        self.add("network_connections", connection_data)
+    
+    def flush(self) -> int:
+        """
+        Write every buffered row
+        
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        for kind in self.writers:
+            written += self._flush_kind(kind)
+        self.last_flush = time.monotonic()
+        return written
+    
+    def _flush_kind(self, kind: str) -> int:
+        """Write the buffered rows of one kind in a single batch"""
+        buffer = self.buffers[kind]
+        if not buffer:
+            return 0
+        
+        written = self.writers[kind](buffer, batch_size=len(buffer))
+        self.buffers[kind] = []
+        self.rows_written += written
+        return written
+    
+    def pending(self) -> Dict[str, int]:
+        """Number of buffered rows per kind"""
+        return {kind: len(buffer) for kind, buffer in self.buffers.items()}
+    
+    def __enter__(self) -> "BatchWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
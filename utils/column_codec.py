@@ -0,0 +1,99 @@
+import json
+import zlib
+from typing import Any, Union
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+class ColumnCodec:
+    """
+    Encoding of JSON-valued columns: compact JSON text, or tagged binary blobs
+    """
+    
+    # First byte of a binary value; JSON text never starts with these
+    ZLIB_JSON = b"\x01"
+    MSGPACK = b"\x02"
+    ZLIB_MSGPACK = b"\x03"
+    
+    def __init__(self, format: str = "json", compress_threshold: int = 1024, level: int = 6):
+        """
+        Args:
+            format: "json" for compact JSON text or "msgpack" for MessagePack blobs
+            compress_threshold: Encoded values longer than this many bytes are
+                zlib-compressed; None disables compression
+            level: zlib compression level
+        """
+        if format not in ("json", "msgpack"):
+            raise ValueError(f"Unknown column format: {format}")
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            raise RuntimeError("The msgpack column format requires the msgpack package")
+        
+        self.format = format
+        self.compress_threshold = compress_threshold
+        self.level = level
+    
+    def encode(self, value: Any) -> Union[str, bytes]:
+        """
+        Encode a value for storage
+        
+        Small JSON values stay plain text, so they remain readable from SQL.
+        
+        Args:
+            value: JSON-compatible value
+        
+        Returns:
+            Text or a tagged binary blob
+        """
+        if self.format == "msgpack":
+            packed = msgpack.packb(value, use_bin_type=True)
+            if self._compress(packed):
+                return self.ZLIB_MSGPACK + zlib.compress(packed, self.level)
+            return self.MSGPACK + packed
+        
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        if self._compress(text):
+            return self.ZLIB_JSON + zlib.compress(text.encode("utf-8"), self.level)
+        return text
+    
+    def decode(self, stored: Union[str, bytes]) -> Any:
+        """
+        Decode a stored value written by any codec setting, including legacy JSON text
+        
+        Args:
+            stored: Column value as read from the database
+        
+        Returns:
+            Decoded value
+        """
+        if isinstance(stored, str):
+            return json.loads(stored)
+        
+        tag, payload = stored[:1], stored[1:]
+        if tag == self.ZLIB_JSON:
+            return json.loads(zlib.decompress(payload))
+        if tag in (self.MSGPACK, self.ZLIB_MSGPACK):
+            if not MSGPACK_AVAILABLE:
+                raise RuntimeError("Decoding msgpack columns requires the msgpack package")
+            if tag == self.ZLIB_MSGPACK:
+                payload = zlib.decompress(payload)
+            return msgpack.unpackb(payload, raw=False)
+        return json.loads(stored)
+    
+    def decode_or_raw(self, stored: Union[str, bytes]) -> Any:
+        """Decode a stored value, returning it unchanged if it is not encoded JSON (legacy free text)"""
+        try:
+            return self.decode(stored)
+        except (ValueError, zlib.error):
+            return stored
+    
+    def to_text(self, stored: Union[str, bytes]) -> str:
+        """Stored value as compact JSON text, for text exports"""
+        if stored is None or isinstance(stored, str):
+            return stored
+        return json.dumps(self.decode(stored), separators=(",", ":"), ensure_ascii=False)
+    
+    def _compress(self, encoded: Union[str, bytes]) -> bool:
+        """Whether an encoded value is large enough to compress"""
+        return self.compress_threshold is not None and len(encoded) > self.compress_threshold
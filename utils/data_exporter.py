@@ -0,0 +1,200 @@
+import os
+import csv
+import json
+from typing import Dict, List, Any, Optional, Callable
+from datetime import datetime
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from utils.storage_backend import StorageBackend
+
+class DataExporter:
+    """
+    Streaming, resumable export of database tables to NDJSON, CSV or Parquet
+    """
+    
+    FORMATS = ("ndjson", "csv", "parquet")
+    
+    # Declared column types of every backend -> Arrow type name; others export as strings
+    ARROW_TYPES = {
+        "INTEGER": "int64",
+        "BIGINT": "int64",
+        "REAL": "float64",
+        "DOUBLE": "float64",
+        "DOUBLE PRECISION": "float64",
+        "BOOLEAN": "bool_"
+    }
+    
+    def __init__(self, database: StorageBackend, batch_size: int = 10000):
+        """
+        Args:
+            database: Database to export from
+            batch_size: Rows read and written per chunk
+        """
+        self.database = database
+        self.batch_size = batch_size
+    
+    def export(
+        self,
+        table: str,
+        path: str,
+        format: str = "ndjson",
+        since: str = None,
+        until: str = None,
+        resume: bool = False,
+        progress: Callable[[int], None] = None
+    ) -> int:
+        """
+        Export a table to a file chunk by chunk
+        
+        NDJSON rows carry decoded JSON columns; CSV and Parquet write them as
+        JSON text. Progress is checkpointed to a "<path>.progress" sidecar
+        after every chunk, so an interrupted NDJSON or CSV export can be
+        resumed from the last completed chunk.
+        
+        Args:
+            table: Table to export
+            path: Output file path
+            format: "ndjson", "csv" or "parquet"
+            since: Optional inclusive lower bound on the table's time column
+            until: Optional exclusive upper bound on the table's time column
+            resume: Continue an interrupted export instead of starting over
+            progress: Optional callback receiving the number of rows exported so far
+        
+        Returns:
+            Number of rows exported in total
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        if format == "parquet" and not PARQUET_AVAILABLE:
+            raise RuntimeError("Parquet export requires pyarrow")
+        
+        settings = {"table": table, "format": format, "since": since, "until": until}
+        state = self._load_progress(path, settings) if resume else None
+        if state is None:
+            state = {**settings, "last_id": 0, "rows": 0, "offset": 0}
+        
+        if format == "parquet":
+            if state["rows"]:
+                raise ValueError("Parquet exports cannot be resumed; start a new export")
+            return self._export_parquet(path, state, progress)
+        return self._export_text(path, state, progress)
+    
+    def _export_text(self, path: str, state: Dict[str, Any], progress: Optional[Callable]) -> int:
+        """Write NDJSON or CSV, truncating any partial chunk left by an interrupted run"""
+        mode = "r+" if state["rows"] else "w"
+        with open(path, mode, newline="", encoding="utf-8") as output:
+            output.seek(state["offset"])
+            output.truncate()
+            
+            writer = csv.writer(output)
+            if state["format"] == "csv" and state["rows"] == 0:
+                writer.writerow([name for name, _ in self._columns(state["table"])])
+            
+            for chunk in self._chunks(state):
+                if state["format"] == "ndjson":
+                    for record in chunk:
+                        output.write(json.dumps(record.to_dict(), default=str))
+                        output.write("\n")
+                else:
+                    writer.writerows([self._raw_text(record, column) for column in record] for record in chunk)
+                
+                output.flush()
+                os.fsync(output.fileno())
+                self._checkpoint(path, state, chunk, output.tell(), progress)
+        
+        self._clear_progress(path)
+        return state["rows"]
+    
+    def _export_parquet(self, path: str, state: Dict[str, Any], progress: Optional[Callable]) -> int:
+        """Write Parquet with one row group per chunk"""
+        schema = self._arrow_schema(state["table"])
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in self._chunks(state):
+                columns = {}
+                for field in schema:
+                    values = [self._raw_text(record, field.name) for record in chunk]
+                    if field.type == pa.bool_():
+                        # SQLite stores booleans as 0/1
+                        values = [None if value is None else bool(value) for value in values]
+                    columns[field.name] = values
+                writer.write_table(pa.table(columns, schema=schema))
+                self._checkpoint(path, state, chunk, 0, progress)
+        
+        self._clear_progress(path)
+        return state["rows"]
+    
+    def _raw_text(self, record, column: str) -> Any:
+        """Raw column value, with JSON columns as JSON text and timestamps as text"""
+        value = record.raw(column)
+        if isinstance(value, bytes):
+            return self.database.codec.to_text(value)
+        if isinstance(value, (dict, list)):
+            # PostgreSQL returns JSONB columns already decoded
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        if isinstance(value, datetime):
+            return value.isoformat(sep=" ")
+        return value
+    
+    def _arrow_schema(self, table: str):
+        """Arrow schema derived from the backend's column declarations"""
+        return pa.schema([
+            (name, getattr(pa, self.ARROW_TYPES.get(declared.upper(), "string"))())
+            for name, declared in self._columns(table)
+        ])
+    
+    def _columns(self, table: str) -> List[tuple]:
+        """(name, declared type) of each column of a table"""
+        return self.database.get_columns(table)
+    
+    def _chunks(self, state: Dict[str, Any]):
+        """Yield lists of up to batch_size records after the checkpointed id"""
+        records = self.database.iter_table(
+            state["table"],
+            since=state["since"],
+            until=state["until"],
+            after_id=state["last_id"],
+            batch_size=self.batch_size
+        )
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def _checkpoint(self, path: str, state: Dict[str, Any], chunk: List[Any], offset: int, progress: Optional[Callable]):
+        """Record a completed chunk in the progress sidecar"""
+        state["last_id"] = chunk[-1]["id"]
+        state["rows"] += len(chunk)
+        state["offset"] = offset
+        
+        temporary = f"{path}.progress.tmp"
+        with open(temporary, "w") as sidecar:
+            json.dump(state, sidecar)
+        os.replace(temporary, f"{path}.progress")
+        
+        if progress:
+            progress(state["rows"])
+    
+    def _load_progress(self, path: str, settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load the checkpoint of an interrupted export, if it matches these settings"""
+        if not os.path.exists(f"{path}.progress") or not os.path.exists(path):
+            return None
+        
+        with open(f"{path}.progress") as sidecar:
+            state = json.load(sidecar)
+        if any(state.get(key) != value for key, value in settings.items()):
+            raise ValueError("Cannot resume: export settings differ from the interrupted export")
+        return state
+    
+    def _clear_progress(self, path: str):
+        """Remove the progress sidecar of a finished export"""
+        if os.path.exists(f"{path}.progress"):
+            os.remove(f"{path}.progress")
@@ -1,28 +1,523 @@
 import sqlite3
 import json
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import weakref
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Sequence, Tuple, Callable
+from itertools import islice
 from datetime import datetime
 import os
 from pathlib import Path
 
-class Database:
+from utils.lazy_record import LazyRecord
+from utils.column_codec import ColumnCodec
+from utils.threat_partitions import ThreatPartitions
+from utils.query_cache import QueryCache
+from utils.storage_backend import StorageBackend, cached_query, invalidates
+
+class _ThreadConnection:
+    """
+    Owner of one thread's connection, referenced only from that thread's local storage
+    
+    Thread-local values are released when their thread exits; a finalizer
+    registered on the owner then closes the connection.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+class Database(StorageBackend):
     """
     Database utility for storing and retrieving threat data
     """
     
-    def __init__(self, db_path: str = "data/pindar.db"):
+    # Applied to every new connection
+    PRAGMAS = {
+        # Only takes effect on new databases, before the first table is created
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY"
+    }
+    
+    # Write statements shared by the single-row and bulk methods
+    THREAT_COLUMNS = (
+        "platform", "channel", "message", "threat_score", "risk_level",
+        "bot_detected", "metadata", "analysis_result"
+    )
+    INSERT_THREAT_SQL = """
+        INSERT INTO threats (
+            platform, channel, message, threat_score, risk_level,
+            bot_detected, metadata, analysis_result
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    UPSERT_ACCOUNT_SQL = """
+        INSERT INTO accounts (
+            username, platform, threat_score, risk_level,
+            bot_confidence, metadata
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(username) DO UPDATE SET
+            threat_score = excluded.threat_score,
+            risk_level = excluded.risk_level,
+            bot_confidence = excluded.bot_confidence,
+            metadata = excluded.metadata,
+            last_seen = CURRENT_TIMESTAMP,
+            message_count = message_count + 1
+    """
+    INSERT_ALERT_SQL = """
+        INSERT INTO alerts (
+            alert_type, severity, message, details
+        ) VALUES (?, ?, ?, ?)
+    """
+    INSERT_NETWORK_CONNECTION_SQL = """
+        INSERT INTO network_connections (
+            account1_id, account2_id, connection_type,
+            shared_metadata, strength
+        ) VALUES (?, ?, ?, ?, ?)
+    """
+    
+    # Account counter triggers; NULL scores count as neither high-risk nor bot
+    ACCOUNT_STATISTICS_TRIGGERS = [
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_accounts_insert AFTER INSERT ON accounts
+        BEGIN
+            INSERT INTO stats_accounts (platform, count, high_risk, bot)
+                VALUES (NEW.platform, 1, COALESCE(NEW.threat_score >= 80, 0), COALESCE(NEW.bot_confidence > 0.7, 0))
+                ON CONFLICT (platform) DO UPDATE SET
+                    count = count + 1,
+                    high_risk = high_risk + excluded.high_risk,
+                    bot = bot + excluded.bot;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_accounts_delete AFTER DELETE ON accounts
+        BEGIN
+            UPDATE stats_accounts SET
+                count = count - 1,
+                high_risk = high_risk - COALESCE(OLD.threat_score >= 80, 0),
+                bot = bot - COALESCE(OLD.bot_confidence > 0.7, 0)
+                WHERE platform = OLD.platform;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_accounts_update
+        AFTER UPDATE OF platform, threat_score, bot_confidence ON accounts
+        BEGIN
+            UPDATE stats_accounts SET
+                count = count - 1,
+                high_risk = high_risk - COALESCE(OLD.threat_score >= 80, 0),
+                bot = bot - COALESCE(OLD.bot_confidence > 0.7, 0)
+                WHERE platform = OLD.platform;
+            INSERT INTO stats_accounts (platform, count, high_risk, bot)
+                VALUES (NEW.platform, 1, COALESCE(NEW.threat_score >= 80, 0), COALESCE(NEW.bot_confidence > 0.7, 0))
+                ON CONFLICT (platform) DO UPDATE SET
+                    count = count + 1,
+                    high_risk = high_risk + excluded.high_risk,
+                    bot = bot + excluded.bot;
+        END
+        """
+    ]
+    
+    # Per-group counters kept current by triggers so get_statistics never
+    # scans a table; each insert trigger is a single upsert per counter table
+    STATISTICS_SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS stats_threats (
+            platform TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            high_risk INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_accounts (
+            platform TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            high_risk INTEGER NOT NULL DEFAULT 0,
+            bot INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_alerts (
+            severity TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            unacknowledged INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS stats_minutes (
+            table_name TEXT NOT NULL,
+            minute INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, minute)
+        )
+        """,
+        
+        # Seed the counters from the existing rows
+        """
+        INSERT OR REPLACE INTO stats_threats (platform, count, score_sum, high_risk)
+        SELECT platform, COUNT(*), COALESCE(SUM(threat_score), 0), SUM(threat_score >= 80)
+        FROM threats GROUP BY platform
+        """,
+        """
+        INSERT OR REPLACE INTO stats_accounts (platform, count, high_risk, bot)
+        SELECT platform, COUNT(*), COALESCE(SUM(threat_score >= 80), 0), COALESCE(SUM(bot_confidence > 0.7), 0)
+        FROM accounts GROUP BY platform
+        """,
+        """
+        INSERT OR REPLACE INTO stats_alerts (severity, count, unacknowledged)
+        SELECT severity, COUNT(*), SUM(acknowledged = FALSE)
+        FROM alerts GROUP BY severity
+        """,
+        """
+        INSERT OR REPLACE INTO stats_minutes (table_name, minute, count)
+        SELECT 'threats', CAST(strftime('%s', timestamp) AS INTEGER) / 60 AS minute, COUNT(*)
+        FROM threats WHERE timestamp >= datetime('now', '-24 hours') GROUP BY minute
+        """,
+        """
+        INSERT OR REPLACE INTO stats_minutes (table_name, minute, count)
+        SELECT 'alerts', CAST(strftime('%s', timestamp) AS INTEGER) / 60 AS minute, COUNT(*)
+        FROM alerts WHERE timestamp >= datetime('now', '-24 hours') GROUP BY minute
+        """,
+        
+        # Threats
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_threats_insert AFTER INSERT ON threats
+        BEGIN
+            INSERT INTO stats_threats (platform, count, score_sum, high_risk)
+                VALUES (NEW.platform, 1, NEW.threat_score, NEW.threat_score >= 80)
+                ON CONFLICT (platform) DO UPDATE SET
+                    count = count + 1,
+                    score_sum = score_sum + excluded.score_sum,
+                    high_risk = high_risk + excluded.high_risk;
+            INSERT INTO stats_minutes (table_name, minute, count)
+                VALUES ('threats', CAST(strftime('%s', NEW.timestamp) AS INTEGER) / 60, 1)
+                ON CONFLICT (table_name, minute) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_threats_delete AFTER DELETE ON threats
+        BEGIN
+            UPDATE stats_threats SET
+                count = count - 1,
+                score_sum = score_sum - OLD.threat_score,
+                high_risk = high_risk - (OLD.threat_score >= 80)
+                WHERE platform = OLD.platform;
+            UPDATE stats_minutes SET count = count - 1
+                WHERE table_name = 'threats'
+                AND minute = CAST(strftime('%s', OLD.timestamp) AS INTEGER) / 60;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_threats_update
+        AFTER UPDATE OF threat_score, platform, timestamp ON threats
+        BEGIN
+            UPDATE stats_threats SET
+                count = count - 1,
+                score_sum = score_sum - OLD.threat_score,
+                high_risk = high_risk - (OLD.threat_score >= 80)
+                WHERE platform = OLD.platform;
+            INSERT INTO stats_threats (platform, count, score_sum, high_risk)
+                VALUES (NEW.platform, 1, NEW.threat_score, NEW.threat_score >= 80)
+                ON CONFLICT (platform) DO UPDATE SET
+                    count = count + 1,
+                    score_sum = score_sum + excluded.score_sum,
+                    high_risk = high_risk + excluded.high_risk;
+            UPDATE stats_minutes SET count = count - 1
+                WHERE table_name = 'threats'
+                AND minute = CAST(strftime('%s', OLD.timestamp) AS INTEGER) / 60;
+            INSERT INTO stats_minutes (table_name, minute, count)
+                VALUES ('threats', CAST(strftime('%s', NEW.timestamp) AS INTEGER) / 60, 1)
+                ON CONFLICT (table_name, minute) DO UPDATE SET count = count + 1;
+        END
+        """,
+        
+        # Accounts
+        *ACCOUNT_STATISTICS_TRIGGERS,
+        
+        # Alerts
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_alerts_insert AFTER INSERT ON alerts
+        BEGIN
+            INSERT INTO stats_alerts (severity, count, unacknowledged)
+                VALUES (NEW.severity, 1, NEW.acknowledged = FALSE)
+                ON CONFLICT (severity) DO UPDATE SET
+                    count = count + 1,
+                    unacknowledged = unacknowledged + excluded.unacknowledged;
+            INSERT INTO stats_minutes (table_name, minute, count)
+                VALUES ('alerts', CAST(strftime('%s', NEW.timestamp) AS INTEGER) / 60, 1)
+                ON CONFLICT (table_name, minute) DO UPDATE SET count = count + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_alerts_delete AFTER DELETE ON alerts
+        BEGIN
+            UPDATE stats_alerts SET
+                count = count - 1,
+                unacknowledged = unacknowledged - (OLD.acknowledged = FALSE)
+                WHERE severity = OLD.severity;
+            UPDATE stats_minutes SET count = count - 1
+                WHERE table_name = 'alerts'
+                AND minute = CAST(strftime('%s', OLD.timestamp) AS INTEGER) / 60;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS stats_alerts_update
+        AFTER UPDATE OF severity, acknowledged, timestamp ON alerts
+        BEGIN
+            UPDATE stats_alerts SET
+                count = count - 1,
+                unacknowledged = unacknowledged - (OLD.acknowledged = FALSE)
+                WHERE severity = OLD.severity;
+            INSERT INTO stats_alerts (severity, count, unacknowledged)
+                VALUES (NEW.severity, 1, NEW.acknowledged = FALSE)
+                ON CONFLICT (severity) DO UPDATE SET
+                    count = count + 1,
+                    unacknowledged = unacknowledged + excluded.unacknowledged;
+            UPDATE stats_minutes SET count = count - 1
+                WHERE table_name = 'alerts'
+                AND minute = CAST(strftime('%s', OLD.timestamp) AS INTEGER) / 60;
+            INSERT INTO stats_minutes (table_name, minute, count)
+                VALUES ('alerts', CAST(strftime('%s', NEW.timestamp) AS INTEGER) / 60, 1)
+                ON CONFLICT (table_name, minute) DO UPDATE SET count = count + 1;
+        END
+        """
+    ]
+    
+    # Full-text index over threat messages. It is an external-content FTS5
+    # table reading from a view over the threats table and its partitions, so
+    # the text is not stored twice. Indexing rows straight from an insert
+    # trigger would make FTS5 flush a segment per row, so new ids are queued
+    # in threats_fts_pending and indexed a batch at a time. A row is in the
+    # index unless it is still queued or still waiting for the backfill of
+    # pre-existing rows (done_id < id <= target_id); the triggers only send
+    # FTS5 deletes for indexed rows.
+    THREAT_SEARCH_SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS threats_fts_progress (
+            done_id INTEGER NOT NULL,
+            target_id INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT INTO threats_fts_progress (done_id, target_id)
+        SELECT 0, COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'threats'), 0)
+        """,
+        "CREATE TABLE IF NOT EXISTS threats_fts_pending (id INTEGER PRIMARY KEY)",
+        """
+        CREATE VIEW IF NOT EXISTS threats_fts_content AS
+        SELECT id, message, platform, timestamp FROM threats
+        """,
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS threats_fts USING fts5(
+            message,
+            platform UNINDEXED,
+            timestamp UNINDEXED,
+            content = 'threats_fts_content',
+            content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS threats_fts_insert AFTER INSERT ON threats
+        BEGIN
+            INSERT OR IGNORE INTO threats_fts_pending (id) VALUES (NEW.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS threats_fts_delete AFTER DELETE ON threats
+        BEGIN
+            INSERT INTO threats_fts (threats_fts, rowid, message, platform, timestamp)
+                SELECT 'delete', OLD.id, OLD.message, OLD.platform, OLD.timestamp
+                FROM threats_fts_progress
+                WHERE (OLD.id <= done_id OR OLD.id > target_id)
+                AND NOT EXISTS (SELECT 1 FROM threats_fts_pending WHERE id = OLD.id);
+            DELETE FROM threats_fts_pending WHERE id = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS threats_fts_update AFTER UPDATE OF message ON threats
+        BEGIN
+            INSERT INTO threats_fts (threats_fts, rowid, message, platform, timestamp)
+                SELECT 'delete', OLD.id, OLD.message, OLD.platform, OLD.timestamp
+                FROM threats_fts_progress
+                WHERE (OLD.id <= done_id OR OLD.id > target_id)
+                AND NOT EXISTS (SELECT 1 FROM threats_fts_pending WHERE id = OLD.id);
+            INSERT OR IGNORE INTO threats_fts_pending (id)
+                SELECT NEW.id FROM threats_fts_progress
+                WHERE NEW.id <= done_id OR NEW.id > target_id;
+        END
+        """
+    ]
+    
+    # Ordered schema migrations as (name, statements, backfill method name).
+    # The statements of a migration commit together with its schema_version
+    # row; the optional backfill then runs online in small batches and must
+    # be safe to resume.
+    MIGRATIONS = [
+        (
+            "hot_path_indexes",
+            [
+                "CREATE INDEX IF NOT EXISTS idx_threats_timestamp ON threats (timestamp)",
+                "CREATE INDEX IF NOT EXISTS idx_accounts_threat_score ON accounts (threat_score)",
+                """
+                CREATE INDEX IF NOT EXISTS idx_alerts_unacknowledged
+                ON alerts (timestamp) WHERE acknowledged = FALSE
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts (timestamp)",
+                """
+                CREATE INDEX IF NOT EXISTS idx_network_connections_account1
+                ON network_connections (account1_id, strength)
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_network_connections_account2
+                ON network_connections (account2_id, strength)
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_network_connections_strength ON network_connections (strength)",
+                "CREATE INDEX IF NOT EXISTS idx_analysis_logs_timestamp ON analysis_logs (timestamp)"
+            ],
+            None
+        ),
+        ("materialized_statistics", STATISTICS_SCHEMA, None),
+        (
+            "threat_partitions",
+            [
+                """
+                CREATE TABLE IF NOT EXISTS threat_partitions (
+                    name TEXT PRIMARY KEY,
+                    start DATETIME NOT NULL,
+                    end DATETIME NOT NULL
+                )
+                """
+            ],
+            None
+        ),
+        ("threat_search", THREAT_SEARCH_SCHEMA, "_backfill_threat_search"),
+        (
+            "account_identifiers",
+            [
+                """
+                CREATE TABLE IF NOT EXISTS identifiers (
+                    id INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    UNIQUE (kind, value)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS account_identifiers (
+                    account_id INTEGER NOT NULL,
+                    identifier_id INTEGER NOT NULL,
+                    PRIMARY KEY (account_id, identifier_id),
+                    FOREIGN KEY (account_id) REFERENCES accounts (id),
+                    FOREIGN KEY (identifier_id) REFERENCES identifiers (id)
+                ) WITHOUT ROWID
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_account_identifiers_identifier
+                ON account_identifiers (identifier_id, account_id)
+                """
+            ],
+            "_backfill_identifiers"
+        ),
+        (
+            "null_safe_account_statistics",
+            [
+                "DROP TRIGGER IF EXISTS stats_accounts_insert",
+                "DROP TRIGGER IF EXISTS stats_accounts_delete",
+                "DROP TRIGGER IF EXISTS stats_accounts_update",
+                *ACCOUNT_STATISTICS_TRIGGERS
+            ],
+            None
+        )
+    ]
+    
+    def __init__(
+        self,
+        db_path: str = "data/pindar.db",
+        cached_statements: int = 256,
+        timeout: float = 30.0,
+        batch_size: int = 5000,
+        partition_threats: str = None,
+        codec: ColumnCodec = None,
+        cache: QueryCache = None
+    ):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            cached_statements: Prepared statements kept per connection
+            timeout: Seconds to wait for a lock held by another writer
+            batch_size: Rows per transaction in the bulk store methods and cleanup
+            partition_threats: Store new threats in per-"day" or per-"week"
+                tables; existing rows stay in the threats table. Once enabled
+                it should stay enabled for the database.
+            codec: Encoding of JSON columns; defaults to compact JSON, zlib
+                compressed above 1 KB. Rows written with any setting stay readable.
+            cache: Optional QueryCache for get_recent_threats,
+                get_high_risk_accounts and get_unacknowledged_alerts
+        """
         self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.codec = codec or ColumnCodec()
+        self.cache = cache
+        
+        # One long-lived connection per thread, closed when the thread exits
+        self._local = threading.local()
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        
         self._ensure_data_directory()
         self._init_database()
+        self.partitions = ThreatPartitions(self, partition_threats) if partition_threats else None
     
     def _ensure_data_directory(self):
         """Ensure data directory exists"""
         data_dir = Path(self.db_path).parent
         data_dir.mkdir(parents=True, exist_ok=True)
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening and tuning it on first use"""
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                cached_statements=self.cached_statements,
+                check_same_thread=False
+            )
+            for name, value in self.PRAGMAS.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            
+            owner = self._local.owner = _ThreadConnection(conn)
+            with self._connections_lock:
+                self._connections.add(conn)
+            # Every connection has its own page cache and memory map, so one
+            # per short-lived worker thread would otherwise pile up until close()
+            weakref.finalize(owner, self._release_connection, self._connections, self._connections_lock, conn)
+        return owner.conn
+    
+    @staticmethod
+    def _release_connection(connections: set, lock: threading.Lock, conn: sqlite3.Connection):
+        """Close the connection of a thread that has exited"""
+        with lock:
+            connections.discard(conn)
+        conn.close()
+    
+    def close(self):
+        """Close the connections opened by every thread"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
     def _init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
             
             # Create threats table
@@ -98,7 +593,244 @@ class Database:
             """)
             
             conn.commit()
+        
+        self._migrate()
+    
+    def _migrate(self):
+        """Apply pending migrations and resume unfinished backfills"""
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    backfilled_at DATETIME
+                )
+            """)
+        
+        for version, (name, statements, backfill) in enumerate(self.MIGRATIONS, start=1):
+            if self._migration_state(conn, version) is None:
+                self._apply_migration(conn, version, name, statements)
+            
+            state = self._migration_state(conn, version)
+            if state[0] is None:
+                if backfill:
+                    getattr(self, backfill)()
+                with conn:
+                    conn.execute(
+                        "UPDATE schema_version SET backfilled_at = CURRENT_TIMESTAMP WHERE version = ?",
+                        (version,)
+                    )
+    
+    def _migration_state(self, conn: sqlite3.Connection, version: int) -> Optional[Tuple]:
+        """Return (backfilled_at,) for an applied migration, or None"""
+        return conn.execute(
+            "SELECT backfilled_at FROM schema_version WHERE version = ?", (version,)
+        ).fetchone()
+    
+    def _apply_migration(self, conn: sqlite3.Connection, version: int, name: str, statements: List[str]):
+        """Run a migration's statements and record it in one transaction"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock
+            if self._migration_state(conn, version) is None:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name)
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def schema_version(self) -> int:
+        """Number of the latest applied migration"""
+        row = self._get_connection().execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
     
+    def backfill(
+        self,
+        table: str,
+        assignments: str,
+        where: str = None,
+        params: Tuple = (),
+        where_params: Tuple = (),
+        batch_size: int = 10000,
+        pause: float = 0.01,
+        progress: Callable[[int, int], None] = None
+    ) -> int:
+        """
+        Update existing rows in rowid-ordered batches, one short transaction each
+        
+        Writers are only blocked for the duration of a single batch, so the
+        backfill can run against a live database. Batches whose rows already
+        fail the where clause are skipped cheaply, which makes it resumable.
+        
+        Args:
+            table: Table to update
+            assignments: SET clause, e.g. "risk_level = 'low'"
+            where: Optional filter selecting rows that still need the update
+            params: Parameters of the SET clause
+            where_params: Parameters of the where clause
+            batch_size: Rowid range updated per transaction
+            pause: Seconds to sleep between batches
+            progress: Optional callback receiving (last rowid done, max rowid)
+            
+        Returns:
+            Number of rows updated
+        """
+        conn = self._get_connection()
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        condition = f" AND ({where})" if where else ""
+        
+        updated = 0
+        for start in range(0, max_rowid, batch_size):
+            end = min(start + batch_size, max_rowid)
+            with conn:
+                cursor = conn.execute(
+                    f"UPDATE {table} SET {assignments} WHERE rowid > ? AND rowid <= ?{condition}",
+                    (*params, start, end, *where_params)
+                )
+            updated += cursor.rowcount
+            if progress:
+                progress(end, max_rowid)
+            if pause:
+                time.sleep(pause)
+        
+        return updated
+    
+    def _backfill_threat_search(self, batch_size: int = 10000, pause: float = 0.01):
+        """Index threats that predate the full-text index, one id range per transaction"""
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._sync_threat_search(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                done_id, target_id = conn.execute(
+                    "SELECT done_id, target_id FROM threats_fts_progress"
+                ).fetchone()
+                if done_id >= target_id:
+                    conn.commit()
+                    return
+                
+                end = min(done_id + batch_size, target_id)
+                conn.execute("""
+                    INSERT INTO threats_fts (rowid, message, platform, timestamp)
+                    SELECT id, message, platform, timestamp FROM threats_fts_content
+                    WHERE id > ? AND id <= ?
+                """, (done_id, end))
+                conn.execute("UPDATE threats_fts_progress SET done_id = ?", (end,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            if pause:
+                time.sleep(pause)
+    
+    def _backfill_identifiers(self, batch_size: int = 5000, pause: float = 0.01):
+        """Link identifiers of accounts stored before the identifiers tables existed"""
+        conn = self._get_connection()
+        last_id = 0
+        while True:
+            # Read and relink in one write transaction so a concurrent upsert cannot interleave
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, metadata FROM accounts WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+                self._link_identifiers(conn, {
+                    account_id: self._account_identifiers({"metadata": self.codec.decode(metadata) if metadata else {}})
+                    for account_id, metadata in rows
+                })
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+            if pause:
+                time.sleep(pause)
+    
+    def _sync_threat_search(self, conn: sqlite3.Connection):
+        """Point the full-text index's content view at the threats table and every partition"""
+        tables = ["threats"] + [
+            row[0] for row in conn.execute("SELECT name FROM threat_partitions ORDER BY start")
+        ]
+        conn.execute("DROP VIEW IF EXISTS threats_fts_content")
+        conn.execute("CREATE VIEW threats_fts_content AS " + " UNION ALL ".join(
+            f"SELECT id, message, platform, timestamp FROM {table}" for table in tables
+        ))
+    
+    def query_plan(self, sql: str, params: Tuple = ()) -> List[str]:
+        """
+        Describe how SQLite will execute a query
+        
+        Args:
+            sql: Query to explain
+            params: Query parameters
+            
+        Returns:
+            EXPLAIN QUERY PLAN detail lines
+        """
+        cursor = self._get_connection().execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[3] for row in cursor.fetchall()]
+    
+    def _threat_row(self, threat_data: Dict[str, Any]) -> Tuple:
+        """Parameters of INSERT_THREAT_SQL for one threat"""
+        return (
+            threat_data.get("platform", "unknown"),
+            threat_data.get("channel", "unknown"),
+            threat_data.get("message", ""),
+            threat_data.get("threat_score", 0),
+            threat_data.get("risk_level", "low"),
+            threat_data.get("bot_detected", False),
+            self.codec.encode(threat_data.get("metadata", {})),
+            self.codec.encode(threat_data.get("analysis_result", {}))
+        )
+    
+    def _account_row(self, account_data: Dict[str, Any]) -> Tuple:
+        """Parameters of UPSERT_ACCOUNT_SQL for one account"""
+        return (
+            account_data.get("username"),
+            account_data.get("platform"),
+            account_data.get("threat_score", 0),
+            account_data.get("risk_level", "low"),
+            account_data.get("bot_confidence", 0.0),
+            self.codec.encode(account_data.get("metadata", {}))
+        )
+    
+    def _alert_row(self, alert_data: Dict[str, Any]) -> Tuple:
+        """Parameters of INSERT_ALERT_SQL for one alert"""
+        return (
+            alert_data.get("alert_type", "unknown"),
+            alert_data.get("severity", "medium"),
+            alert_data.get("message", ""),
+            self.codec.encode(alert_data.get("details", {}))
+        )
+    
+    def _network_connection_row(self, connection_data: Dict[str, Any]) -> Tuple:
+        """Parameters of INSERT_NETWORK_CONNECTION_SQL for one connection"""
+        return (
+            connection_data.get("account1_id"),
+            connection_data.get("account2_id"),
+            connection_data.get("connection_type", "metadata"),
+            self.codec.encode(connection_data.get("shared_metadata", [])),
+            connection_data.get("strength", 0.0)
+        )
+    
+    @invalidates("threats")
     def store_threat(self, threat_data: Dict[str, Any]) -> int:
         """
         Store threat data in database
@@ -109,90 +841,52 @@ class Database:
         Returns:
             ID of stored threat
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO threats (
-                    platform, channel, message, threat_score, risk_level,
-                    bot_detected, metadata, analysis_result
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                threat_data.get("platform", "unknown"),
-                threat_data.get("channel", "unknown"),
-                threat_data.get("message", ""),
-                threat_data.get("threat_score", 0),
-                threat_data.get("risk_level", "low"),
-                threat_data.get("bot_detected", False),
-                json.dumps(threat_data.get("metadata", {})),
-                json.dumps(threat_data.get("analysis_result", {}))
-            ))
-            
-            threat_id = cursor.lastrowid
-            conn.commit()
-            return threat_id
+        with self._get_connection() as conn:
+            return self._insert_threats(conn, [self._threat_row(threat_data)])
     
+    def _insert_threats(self, conn: sqlite3.Connection, rows: List[Tuple]) -> int:
+        """Insert threat rows and index them for full-text search, returning the first id"""
+        if self.partitions:
+            first_id = self.partitions.insert(conn, rows)
+        else:
+            conn.executemany(self.INSERT_THREAT_SQL, rows)
+            # AUTOINCREMENT ids are consecutive within the write transaction
+            first_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(rows) + 1
+        self._index_pending_threats(conn)
+        return first_id
+    
+    def _index_pending_threats(self, conn: sqlite3.Connection):
+        """Add queued threats to the full-text index in a single statement"""
+        conn.execute("""
+            INSERT INTO threats_fts (rowid, message, platform, timestamp)
+            SELECT id, message, platform, timestamp FROM threats_fts_content
+            WHERE id IN (SELECT id FROM threats_fts_pending)
+        """)
+        conn.execute("DELETE FROM threats_fts_pending")
+    
+    @invalidates("accounts")
     def store_account(self, account_data: Dict[str, Any]) -> int:
         """
         Store account data in database
         
+        New accounts are inserted; an existing username has its scores and
+        metadata replaced and its message count incremented.
+        
         Args:
             account_data: Dictionary containing account information
             
         Returns:
             ID of stored account
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check if account already exists
-            cursor.execute("""
-                SELECT id, message_count, last_seen FROM accounts 
-                WHERE username = ? AND platform = ?
-            """, (account_data.get("username"), account_data.get("platform")))
-            
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing account
-                account_id, message_count, last_seen = existing
-                cursor.execute("""
-                    UPDATE accounts SET 
-                        threat_score = ?,
-                        risk_level = ?,
-                        bot_confidence = ?,
-                        metadata = ?,
-                        last_seen = CURRENT_TIMESTAMP,
-                        message_count = message_count + 1
-                    WHERE id = ?
-                """, (
-                    account_data.get("threat_score", 0),
-                    account_data.get("risk_level", "low"),
-                    account_data.get("bot_confidence", 0.0),
-                    json.dumps(account_data.get("metadata", {})),
-                    account_id
-                ))
-                return account_id
-            else:
-                # Insert new account
-                cursor.execute("""
-                    INSERT INTO accounts (
-                        username, platform, threat_score, risk_level,
-                        bot_confidence, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    account_data.get("username"),
-                    account_data.get("platform"),
-                    account_data.get("threat_score", 0),
-                    account_data.get("risk_level", "low"),
-                    account_data.get("bot_confidence", 0.0),
-                    json.dumps(account_data.get("metadata", {}))
-                ))
-                
-                account_id = cursor.lastrowid
-                conn.commit()
-                return account_id
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                self.UPSERT_ACCOUNT_SQL + " RETURNING id", self._account_row(account_data)
+            )
+            account_id = cursor.fetchone()[0]
+            self._link_identifiers(conn, {account_id: self._account_identifiers(account_data)})
+            return account_id
     
+    @invalidates("alerts")
     def store_alert(self, alert_data: Dict[str, Any]) -> int:
         """
         Store alert data in database
@@ -203,24 +897,11 @@ class Database:
         Returns:
             ID of stored alert
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO alerts (
-                    alert_type, severity, message, details
-                ) VALUES (?, ?, ?, ?)
-            """, (
-                alert_data.get("alert_type", "unknown"),
-                alert_data.get("severity", "medium"),
-                alert_data.get("message", ""),
-                json.dumps(alert_data.get("details", {}))
-            ))
-            
-            alert_id = cursor.lastrowid
-            conn.commit()
-            return alert_id
+        with self._get_connection() as conn:
+            cursor = conn.execute(self.INSERT_ALERT_SQL, self._alert_row(alert_data))
+            return cursor.lastrowid
     
+    @invalidates("network_connections")
     def store_network_connection(self, connection_data: Dict[str, Any]) -> int:
         """
         Store network connection data in database
@@ -231,59 +912,407 @@ class Database:
         Returns:
             ID of stored connection
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                self.INSERT_NETWORK_CONNECTION_SQL, self._network_connection_row(connection_data)
+            )
+            return cursor.lastrowid
+    
+    def _store_many(
+        self,
+        sql: str,
+        rows: Iterable[Tuple],
+        batch_size: int = None,
+        writer: Callable[[sqlite3.Connection, List[Tuple]], Any] = None
+    ) -> int:
+        """Write rows with executemany (or a custom writer), one transaction per batch"""
+        batch_size = batch_size or self.batch_size
+        rows = iter(rows)
+        conn = self._get_connection()
+        stored = 0
+        
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with conn:
+                if writer:
+                    writer(conn, batch)
+                else:
+                    conn.executemany(sql, batch)
+            stored += len(batch)
+        
+        return stored
+    
+    @invalidates("threats")
+    def store_threats_many(self, threats: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many threats with one transaction per batch
+        
+        Args:
+            threats: Iterable of threat dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
             
-            cursor.execute("""
-                INSERT INTO network_connections (
-                    account1_id, account2_id, connection_type,
-                    shared_metadata, strength
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (
-                connection_data.get("account1_id"),
-                connection_data.get("account2_id"),
-                connection_data.get("connection_type", "metadata"),
-                json.dumps(connection_data.get("shared_metadata", [])),
-                connection_data.get("strength", 0.0)
-            ))
-            
-            connection_id = cursor.lastrowid
-            conn.commit()
-            return connection_id
+        Returns:
+            Number of threats stored
+        """
+        return self._store_many(
+            self.INSERT_THREAT_SQL, map(self._threat_row, threats), batch_size, self._insert_threats
+        )
     
-    def get_recent_threats(self, limit: int = 50) -> List[Dict[str, Any]]:
+    @invalidates("accounts")
+    def store_accounts_many(self, accounts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
         """
-        Get recent threats from database
+        Upsert many accounts with one transaction per batch
         
         Args:
-            limit: Maximum number of threats to retrieve
+            accounts: Iterable of account dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
             
         Returns:
-            List of threat dictionaries
+            Number of account records written
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        rows = ((self._account_row(account), self._account_identifiers(account)) for account in accounts)
+        return self._store_many(self.UPSERT_ACCOUNT_SQL, rows, batch_size, self._upsert_accounts)
+    
+    def _upsert_accounts(self, conn: sqlite3.Connection, batch: List[Tuple]):
+        """Upsert (account row, identifiers) pairs and relink their identifiers"""
+        conn.executemany(self.UPSERT_ACCOUNT_SQL, [row for row, _ in batch])
+        
+        ids = dict(conn.execute(
+            "SELECT username, id FROM accounts WHERE username IN (SELECT value FROM json_each(?))",
+            (json.dumps([row[0] for row, _ in batch]),)
+        ))
+        # A username repeated in the batch keeps the identifiers of its last row, like its metadata
+        self._link_identifiers(conn, {ids[row[0]]: identifiers for row, identifiers in batch})
+    
+    def _link_identifiers(self, conn: sqlite3.Connection, links: Dict[int, List[Tuple[str, str]]]):
+        """Replace the identifiers linked to each account id"""
+        conn.executemany(
+            "DELETE FROM account_identifiers WHERE account_id = ?", [(account_id,) for account_id in links]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO identifiers (kind, value) VALUES (?, ?)",
+            {identifier for identifiers in links.values() for identifier in identifiers}
+        )
+        conn.executemany("""
+            INSERT OR IGNORE INTO account_identifiers (account_id, identifier_id)
+            SELECT ?, id FROM identifiers WHERE kind = ? AND value = ?
+        """, [
+            (account_id, kind, value)
+            for account_id, identifiers in links.items()
+            for kind, value in identifiers
+        ])
+    
+    @invalidates("alerts")
+    def store_alerts_many(self, alerts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many alerts with one transaction per batch
+        
+        Args:
+            alerts: Iterable of alert dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
             
-            cursor.execute("""
-                SELECT * FROM threats 
-                ORDER BY timestamp DESC 
+        Returns:
+            Number of alerts stored
+        """
+        return self._store_many(self.INSERT_ALERT_SQL, map(self._alert_row, alerts), batch_size)
+    
+    @invalidates("network_connections")
+    def store_network_connections_many(self, connections: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many network connections with one transaction per batch
+        
+        Args:
+            connections: Iterable of connection dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of connections stored
+        """
+        return self._store_many(
+            self.INSERT_NETWORK_CONNECTION_SQL, map(self._network_connection_row, connections), batch_size
+        )
+    
+    def _decode_row(self, table: str, columns: Dict[str, int], row: Sequence[Any], lazy: bool):
+        """Wrap a raw row as a LazyRecord, or decode it into a dictionary"""
+        decoder = self.codec.decode_or_raw if table in self.FREE_TEXT_TABLES else self.codec.decode
+        record = LazyRecord(columns, row, self.JSON_COLUMNS.get(table, ()), decoder)
+        return record if lazy else record.to_dict()
+    
+    def _iter_keyset(
+        self,
+        table: str,
+        where: List[str],
+        params: List[Any],
+        order_column: str,
+        batch_size: int,
+        lazy: bool,
+        source: str = None,
+        branches: List[Tuple[str, List[Any]]] = None
+    ) -> Iterator[Any]:
+        """
+        Stream rows in (order_column, id) descending order, one page per query
+        
+        Each page resumes after the last (order_column, id) seen, so no read
+        transaction stays open between pages and memory is bounded by a page.
+        
+        Branches are disjoint conditions, each served by its own index. They
+        are queried as a UNION ALL that SQLite merges in key order, where an
+        OR of them would be sorted in a temporary B-tree on every page.
+        """
+        conn = self._get_connection()
+        last_key = None
+        
+        while True:
+            conditions = list(where)
+            page_params = list(params)
+            if last_key is not None:
+                conditions.append(f"({order_column}, id) < (?, ?)")
+                page_params.extend(last_key)
+            
+            selects, select_params = [], []
+            for branch, branch_params in branches or [(None, [])]:
+                branch_conditions = [branch, *conditions] if branch else conditions
+                where_sql = f"WHERE {' AND '.join(branch_conditions)}" if branch_conditions else ""
+                selects.append(f"SELECT * FROM {source or table} {where_sql}")
+                select_params.extend([*branch_params, *page_params])
+            
+            cursor = self._read_source(conn, source or table, f"""
+                {' UNION ALL '.join(selects)}
+                ORDER BY {order_column} DESC, id DESC
                 LIMIT ?
-            """, (limit,))
+            """, (*select_params, batch_size))
+            if cursor is None:
+                return
             
-            columns = [description[0] for description in cursor.description]
-            threats = []
+            columns = {description[0]: i for i, description in enumerate(cursor.description)}
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            
+            for row in rows:
+                yield self._decode_row(table, columns, row, lazy)
+            
+            if len(rows) < batch_size:
+                return
+            last_key = (rows[-1][columns[order_column]], rows[-1][columns["id"]])
+    
+    def iter_threats(
+        self,
+        platform: str = None,
+        since: str = None,
+        until: str = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream threats newest first with keyset pagination
+        
+        Args:
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            until: Optional exclusive upper bound on the timestamp
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords that decode JSON columns on access,
+                instead of fully decoded dictionaries
+            
+        Returns:
+            Iterator over threat records
+        """
+        where, params = [], []
+        if platform:
+            where.append("platform = ?")
+            params.append(platform)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        for source in self._threat_tables(newest_first=True, since=since, until=until):
+            yield from self._iter_keyset("threats", where, params, "timestamp", batch_size, lazy, source)
+    
+    def _threat_tables(self, newest_first: bool = True, since: str = None, until: str = None) -> List[str]:
+        """Physical tables holding threats, partitions first when newest_first"""
+        if self.partitions:
+            return self.partitions.tables(newest_first, since, until)
+        return ["threats"]
+    
+    def _read_source(
+        self,
+        conn: sqlite3.Connection,
+        source: str,
+        sql: str,
+        params: Sequence[Any]
+    ) -> Optional[sqlite3.Cursor]:
+        """
+        Run a query on one physical table
+        
+        Returns:
+            Cursor, or None if the table is a threat partition that another
+            connection dropped after it was listed; its rows are gone either way
+        """
+        try:
+            return conn.execute(sql, params)
+        except sqlite3.OperationalError:
+            if not self.partitions or not self.partitions.dropped(conn, source):
+                raise
+            return None
+    
+    def iter_network_connections(
+        self,
+        account_id: int = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream network connections strongest first with keyset pagination
+        
+        Args:
+            account_id: Optional account ID to filter connections
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords that decode JSON columns on access,
+                instead of fully decoded dictionaries
+            
+        Returns:
+            Iterator over connection records
+        """
+        branches = None
+        if account_id:
+            # Walks the account1 and account2 indexes; a connection of the
+            # account with itself is read from the first branch only
+            branches = [
+                ("account1_id = ?", [account_id]),
+                ("account2_id = ? AND account1_id IS NOT ?", [account_id, account_id])
+            ]
+        return self._iter_keyset("network_connections", [], [], "strength", batch_size, lazy, branches=branches)
+    
+    def iter_table(
+        self,
+        table: str,
+        since: str = None,
+        until: str = None,
+        after_id: int = 0,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream every row of a table in id order with keyset pagination
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            since: Optional inclusive lower bound on the table's time column
+            until: Optional exclusive upper bound on the table's time column
+            after_id: Only rows with a larger id are returned, for resuming
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords instead of fully decoded dictionaries
             
+        Returns:
+            Iterator over table records
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conditions, params = ["id > ?"], []
+        if since:
+            conditions.append(f"{self.TIME_COLUMNS[table]} >= ?")
+            params.append(since)
+        if until:
+            conditions.append(f"{self.TIME_COLUMNS[table]} < ?")
+            params.append(until)
+        
+        sources = self._threat_tables(False, since, until) if table == "threats" else [table]
+        
+        conn = self._get_connection()
+        for source in sources:
+            last_id = after_id
+            while True:
+                cursor = self._read_source(conn, source, f"""
+                    SELECT * FROM {source}
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, *params, batch_size))
+                if cursor is None:
+                    break
+                
+                columns = {description[0]: i for i, description in enumerate(cursor.description)}
+                rows = cursor.fetchmany(batch_size)
+                for row in rows:
+                    yield self._decode_row(table, columns, row, lazy)
+                
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1][columns["id"]]
+    
+    def search_threats(
+        self,
+        query: str,
+        platform: str = None,
+        since: str = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over threat messages, best matches first
+        
+        Args:
+            query: FTS5 query, e.g. "rally AND (vote OR election)" or "protest*"
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            limit: Maximum number of threats to retrieve
+        
+        Returns:
+            List of threat dictionaries, each with a "snippet" of the message
+            with matches in **bold** and its bm25 "rank" (lower is better)
+        """
+        conditions, params = ["threats_fts MATCH ?"], [query]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if since:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        
+        conn = self._get_connection()
+        # Only rows written around this class, e.g. with raw SQL, are still queued
+        if conn.execute("SELECT 1 FROM threats_fts_pending LIMIT 1").fetchone():
+            with conn:
+                self._index_pending_threats(conn)
+        
+        try:
+            matches = conn.execute(f"""
+                SELECT rowid, rank, snippet(threats_fts, 0, '**', '**', '...', 16)
+                FROM threats_fts
+                WHERE {' AND '.join(conditions)}
+                ORDER BY rank
+                LIMIT ?
+            """, (*params, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {e}")
+        if not matches:
+            return []
+        
+        # Full rows are fetched by id from whichever tables hold them
+        ranked = {threat_id: (rank, snippet) for threat_id, rank, snippet in matches}
+        placeholders = ",".join("?" * len(ranked))
+        threats = []
+        for source in self._threat_tables(since=since):
+            cursor = self._read_source(
+                conn, source, f"SELECT * FROM {source} WHERE id IN ({placeholders})", list(ranked)
+            )
+            if cursor is None:
+                continue
+            columns = {description[0]: i for i, description in enumerate(cursor.description)}
             for row in cursor.fetchall():
-                threat = dict(zip(columns, row))
-                # Parse JSON fields
-                if threat.get("metadata"):
-                    threat["metadata"] = json.loads(threat["metadata"])
-                if threat.get("analysis_result"):
-                    threat["analysis_result"] = json.loads(threat["analysis_result"])
+                threat = self._decode_row("threats", columns, row, lazy=False)
+                threat["rank"], threat["snippet"] = ranked[threat["id"]]
                 threats.append(threat)
-            
-            return threats
+        
+        threats.sort(key=lambda threat: threat["rank"])
+        return threats
     
+    @cached_query("accounts")
     def get_high_risk_accounts(self, min_score: int = 80) -> List[Dict[str, Any]]:
         """
         Get high-risk accounts from database
@@ -294,7 +1323,7 @@ class Database:
         Returns:
             List of account dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -310,11 +1339,12 @@ class Database:
                 account = dict(zip(columns, row))
                 # Parse JSON fields
                 if account.get("metadata"):
-                    account["metadata"] = json.loads(account["metadata"])
+                    account["metadata"] = self.codec.decode(account["metadata"])
                 accounts.append(account)
             
             return accounts
     
+    @cached_query("alerts")
     def get_unacknowledged_alerts(self) -> List[Dict[str, Any]]:
         """
         Get unacknowledged alerts from database
@@ -322,7 +1352,7 @@ class Database:
         Returns:
             List of alert dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._get_connection() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -338,111 +1368,146 @@ class Database:
                 alert = dict(zip(columns, row))
                 # Parse JSON fields
                 if alert.get("details"):
-                    alert["details"] = json.loads(alert["details"])
+                    alert["details"] = self.codec.decode(alert["details"])
                 alerts.append(alert)
             
             return alerts
     
-    def get_network_connections(self, account_id: int = None) -> List[Dict[str, Any]]:
+    def find_accounts_by_identifier(self, kind: str, value: str) -> List[Dict[str, Any]]:
         """
-        Get network connections from database
+        Get accounts whose metadata lists an identifier
         
         Args:
-            account_id: Optional account ID to filter connections
+            kind: Identifier kind (see IDENTIFIER_KINDS), e.g. "phone_numbers"
+            value: Identifier value
             
         Returns:
-            List of connection dictionaries
+            List of account dictionaries, highest threat score first
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if account_id:
-                cursor.execute("""
-                    SELECT * FROM network_connections 
-                    WHERE account1_id = ? OR account2_id = ?
-                    ORDER BY strength DESC
-                """, (account_id, account_id))
-            else:
-                cursor.execute("""
-                    SELECT * FROM network_connections 
-                    ORDER BY strength DESC
-                """)
-            
-            columns = [description[0] for description in cursor.description]
-            connections = []
+        cursor = self._get_connection().execute("""
+            SELECT accounts.* FROM identifiers
+            JOIN account_identifiers ON account_identifiers.identifier_id = identifiers.id
+            JOIN accounts ON accounts.id = account_identifiers.account_id
+            WHERE identifiers.kind = ? AND identifiers.value = ?
+            ORDER BY accounts.threat_score DESC
+        """, (kind, value))
+        columns = {description[0]: i for i, description in enumerate(cursor.description)}
+        return [self._decode_row("accounts", columns, row, lazy=False) for row in cursor.fetchall()]
+    
+    def get_shared_identifiers(self, account_ids: List[int] = None, min_shared: int = 1) -> List[Dict[str, Any]]:
+        """
+        Find account pairs that share identifiers
+        
+        Args:
+            account_ids: Optional accounts to restrict both sides of each pair to
+            min_shared: Minimum number of shared identifiers per pair
             
-            for row in cursor.fetchall():
-                connection = dict(zip(columns, row))
-                # Parse JSON fields
-                if connection.get("shared_metadata"):
-                    connection["shared_metadata"] = json.loads(connection["shared_metadata"])
-                connections.append(connection)
+        Returns:
+            List of dictionaries with account1_id < account2_id, the shared
+            identifier kinds as "shared_metadata" and their "shared_count",
+            most shared first
+        """
+        where, params = "", []
+        if account_ids is not None:
+            # Passed as one JSON array so large id lists need a single parameter
+            where = """
+                WHERE first.account_id IN (SELECT value FROM json_each(?))
+                AND second.account_id IN (SELECT value FROM json_each(?))
+            """
+            ids = json.dumps([int(account_id) for account_id in account_ids])
+            params = [ids, ids]
+        
+        cursor = self._get_connection().execute(f"""
+            SELECT first.account_id, second.account_id,
+                GROUP_CONCAT(DISTINCT identifiers.kind), COUNT(*) AS shared_count
+            FROM account_identifiers AS first
+            JOIN account_identifiers AS second
+                ON second.identifier_id = first.identifier_id AND second.account_id > first.account_id
+            JOIN identifiers ON identifiers.id = first.identifier_id
+            {where}
+            GROUP BY first.account_id, second.account_id
+            HAVING shared_count >= ?
+            ORDER BY shared_count DESC, first.account_id, second.account_id
+        """, (*params, min_shared))
+        
+        return [
+            {
+                "account1_id": account1_id,
+                "account2_id": account2_id,
+                "shared_metadata": [kind for kind in self.IDENTIFIER_KINDS if kind in kinds.split(",")],
+                "shared_count": shared_count
+            }
+            for account1_id, account2_id, kinds, shared_count in cursor.fetchall()
+        ]
+    
+    def get_columns(self, table: str) -> List[Tuple[str, str]]:
+        """
+        Get the columns of a table
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
             
-            return connections
+        Returns:
+            (name, declared type) of each column, in SELECT * order
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        return [(row[1], row[2]) for row in self._get_connection().execute(f"PRAGMA table_info({table})")]
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get database statistics
         
+        Reads the trigger-maintained counters, so the cost does not grow
+        with the size of the tables.
+        
         Returns:
             Dictionary containing statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            stats = {}
-            
-            # Threat statistics
-            cursor.execute("SELECT COUNT(*) FROM threats")
-            stats["total_threats"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM threats WHERE threat_score >= 80")
-            stats["high_risk_threats"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT AVG(threat_score) FROM threats")
-            avg_score = cursor.fetchone()[0]
-            stats["average_threat_score"] = round(avg_score, 2) if avg_score else 0
-            
-            # Account statistics
-            cursor.execute("SELECT COUNT(*) FROM accounts")
-            stats["total_accounts"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM accounts WHERE threat_score >= 80")
-            stats["high_risk_accounts"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM accounts WHERE bot_confidence > 0.7")
-            stats["bot_accounts"] = cursor.fetchone()[0]
-            
-            # Alert statistics
-            cursor.execute("SELECT COUNT(*) FROM alerts WHERE acknowledged = FALSE")
-            stats["unacknowledged_alerts"] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM alerts WHERE severity = 'high'")
-            stats["high_severity_alerts"] = cursor.fetchone()[0]
-            
-            # Platform statistics
-            cursor.execute("""
-                SELECT platform, COUNT(*) as count 
-                FROM threats 
-                GROUP BY platform
-            """)
-            stats["platform_distribution"] = dict(cursor.fetchall())
-            
-            # Recent activity
-            cursor.execute("""
-                SELECT COUNT(*) FROM threats 
-                WHERE timestamp >= datetime('now', '-24 hours')
-            """)
-            stats["threats_last_24h"] = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM alerts 
-                WHERE timestamp >= datetime('now', '-24 hours')
-            """)
-            stats["alerts_last_24h"] = cursor.fetchone()[0]
-            
-            return stats
+        conn = self._get_connection()
+        
+        # The counter tables hold one row per platform / severity
+        platform_rows = conn.execute("""
+            SELECT platform, count, score_sum, high_risk FROM stats_threats
+            WHERE count > 0
+        """).fetchall()
+        total_threats, score_sum, high_risk_threats = conn.execute("""
+            SELECT COALESCE(SUM(count), 0), COALESCE(SUM(score_sum), 0), COALESCE(SUM(high_risk), 0)
+            FROM stats_threats
+        """).fetchone()
+        total_accounts, high_risk_accounts, bot_accounts = conn.execute("""
+            SELECT COALESCE(SUM(count), 0), COALESCE(SUM(high_risk), 0), COALESCE(SUM(bot), 0)
+            FROM stats_accounts
+        """).fetchone()
+        unacknowledged_alerts, high_severity_alerts = conn.execute("""
+            SELECT COALESCE(SUM(unacknowledged), 0), COALESCE(SUM(CASE WHEN severity = 'high' THEN count END), 0)
+            FROM stats_alerts
+        """).fetchone()
+        
+        # Rolling 24h counts from per-minute buckets
+        recent = dict(conn.execute("""
+            SELECT table_name, SUM(count) FROM stats_minutes
+            WHERE minute >= CAST(strftime('%s', 'now', '-24 hours') AS INTEGER) / 60
+            GROUP BY table_name
+        """).fetchall())
+        
+        avg_score = score_sum / total_threats if total_threats else 0
+        
+        return {
+            "total_threats": total_threats,
+            "high_risk_threats": high_risk_threats,
+            "average_threat_score": round(avg_score, 2) if avg_score else 0,
+            "total_accounts": total_accounts,
+            "high_risk_accounts": high_risk_accounts,
+            "bot_accounts": bot_accounts,
+            "unacknowledged_alerts": unacknowledged_alerts,
+            "high_severity_alerts": high_severity_alerts,
+            "platform_distribution": {row[0]: row[1] for row in platform_rows},
+            "threats_last_24h": recent.get("threats", 0),
+            "alerts_last_24h": recent.get("alerts", 0)
+        }
     
+    @invalidates("alerts")
     def acknowledge_alert(self, alert_id: int) -> bool:
         """
         Acknowledge an alert
@@ -454,7 +1519,7 @@ class Database:
             True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -468,85 +1533,63 @@ class Database:
         except:
             return False
     
-    def cleanup_old_data(self, days: int = 30) -> int:
+    def _delete_expired(
+        self,
+        table: str,
+        condition: str,
+        cutoff: str,
+        limit: int,
+        archive: Callable[[List[Dict[str, Any]]], None] = None,
+        source: str = None
+    ) -> int:
         """
-        Clean up old data from database
+        Delete up to limit rows older than the cutoff, passing them to archive before commit
         
-        Args:
-            days: Number of days to keep data
-            
-        Returns:
-            Number of records deleted
+        Rows come from source, or for threats from the first partition still
+        holding expired rows, in one short transaction.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Delete old threats
-            cursor.execute("""
-                DELETE FROM threats 
-                WHERE timestamp < datetime('now', '-{} days')
-            """.format(days))
-            
-            threats_deleted = cursor.rowcount
-            
-            # Delete old alerts (keep high severity)
-            cursor.execute("""
-                DELETE FROM alerts 
-                WHERE timestamp < datetime('now', '-{} days')
-                AND severity != 'high'
-            """.format(days))
-            
-            alerts_deleted = cursor.rowcount
-            
-            # Delete old analysis logs
-            cursor.execute("""
-                DELETE FROM analysis_logs 
-                WHERE timestamp < datetime('now', '-{} days')
-            """.format(days))
-            
-            logs_deleted = cursor.rowcount
-            
-            conn.commit()
-            
-            return threats_deleted + alerts_deleted + logs_deleted
+        if source:
+            sources = [source]
+        else:
+            sources = self._threat_tables(False, until=cutoff) if table == "threats" else [table]
+        conn = self._get_connection()
+        for name in sources:
+            with conn:
+                # Walks the timestamp index from the oldest row
+                cursor = self._read_source(conn, name, f"""
+                    SELECT id FROM {name}
+                    WHERE timestamp < ? {condition}
+                    ORDER BY timestamp
+                    LIMIT ?
+                """, (cutoff, limit))
+                ids = [row[0] for row in cursor] if cursor else []
+                if not ids:
+                    continue
+                
+                placeholders = ",".join("?" * len(ids))
+                if archive:
+                    cursor = conn.execute(f"SELECT * FROM {name} WHERE id IN ({placeholders})", ids)
+                    columns = {description[0]: i for i, description in enumerate(cursor.description)}
+                    archive([self._decode_row(table, columns, row, lazy=False) for row in cursor])
+                conn.execute(f"DELETE FROM {name} WHERE id IN ({placeholders})", ids)
+            return len(ids)
+        return 0
     
-    def export_data(self, table: str = None) -> Dict[str, Any]:
+    def cleanup_old_data(self, days: int = 30, archive_dir: str = None, progress: Callable = None) -> int:
         """
-        Export data from database
+        Clean up old data from database
+        
+        Expired rows are deleted in small batches (see RetentionJob), so
+        writers are never locked out for long.
         
         Args:
-            table: Specific table to export, or None for all
+            days: Number of days to keep data
+            archive_dir: Optional directory for gzipped NDJSON archives of deleted rows
+            progress: Optional callback receiving a progress dictionary per batch
             
         Returns:
-            Dictionary containing exported data
+            Number of records deleted
         """
-        tables = ["threats", "accounts", "alerts", "network_connections", "analysis_logs"]
-        
-        if table and table in tables:
-            tables = [table]
-        
-        exported_data = {}
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            for table_name in tables:
-                cursor.execute(f"SELECT * FROM {table_name}")
-                
-                columns = [description[0] for description in cursor.description]
-                rows = []
-                
-                for row in cursor.fetchall():
-                    row_dict = dict(zip(columns, row))
-                    # Parse JSON fields
-                    for key, value in row_dict.items():
-                        if isinstance(value, str) and value.startswith('{'):
-                            try:
-                                row_dict[key] = json.loads(value)
-                            except:
-                                pass
-                    rows.append(row_dict)
-                
-                exported_data[table_name] = rows
+        from utils.retention import RetentionJob
         
-        return exported_data 
\ No newline at end of file
+        return RetentionJob(self, days, batch_size=self.batch_size, archive_dir=archive_dir).run(progress)
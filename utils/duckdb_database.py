@@ -0,0 +1,877 @@
+import re
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, Tuple, Callable, Sequence
+from itertools import islice
+from datetime import datetime, timedelta
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+from utils.lazy_record import LazyRecord
+from utils.query_cache import QueryCache
+from utils.storage_backend import StorageBackend, cached_query, invalidates
+
+class DuckDBDatabase(StorageBackend):
+    """
+    DuckDB storage for analytical workloads: columnar scans, aggregates and Parquet export
+    """
+    
+    SCHEMA = [
+        "CREATE SEQUENCE IF NOT EXISTS threats_id_seq",
+        "CREATE SEQUENCE IF NOT EXISTS accounts_id_seq",
+        "CREATE SEQUENCE IF NOT EXISTS alerts_id_seq",
+        "CREATE SEQUENCE IF NOT EXISTS network_connections_id_seq",
+        "CREATE SEQUENCE IF NOT EXISTS analysis_logs_id_seq",
+        "CREATE SEQUENCE IF NOT EXISTS identifiers_id_seq",
+        # Append-mostly tables are left unindexed; DuckDB prunes scans with per-block min/max
+        """
+        CREATE TABLE IF NOT EXISTS threats (
+            id BIGINT DEFAULT nextval('threats_id_seq'),
+            platform TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            message TEXT NOT NULL,
+            threat_score INTEGER NOT NULL,
+            risk_level TEXT NOT NULL,
+            bot_detected BOOLEAN DEFAULT FALSE,
+            metadata TEXT,
+            analysis_result TEXT,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS accounts (
+            id BIGINT PRIMARY KEY DEFAULT nextval('accounts_id_seq'),
+            username TEXT UNIQUE NOT NULL,
+            platform TEXT NOT NULL,
+            threat_score INTEGER DEFAULT 0,
+            risk_level TEXT DEFAULT 'low',
+            bot_confidence DOUBLE DEFAULT 0.0,
+            metadata TEXT,
+            first_seen TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC'),
+            last_seen TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC'),
+            message_count INTEGER DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS alerts (
+            id BIGINT DEFAULT nextval('alerts_id_seq'),
+            alert_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            message TEXT NOT NULL,
+            details TEXT,
+            acknowledged BOOLEAN DEFAULT FALSE,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS network_connections (
+            id BIGINT DEFAULT nextval('network_connections_id_seq'),
+            account1_id BIGINT,
+            account2_id BIGINT,
+            connection_type TEXT NOT NULL,
+            shared_metadata TEXT,
+            strength DOUBLE DEFAULT 0.0,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS analysis_logs (
+            id BIGINT DEFAULT nextval('analysis_logs_id_seq'),
+            analysis_type TEXT NOT NULL,
+            input_data TEXT,
+            result TEXT,
+            processing_time DOUBLE,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'UTC')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS identifiers (
+            id BIGINT PRIMARY KEY DEFAULT nextval('identifiers_id_seq'),
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            UNIQUE (kind, value)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS account_identifiers (
+            account_id BIGINT NOT NULL,
+            identifier_id BIGINT NOT NULL,
+            PRIMARY KEY (account_id, identifier_id)
+        )
+        """
+    ]
+    
+    # Insert column lists; rows are bulk-loaded one column array per parameter
+    THREAT_COLUMNS = (
+        "platform", "channel", "message", "threat_score", "risk_level",
+        "bot_detected", "metadata", "analysis_result"
+    )
+    ACCOUNT_COLUMNS = (
+        "username", "platform", "threat_score", "risk_level",
+        "bot_confidence", "metadata", "message_count"
+    )
+    ALERT_COLUMNS = ("alert_type", "severity", "message", "details")
+    NETWORK_CONNECTION_COLUMNS = (
+        "account1_id", "account2_id", "connection_type", "shared_metadata", "strength"
+    )
+    
+    EXPORT_FORMATS = ("parquet", "csv")
+    
+    def __init__(self, db_path: str = "data/pindar.duckdb", batch_size: int = 5000, cache: QueryCache = None):
+        """
+        Args:
+            db_path: Path to the DuckDB database file, or ":memory:"
+            batch_size: Rows written per transaction by the bulk store methods
+            cache: Optional QueryCache for get_recent_threats,
+                get_high_risk_accounts and get_unacknowledged_alerts
+        """
+        if not DUCKDB_AVAILABLE:
+            raise RuntimeError("The DuckDB backend requires duckdb")
+        
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.cache = cache
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # DuckDB allows a single writing process; threads share it through their own cursors
+        self.connection = duckdb.connect(db_path)
+        self._local = threading.local()
+        self._cursors = []
+        self._cursors_lock = threading.Lock()
+        
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+    
+    def _get_connection(self):
+        """Return the calling thread's cursor, opening it on first use"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self.connection.cursor()
+            self._local.cursor = cursor
+            with self._cursors_lock:
+                self._cursors.append(cursor)
+        return cursor
+    
+    @contextmanager
+    def _transaction(self):
+        """The calling thread's cursor inside a transaction, committed on success"""
+        conn = self._get_connection()
+        conn.begin()
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    def close(self):
+        """Close every thread's cursor and the database"""
+        with self._cursors_lock:
+            for cursor in self._cursors:
+                cursor.close()
+            self._cursors.clear()
+        self._local = threading.local()
+        self.connection.close()
+    
+    def _threat_row(self, threat_data: Dict[str, Any]) -> Tuple:
+        """Values of THREAT_COLUMNS for one threat"""
+        return (
+            threat_data.get("platform", "unknown"),
+            threat_data.get("channel", "unknown"),
+            threat_data.get("message", ""),
+            threat_data.get("threat_score", 0),
+            threat_data.get("risk_level", "low"),
+            bool(threat_data.get("bot_detected", False)),
+            json.dumps(threat_data.get("metadata", {})),
+            json.dumps(threat_data.get("analysis_result", {}))
+        )
+    
+    def _account_row(self, account_data: Dict[str, Any], occurrences: int = 1) -> Tuple:
+        """Values of ACCOUNT_COLUMNS for an account written occurrences times"""
+        return (
+            account_data.get("username"),
+            account_data.get("platform", "unknown"),
+            account_data.get("threat_score", 0),
+            account_data.get("risk_level", "low"),
+            account_data.get("bot_confidence", 0.0),
+            json.dumps(account_data.get("metadata", {})),
+            # A new account starts at 0 and each further write adds one
+            occurrences - 1
+        )
+    
+    def _alert_row(self, alert_data: Dict[str, Any]) -> Tuple:
+        """Values of ALERT_COLUMNS for one alert"""
+        return (
+            alert_data.get("alert_type", "unknown"),
+            alert_data.get("severity", "medium"),
+            alert_data.get("message", ""),
+            json.dumps(alert_data.get("details", {}))
+        )
+    
+    def _network_connection_row(self, connection_data: Dict[str, Any]) -> Tuple:
+        """Values of NETWORK_CONNECTION_COLUMNS for one connection"""
+        return (
+            connection_data.get("account1_id"),
+            connection_data.get("account2_id"),
+            connection_data.get("connection_type", "metadata"),
+            json.dumps(connection_data.get("shared_metadata", [])),
+            connection_data.get("strength", 0.0)
+        )
+    
+    def _insert_columns(self, conn, table: str, columns: Sequence[str], rows: List[Tuple], suffix: str = ""):
+        """Insert rows as one column array per parameter, much faster than executemany"""
+        return conn.execute(f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            SELECT {', '.join('unnest(?)' for _ in columns)}
+            {suffix}
+        """, [list(values) for values in zip(*rows)])
+    
+    def _insert_one(self, table: str, columns: Sequence[str], row: Tuple) -> int:
+        """Insert a single row and return its id"""
+        with self._transaction() as conn:
+            return conn.execute(f"""
+                INSERT INTO {table} ({', '.join(columns)})
+                VALUES ({', '.join('?' for _ in columns)})
+                RETURNING id
+            """, row).fetchone()[0]
+    
+    @invalidates("threats")
+    def store_threat(self, threat_data: Dict[str, Any]) -> int:
+        """
+        Store threat data in database
+        
+        Args:
+            threat_data: Dictionary containing threat information
+            
+        Returns:
+            ID of stored threat
+        """
+        return self._insert_one("threats", self.THREAT_COLUMNS, self._threat_row(threat_data))
+    
+    @invalidates("accounts")
+    def store_account(self, account_data: Dict[str, Any]) -> int:
+        """
+        Store account data in database
+        
+        New accounts are inserted; an existing username has its scores and
+        metadata replaced and its message count incremented.
+        
+        Args:
+            account_data: Dictionary containing account information
+            
+        Returns:
+            ID of stored account
+        """
+        with self._transaction() as conn:
+            return self._upsert_accounts(conn, [account_data])[account_data.get("username")]
+    
+    @invalidates("alerts")
+    def store_alert(self, alert_data: Dict[str, Any]) -> int:
+        """
+        Store alert in database
+        
+        Args:
+            alert_data: Dictionary containing alert information
+            
+        Returns:
+            ID of stored alert
+        """
+        return self._insert_one("alerts", self.ALERT_COLUMNS, self._alert_row(alert_data))
+    
+    @invalidates("network_connections")
+    def store_network_connection(self, connection_data: Dict[str, Any]) -> int:
+        """
+        Store network connection between accounts
+        
+        Args:
+            connection_data: Dictionary containing connection information
+            
+        Returns:
+            ID of stored connection
+        """
+        return self._insert_one(
+            "network_connections", self.NETWORK_CONNECTION_COLUMNS, self._network_connection_row(connection_data)
+        )
+    
+    def _store_many(self, rows: Iterable[Any], batch_size: int, writer: Callable[[Any, List[Any]], Any]) -> int:
+        """Write rows with writer, one transaction per batch"""
+        batch_size = batch_size or self.batch_size
+        rows = iter(rows)
+        stored = 0
+        
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with self._transaction() as conn:
+                writer(conn, batch)
+            stored += len(batch)
+        
+        return stored
+    
+    def _column_writer(self, table: str, columns: Sequence[str]) -> Callable[[Any, List[Tuple]], Any]:
+        """Batch writer inserting rows into a table"""
+        return lambda conn, batch: self._insert_columns(conn, table, columns, batch)
+    
+    @invalidates("threats")
+    def store_threats_many(self, threats: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many threats with one transaction per batch
+        
+        Args:
+            threats: Iterable of threat dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of threats stored
+        """
+        return self._store_many(
+            map(self._threat_row, threats), batch_size, self._column_writer("threats", self.THREAT_COLUMNS)
+        )
+    
+    @invalidates("accounts")
+    def store_accounts_many(self, accounts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Upsert many accounts with one transaction per batch
+        
+        Args:
+            accounts: Iterable of account dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of account records written
+        """
+        return self._store_many(accounts, batch_size, self._upsert_accounts)
+    
+    @invalidates("alerts")
+    def store_alerts_many(self, alerts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many alerts with one transaction per batch
+        
+        Args:
+            alerts: Iterable of alert dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of alerts stored
+        """
+        return self._store_many(
+            map(self._alert_row, alerts), batch_size, self._column_writer("alerts", self.ALERT_COLUMNS)
+        )
+    
+    @invalidates("network_connections")
+    def store_network_connections_many(self, connections: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many network connections with one transaction per batch
+        
+        Args:
+            connections: Iterable of connection dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of connections stored
+        """
+        return self._store_many(
+            map(self._network_connection_row, connections),
+            batch_size,
+            self._column_writer("network_connections", self.NETWORK_CONNECTION_COLUMNS)
+        )
+    
+    def _upsert_accounts(self, conn, accounts: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert accounts and relink their identifiers, returning username -> id"""
+        # One row per username, since a statement may not update a row twice
+        merged = self._merge_accounts(accounts)
+        ids = dict(self._insert_columns(
+            conn,
+            "accounts",
+            self.ACCOUNT_COLUMNS,
+            [self._account_row(account, occurrences) for account, occurrences in merged],
+            """
+            ON CONFLICT (username) DO UPDATE SET
+                threat_score = excluded.threat_score,
+                risk_level = excluded.risk_level,
+                bot_confidence = excluded.bot_confidence,
+                metadata = excluded.metadata,
+                last_seen = now() AT TIME ZONE 'UTC',
+                message_count = accounts.message_count + excluded.message_count + 1
+            RETURNING username, id
+            """
+        ).fetchall())
+        
+        self._link_identifiers(conn, {
+            ids[account.get("username")]: self._account_identifiers(account) for account, _ in merged
+        })
+        return ids
+    
+    def _link_identifiers(self, conn, links: Dict[int, List[Tuple[str, str]]]):
+        """Replace the identifiers linked to each account id"""
+        conn.execute("DELETE FROM account_identifiers WHERE account_id IN (SELECT unnest(?))", [list(links)])
+        
+        identifiers = {identifier for identifiers in links.values() for identifier in identifiers}
+        if not identifiers:
+            return
+        self._insert_columns(conn, "identifiers", ("kind", "value"), list(identifiers), "ON CONFLICT DO NOTHING")
+        values = [
+            (account_id, kind, value)
+            for account_id, identifiers in links.items()
+            for kind, value in identifiers
+        ]
+        conn.execute("""
+            INSERT INTO account_identifiers (account_id, identifier_id)
+            SELECT link.account_id, identifiers.id
+            FROM (SELECT unnest(?) AS account_id, unnest(?) AS kind, unnest(?) AS value) AS link
+            JOIN identifiers ON identifiers.kind = link.kind AND identifiers.value = link.value
+            ON CONFLICT DO NOTHING
+        """, [list(column) for column in zip(*values)])
+    
+    def _decode_row(self, table: str, columns: Dict[str, int], row: Sequence[Any], lazy: bool):
+        """Wrap a raw row as a LazyRecord, or decode it into a dictionary"""
+        decoder = self._decode_free_text if table in self.FREE_TEXT_TABLES else json.loads
+        record = LazyRecord(columns, row, self.JSON_COLUMNS.get(table, ()), decoder)
+        return record if lazy else record.to_dict()
+    
+    def _decode_free_text(self, stored: str) -> Any:
+        """Decode a JSON column that may hold legacy free text"""
+        try:
+            return json.loads(stored)
+        except ValueError:
+            return stored
+    
+    def _query(self, table: str, sql: str, params: Iterable[Any] = (), lazy: bool = False) -> List[Any]:
+        """Run a query and return its rows as records"""
+        cursor = self._get_connection().execute(sql, list(params))
+        columns = {description[0]: i for i, description in enumerate(cursor.description)}
+        return [self._decode_row(table, columns, row, lazy) for row in cursor.fetchall()]
+    
+    def _iter_keyset(
+        self,
+        table: str,
+        where: List[str],
+        params: List[Any],
+        order_column: str,
+        batch_size: int,
+        lazy: bool
+    ) -> Iterator[Any]:
+        """Stream rows in (order_column, id) descending order, one page per query"""
+        last_key = None
+        
+        while True:
+            conditions = list(where)
+            page_params = list(params)
+            if last_key is not None:
+                conditions.append(f"({order_column}, id) < (?, ?)")
+                page_params.extend(last_key)
+            
+            where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            records = self._query(table, f"""
+                SELECT * FROM {table}
+                {where_sql}
+                ORDER BY {order_column} DESC, id DESC
+                LIMIT ?
+            """, (*page_params, batch_size), lazy)
+            
+            yield from records
+            if len(records) < batch_size:
+                return
+            last_key = (records[-1][order_column], records[-1]["id"])
+    
+    def iter_threats(
+        self,
+        platform: str = None,
+        since: str = None,
+        until: str = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream threats newest first with keyset pagination
+        
+        Args:
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            until: Optional exclusive upper bound on the timestamp
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords that decode JSON columns on access,
+                instead of fully decoded dictionaries
+                
+        Returns:
+            Iterator over threat records
+        """
+        where, params = [], []
+        if platform:
+            where.append("platform = ?")
+            params.append(platform)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        return self._iter_keyset("threats", where, params, "timestamp", batch_size, lazy)
+    
+    def iter_network_connections(
+        self,
+        account_id: int = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream network connections strongest first with keyset pagination
+        
+        Args:
+            account_id: Optional account ID to filter connections
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords that decode JSON columns on access,
+                instead of fully decoded dictionaries
+                
+        Returns:
+            Iterator over connection records
+        """
+        where, params = [], []
+        if account_id:
+            where.append("(account1_id = ? OR account2_id = ?)")
+            params.extend([account_id, account_id])
+        return self._iter_keyset("network_connections", where, params, "strength", batch_size, lazy)
+    
+    def iter_table(
+        self,
+        table: str,
+        since: str = None,
+        until: str = None,
+        after_id: int = 0,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream every row of a table in id order with keyset pagination
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            since: Optional inclusive lower bound on the table's time column
+            until: Optional exclusive upper bound on the table's time column
+            after_id: Only rows with a larger id are returned, for resuming
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords instead of fully decoded dictionaries
+            
+        Returns:
+            Iterator over table records
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conditions, params = ["id > ?"], []
+        if since:
+            conditions.append(f"{self.TIME_COLUMNS[table]} >= ?")
+            params.append(since)
+        if until:
+            conditions.append(f"{self.TIME_COLUMNS[table]} < ?")
+            params.append(until)
+        
+        last_id = after_id
+        while True:
+            records = self._query(table, f"""
+                SELECT * FROM {table}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, *params, batch_size), lazy)
+            
+            yield from records
+            if len(records) < batch_size:
+                return
+            last_id = records[-1]["id"]
+    
+    def search_threats(
+        self,
+        query: str,
+        platform: str = None,
+        since: str = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Search threat messages containing every query term, best matches first
+        
+        There is no full-text index here: each search scans the message
+        column, which DuckDB does in parallel. Terms match case-insensitively
+        anywhere in a word, and matches are ranked by how often they occur.
+        
+        Args:
+            query: Space-separated search terms
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            limit: Maximum number of threats to retrieve
+            
+        Returns:
+            List of threat dictionaries, each with a "snippet" of the message
+            with matches in **bold** and its "rank" (lower is better)
+            
+        Raises:
+            ValueError: If the query has no search terms
+        """
+        terms = [term.lower() for term in re.findall(r"\w+", query)]
+        if not terms:
+            raise ValueError(f"Invalid search query: {query!r}")
+        
+        conditions = ["contains(lower(message), ?)" for _ in terms]
+        params = list(terms)
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if since:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        
+        occurrences = " + ".join("(len(string_split(lower(message), ?)) - 1)" for _ in terms)
+        threats = self._query("threats", f"""
+            SELECT *, -({occurrences}) AS rank FROM threats
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank, timestamp DESC
+            LIMIT ?
+        """, (*terms, *params, limit))
+        
+        for threat in threats:
+            threat["snippet"] = self._snippet(threat["message"], terms)
+        return threats
+    
+    def _snippet(self, message: str, terms: List[str], words: int = 16) -> str:
+        """Window of words around the first match, with matching words in **bold**"""
+        tokens = message.split()
+        matches = [any(term in token.lower() for term in terms) for token in tokens]
+        first = matches.index(True) if True in matches else 0
+        start = max(0, min(first - words // 4, len(tokens) - words))
+        window = [
+            f"**{token}**" if matched else token
+            for token, matched in zip(tokens[start:start + words], matches[start:start + words])
+        ]
+        return ("..." if start else "") + " ".join(window) + ("..." if start + words < len(tokens) else "")
+    
+    @cached_query("accounts")
+    def get_high_risk_accounts(self, min_score: int = 80) -> List[Dict[str, Any]]:
+        """
+        Get high-risk accounts from database
+        
+        Args:
+            min_score: Minimum threat score threshold
+            
+        Returns:
+            List of account dictionaries
+        """
+        return self._query("accounts", """
+            SELECT * FROM accounts
+            WHERE threat_score >= ?
+            ORDER BY threat_score DESC
+        """, (min_score,))
+    
+    @cached_query("alerts")
+    def get_unacknowledged_alerts(self) -> List[Dict[str, Any]]:
+        """
+        Get unacknowledged alerts from database
+        
+        Returns:
+            List of alert dictionaries
+        """
+        return self._query("alerts", """
+            SELECT * FROM alerts
+            WHERE acknowledged = FALSE
+            ORDER BY timestamp DESC
+        """)
+    
+    def find_accounts_by_identifier(self, kind: str, value: str) -> List[Dict[str, Any]]:
+        """
+        Get accounts whose metadata lists an identifier
+        
+        Args:
+            kind: Identifier kind (see IDENTIFIER_KINDS), e.g. "phone_numbers"
+            value: Identifier value
+            
+        Returns:
+            List of account dictionaries, highest threat score first
+        """
+        return self._query("accounts", """
+            SELECT accounts.* FROM identifiers
+            JOIN account_identifiers ON account_identifiers.identifier_id = identifiers.id
+            JOIN accounts ON accounts.id = account_identifiers.account_id
+            WHERE identifiers.kind = ? AND identifiers.value = ?
+            ORDER BY accounts.threat_score DESC
+        """, (kind, value))
+    
+    def get_shared_identifiers(self, account_ids: List[int] = None, min_shared: int = 1) -> List[Dict[str, Any]]:
+        """
+        Find account pairs that share identifiers
+        
+        Args:
+            account_ids: Optional accounts to restrict both sides of each pair to
+            min_shared: Minimum number of shared identifiers per pair
+            
+        Returns:
+            List of dictionaries with account1_id < account2_id, the shared
+            identifier kinds as "shared_metadata" and their "shared_count",
+            most shared first
+        """
+        where, params = "", []
+        if account_ids is not None:
+            where = """
+                WHERE first.account_id IN (SELECT unnest(?))
+                AND second.account_id IN (SELECT unnest(?))
+            """
+            ids = [int(account_id) for account_id in account_ids]
+            params = [ids, ids]
+        
+        rows = self._get_connection().execute(f"""
+            SELECT first.account_id, second.account_id,
+                list(DISTINCT identifiers.kind), COUNT(*) AS shared_count
+            FROM account_identifiers AS first
+            JOIN account_identifiers AS second
+                ON second.identifier_id = first.identifier_id AND second.account_id > first.account_id
+            JOIN identifiers ON identifiers.id = first.identifier_id
+            {where}
+            GROUP BY first.account_id, second.account_id
+            HAVING COUNT(*) >= ?
+            ORDER BY shared_count DESC, first.account_id, second.account_id
+        """, [*params, min_shared]).fetchall()
+        
+        return [
+            {
+                "account1_id": account1_id,
+                "account2_id": account2_id,
+                "shared_metadata": [kind for kind in self.IDENTIFIER_KINDS if kind in kinds],
+                "shared_count": shared_count
+            }
+            for account1_id, account2_id, kinds, shared_count in rows
+        ]
+    
+    def get_columns(self, table: str) -> List[Tuple[str, str]]:
+        """
+        Get the columns of a table
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            
+        Returns:
+            (name, declared type) of each column, in SELECT * order
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        return [(row[1], row[2]) for row in self._get_connection().execute(f"PRAGMA table_info('{table}')").fetchall()]
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get database statistics
+        
+        Each table is aggregated in a single columnar scan.
+        
+        Returns:
+            Dictionary containing statistics
+        """
+        conn = self._get_connection()
+        day_ago = datetime.utcnow() - timedelta(hours=24)
+        
+        total_threats, high_risk_threats, avg_score, threats_last_24h = conn.execute("""
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE threat_score >= 80),
+                AVG(threat_score), COUNT(*) FILTER (WHERE timestamp >= ?)
+            FROM threats
+        """, [day_ago]).fetchone()
+        total_accounts, high_risk_accounts, bot_accounts = conn.execute("""
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE threat_score >= 80),
+                COUNT(*) FILTER (WHERE bot_confidence > 0.7)
+            FROM accounts
+        """).fetchone()
+        unacknowledged_alerts, high_severity_alerts, alerts_last_24h = conn.execute("""
+            SELECT COUNT(*) FILTER (WHERE acknowledged = FALSE),
+                COUNT(*) FILTER (WHERE severity = 'high'),
+                COUNT(*) FILTER (WHERE timestamp >= ?)
+            FROM alerts
+        """, [day_ago]).fetchone()
+        platform_distribution = dict(conn.execute(
+            "SELECT platform, COUNT(*) FROM threats GROUP BY platform"
+        ).fetchall())
+        
+        return {
+            "total_threats": total_threats,
+            "high_risk_threats": high_risk_threats,
+            "average_threat_score": round(avg_score, 2) if avg_score else 0,
+            "total_accounts": total_accounts,
+            "high_risk_accounts": high_risk_accounts,
+            "bot_accounts": bot_accounts,
+            "unacknowledged_alerts": unacknowledged_alerts,
+            "high_severity_alerts": high_severity_alerts,
+            "platform_distribution": platform_distribution,
+            "threats_last_24h": threats_last_24h,
+            "alerts_last_24h": alerts_last_24h
+        }
+    
+    @invalidates("alerts")
+    def acknowledge_alert(self, alert_id: int) -> bool:
+        """
+        Acknowledge an alert
+        
+        Args:
+            alert_id: ID of alert to acknowledge
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self._transaction() as conn:
+                return bool(conn.execute(
+                    "UPDATE alerts SET acknowledged = TRUE WHERE id = ? RETURNING id", [alert_id]
+                ).fetchall())
+        except duckdb.Error:
+            return False
+    
+    def export_table(self, table: str, path: str, format: str = "parquet") -> int:
+        """
+        Write a whole table to a file with DuckDB's native writer
+        
+        Much faster than DataExporter for full dumps, but neither streamed
+        through Python nor resumable. JSON columns are written as JSON text.
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            path: Output file path
+            format: "parquet" or "csv"
+            
+        Returns:
+            Number of rows exported
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        if format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        
+        quoted_path = path.replace("'", "''")
+        options = "FORMAT parquet" if format == "parquet" else "FORMAT csv, HEADER"
+        return self._get_connection().execute(
+            f"COPY (SELECT * FROM {table} ORDER BY id) TO '{quoted_path}' ({options})"
+        ).fetchone()[0]
+    
+    def _delete_expired(
+        self,
+        table: str,
+        condition: str,
+        cutoff: str,
+        limit: int,
+        archive: Callable[[List[Dict[str, Any]]], None] = None
+    ) -> int:
+        """Delete up to limit rows older than the cutoff, passing them to archive before commit"""
+        with self._transaction() as conn:
+            cursor = conn.execute(f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE timestamp < ? {condition}
+                    ORDER BY timestamp
+                    LIMIT ?
+                )
+                RETURNING *
+            """, [cutoff, limit])
+            columns = {description[0]: i for i, description in enumerate(cursor.description)}
+            records = [self._decode_row(table, columns, row, False) for row in cursor.fetchall()]
+            if archive and records:
+                archive(records)
+            return len(records)
@@ -1,9 +1,11 @@
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import networkx as nx
 import random
 
+from utils.storage_backend import StorageBackend
+
 def generate_threat_narrative(suspect_name: str, threat_score: int, platforms: str) -> str:
     """
     Generate a unified threat narrative for a suspect
@@ -158,12 +160,14 @@ def calculate_threat_score(
     
     return threat_score
 
-def create_network_graph(accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
+def create_network_graph(accounts: List[Dict[str, Any]], database: StorageBackend) -> Dict[str, Any]:
     """
     Create network graph from account data
     
     Args:
         accounts: List of account dictionaries
+        database: Backend the accounts are stored in; shared identifiers are
+            looked up there, so accounts without an "id" get no edges
         
     Returns:
         Network graph data for visualization
@@ -178,18 +182,15 @@ def create_network_graph(accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
         G.add_node(node_id, **account)
     
     # Add edges based on shared metadata
-    for i, account1 in enumerate(accounts):
-        for j, account2 in enumerate(accounts[i+1:], i+1):
-            # Check for shared metadata
-            shared_metadata = _find_shared_metadata(account1, account2)
-            if shared_metadata:
-                weight = len(shared_metadata) / 10.0  # Normalize weight
-                G.add_edge(
-                    account1.get("id", f"account_{i}"),
-                    account2.get("id", f"account_{j}"),
-                    weight=weight,
-                    shared_metadata=shared_metadata
-                )
+    for (i, j), shared_metadata in _find_shared_metadata_pairs(accounts, database).items():
+        account1, account2 = accounts[i], accounts[j]
+        weight = len(shared_metadata) / 10.0  # Normalize weight
+        G.add_edge(
+            account1.get("id", f"account_{i}"),
+            account2.get("id", f"account_{j}"),
+            weight=weight,
+            shared_metadata=shared_metadata
+        )
     
     # Calculate centrality measures
     centrality = nx.degree_centrality(G)
@@ -229,35 +230,31 @@ def create_network_graph(accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
     }
 
-def _find_shared_metadata(account1: Dict[str, Any], account2: Dict[str, Any]) -> List[str]:
-    """Find shared metadata between two accounts"""
-    shared = []
-    
-    # Check phone numbers
-    phones1 = set(account1.get("metadata", {}).get("phone_numbers", []))
-    phones2 = set(account2.get("metadata", {}).get("phone_numbers", []))
-    if phones1 & phones2:
-        shared.append("phone_numbers")
-    
-    # Check email addresses
-    emails1 = set(account1.get("metadata", {}).get("email_addresses", []))
-    emails2 = set(account2.get("metadata", {}).get("email_addresses", []))
-    if emails1 & emails2:
-        shared.append("email_addresses")
-    
-    # Check UPI IDs
-    upis1 = set(account1.get("metadata", {}).get("upi_ids", []))
-    upis2 = set(account2.get("metadata", {}).get("upi_ids", []))
-    if upis1 & upis2:
-        shared.append("upi_ids")
-    
-    # Check cryptocurrency addresses
-    cryptos1 = set(account1.get("metadata", {}).get("cryptocurrency_addresses", []))
-    cryptos2 = set(account2.get("metadata", {}).get("cryptocurrency_addresses", []))
-    if cryptos1 & cryptos2:
-        shared.append("cryptocurrency_addresses")
-    
-    return shared
+def _find_shared_metadata_pairs(accounts: List[Dict[str, Any]], database: StorageBackend) -> Dict[Tuple[int, int], List[str]]:
+    """
+    Find every pair of accounts with shared metadata
+    
+    The pairs come from the backend's identifier tables in one query instead
+    of comparing the accounts' metadata lists in Python.
+    
+    Args:
+        accounts: List of account dictionaries
+        database: Backend the accounts are stored in
+    
+    Returns:
+        Mapping of (index1, index2) with index1 < index2 to the shared metadata
+        kinds, ordered by pair
+    """
+    positions = {account["id"]: position for position, account in enumerate(accounts) if account.get("id") is not None}
+    if len(positions) < 2:
+        return {}
+    
+    shared = {}
+    for pair in database.get_shared_identifiers(account_ids=list(positions)):
+        first, second = positions[pair["account1_id"]], positions[pair["account2_id"]]
+        shared[(min(first, second), max(first, second))] = pair["shared_metadata"]
+    
+    return dict(sorted(shared.items()))
 
 def _get_risk_group(threat_score: int) -> str:
     """Get risk group based on threat score"""
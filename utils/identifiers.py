@@ -0,0 +1,3 @@
+# Account metadata lists normalized into the identifiers tables, in the order
+# shared kinds are reported
+IDENTIFIER_KINDS = ("phone_numbers", "email_addresses", "upi_ids", "cryptocurrency_addresses")
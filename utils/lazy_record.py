@@ -0,0 +1,57 @@
+import json
+from typing import Dict, Any, Iterator, Sequence, Collection, Callable
+from collections.abc import Mapping
+
+class LazyRecord(Mapping):
+    """
+    Read-only database row that decodes its JSON columns on first access
+    """
+    
+    __slots__ = ("_columns", "_row", "_json_columns", "_decoder", "_decoded")
+    
+    def __init__(
+        self,
+        columns: Dict[str, int],
+        row: Sequence[Any],
+        json_columns: Collection[str] = (),
+        decoder: Callable[[Any], Any] = json.loads
+    ):
+        """
+        Args:
+            columns: Column name to position mapping, shared by every row of a query
+            row: Raw row tuple from the cursor
+            json_columns: Columns holding encoded JSON values
+            decoder: Function decoding a stored JSON column value
+        """
+        self._columns = columns
+        self._row = row
+        self._json_columns = json_columns
+        self._decoder = decoder
+        self._decoded = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._decoded:
+            return self._decoded[key]
+        
+        value = self._row[self._columns[key]]
+        if key in self._json_columns and value:
+            value = self._decoder(value)
+            self._decoded[key] = value
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+    
+    def __len__(self) -> int:
+        return len(self._columns)
+    
+    def raw(self, key: str) -> Any:
+        """Column value as stored, without JSON decoding"""
+        return self._row[self._columns[key]]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decoded copy of the row"""
+        return {key: self[key] for key in self._columns}
+    
+    def __repr__(self) -> str:
+        return f"LazyRecord({dict(zip(self._columns, self._row))!r})"
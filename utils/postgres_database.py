@@ -0,0 +1,832 @@
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterable, Iterator, Tuple, Callable
+from itertools import islice
+from datetime import datetime, timedelta
+try:
+    import psycopg2
+    import psycopg2.extras
+    import psycopg2.pool
+    POSTGRES_AVAILABLE = True
+except ImportError:
+    POSTGRES_AVAILABLE = False
+
+from utils.lazy_record import LazyRecord
+from utils.query_cache import QueryCache
+from utils.storage_backend import StorageBackend, cached_query, invalidates
+
+class PostgresDatabase(StorageBackend):
+    """
+    PostgreSQL storage over a thread-safe connection pool, for concurrent multi-process ingest
+    """
+    
+    # Key of the advisory lock serializing schema creation between processes
+    SCHEMA_LOCK = 0x50494E44
+    
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS threats (
+            id BIGSERIAL PRIMARY KEY,
+            platform TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            message TEXT NOT NULL,
+            threat_score INTEGER NOT NULL,
+            risk_level TEXT NOT NULL,
+            bot_detected BOOLEAN DEFAULT FALSE,
+            metadata JSONB,
+            analysis_result JSONB,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS accounts (
+            id BIGSERIAL PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            platform TEXT NOT NULL,
+            threat_score INTEGER DEFAULT 0,
+            risk_level TEXT DEFAULT 'low',
+            bot_confidence DOUBLE PRECISION DEFAULT 0.0,
+            metadata JSONB,
+            first_seen TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc'),
+            last_seen TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc'),
+            message_count INTEGER DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS alerts (
+            id BIGSERIAL PRIMARY KEY,
+            alert_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            message TEXT NOT NULL,
+            details JSONB,
+            acknowledged BOOLEAN DEFAULT FALSE,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS network_connections (
+            id BIGSERIAL PRIMARY KEY,
+            account1_id BIGINT REFERENCES accounts (id),
+            account2_id BIGINT REFERENCES accounts (id),
+            connection_type TEXT NOT NULL,
+            shared_metadata JSONB,
+            strength DOUBLE PRECISION DEFAULT 0.0,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS analysis_logs (
+            id BIGSERIAL PRIMARY KEY,
+            analysis_type TEXT NOT NULL,
+            input_data JSONB,
+            result JSONB,
+            processing_time DOUBLE PRECISION,
+            timestamp TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS identifiers (
+            id BIGSERIAL PRIMARY KEY,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            UNIQUE (kind, value)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS account_identifiers (
+            account_id BIGINT NOT NULL REFERENCES accounts (id),
+            identifier_id BIGINT NOT NULL REFERENCES identifiers (id),
+            PRIMARY KEY (account_id, identifier_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_threats_timestamp ON threats (timestamp, id)",
+        "CREATE INDEX IF NOT EXISTS idx_threats_search ON threats USING GIN (to_tsvector('simple', message))",
+        "CREATE INDEX IF NOT EXISTS idx_accounts_threat_score ON accounts (threat_score)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_alerts_unacknowledged
+        ON alerts (timestamp) WHERE acknowledged = FALSE
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts (timestamp)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_network_connections_account1
+        ON network_connections (account1_id, strength)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_network_connections_account2
+        ON network_connections (account2_id, strength)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_network_connections_strength ON network_connections (strength, id)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_logs_timestamp ON analysis_logs (timestamp)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_account_identifiers_identifier
+        ON account_identifiers (identifier_id, account_id)
+        """
+    ]
+    
+    # Write statements for psycopg2.extras.execute_values
+    INSERT_THREAT_SQL = """
+        INSERT INTO threats (
+            platform, channel, message, threat_score, risk_level,
+            bot_detected, metadata, analysis_result
+        ) VALUES %s
+    """
+    UPSERT_ACCOUNT_SQL = """
+        INSERT INTO accounts (
+            username, platform, threat_score, risk_level,
+            bot_confidence, metadata, message_count
+        ) VALUES %s
+        ON CONFLICT (username) DO UPDATE SET
+            threat_score = excluded.threat_score,
+            risk_level = excluded.risk_level,
+            bot_confidence = excluded.bot_confidence,
+            metadata = excluded.metadata,
+            last_seen = now() AT TIME ZONE 'utc',
+            message_count = accounts.message_count + excluded.message_count + 1
+        RETURNING username, id
+    """
+    INSERT_ALERT_SQL = """
+        INSERT INTO alerts (
+            alert_type, severity, message, details
+        ) VALUES %s
+    """
+    INSERT_NETWORK_CONNECTION_SQL = """
+        INSERT INTO network_connections (
+            account1_id, account2_id, connection_type,
+            shared_metadata, strength
+        ) VALUES %s
+    """
+    
+    def __init__(
+        self,
+        dsn: str,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        batch_size: int = 5000,
+        cache: QueryCache = None
+    ):
+        """
+        Args:
+            dsn: libpq connection string or postgresql:// URL
+            min_connections: Connections opened up front
+            max_connections: Pool size; every thread using the database at
+                the same time needs its own connection
+            batch_size: Rows per transaction in the bulk writers and cleanup
+            cache: Optional QueryCache for get_recent_threats,
+                get_high_risk_accounts and get_unacknowledged_alerts
+        """
+        if not POSTGRES_AVAILABLE:
+            raise RuntimeError("The PostgreSQL backend requires psycopg2")
+        
+        self.dsn = dsn
+        self.batch_size = batch_size
+        self.cache = cache
+        self.pool = psycopg2.pool.ThreadedConnectionPool(min_connections, max_connections, dsn)
+        self._init_database()
+    
+    @contextmanager
+    def _cursor(self):
+        """Cursor on a pooled connection, committed on success and rolled back on error"""
+        conn = self.pool.getconn()
+        try:
+            with conn:
+                with conn.cursor() as cursor:
+                    yield cursor
+        finally:
+            self.pool.putconn(conn)
+    
+    def close(self):
+        """Close every pooled connection"""
+        self.pool.closeall()
+    
+    def _init_database(self):
+        """Initialize database tables and indexes"""
+        with self._cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.SCHEMA_LOCK,))
+            for statement in self.SCHEMA:
+                cursor.execute(statement)
+    
+    def _threat_row(self, threat_data: Dict[str, Any]) -> Tuple:
+        """Values of INSERT_THREAT_SQL for one threat"""
+        return (
+            threat_data.get("platform", "unknown"),
+            threat_data.get("channel", "unknown"),
+            threat_data.get("message", ""),
+            threat_data.get("threat_score", 0),
+            threat_data.get("risk_level", "low"),
+            bool(threat_data.get("bot_detected", False)),
+            psycopg2.extras.Json(threat_data.get("metadata", {})),
+            psycopg2.extras.Json(threat_data.get("analysis_result", {}))
+        )
+    
+    def _account_row(self, account_data: Dict[str, Any], occurrences: int = 1) -> Tuple:
+        """Values of UPSERT_ACCOUNT_SQL for an account written occurrences times"""
+        return (
+            account_data.get("username"),
+            account_data.get("platform", "unknown"),
+            account_data.get("threat_score", 0),
+            account_data.get("risk_level", "low"),
+            account_data.get("bot_confidence", 0.0),
+            psycopg2.extras.Json(account_data.get("metadata", {})),
+            # A new account starts at 0 and each further write adds one
+            occurrences - 1
+        )
+    
+    def _alert_row(self, alert_data: Dict[str, Any]) -> Tuple:
+        """Values of INSERT_ALERT_SQL for one alert"""
+        return (
+            alert_data.get("alert_type", "unknown"),
+            alert_data.get("severity", "medium"),
+            alert_data.get("message", ""),
+            psycopg2.extras.Json(alert_data.get("details", {}))
+        )
+    
+    def _network_connection_row(self, connection_data: Dict[str, Any]) -> Tuple:
+        """Values of INSERT_NETWORK_CONNECTION_SQL for one connection"""
+        return (
+            connection_data.get("account1_id"),
+            connection_data.get("account2_id"),
+            connection_data.get("connection_type", "metadata"),
+            psycopg2.extras.Json(connection_data.get("shared_metadata", [])),
+            connection_data.get("strength", 0.0)
+        )
+    
+    def _insert_one(self, sql: str, row: Tuple) -> int:
+        """Insert a single row and return its id"""
+        with self._cursor() as cursor:
+            return psycopg2.extras.execute_values(cursor, sql + " RETURNING id", [row], fetch=True)[0][0]
+    
+    @invalidates("threats")
+    def store_threat(self, threat_data: Dict[str, Any]) -> int:
+        """
+        Store threat data in database
+        
+        Args:
+            threat_data: Dictionary containing threat information
+            
+        Returns:
+            ID of stored threat
+        """
+        return self._insert_one(self.INSERT_THREAT_SQL, self._threat_row(threat_data))
+    
+    @invalidates("accounts")
+    def store_account(self, account_data: Dict[str, Any]) -> int:
+        """
+        Store account data in database
+        
+        New accounts are inserted; an existing username has its scores and
+        metadata replaced and its message count incremented.
+        
+        Args:
+            account_data: Dictionary containing account information
+            
+        Returns:
+            ID of stored account
+        """
+        with self._cursor() as cursor:
+            return self._upsert_accounts(cursor, [account_data])[account_data.get("username")]
+    
+    @invalidates("alerts")
+    def store_alert(self, alert_data: Dict[str, Any]) -> int:
+        """
+        Store alert in database
+        
+        Args:
+            alert_data: Dictionary containing alert information
+            
+        Returns:
+            ID of stored alert
+        """
+        return self._insert_one(self.INSERT_ALERT_SQL, self._alert_row(alert_data))
+    
+    @invalidates("network_connections")
+    def store_network_connection(self, connection_data: Dict[str, Any]) -> int:
+        """
+        Store network connection between accounts
+        
+        Args:
+            connection_data: Dictionary containing connection information
+            
+        Returns:
+            ID of stored connection
+        """
+        return self._insert_one(self.INSERT_NETWORK_CONNECTION_SQL, self._network_connection_row(connection_data))
+    
+    def _store_many(
+        self,
+        rows: Iterable[Any],
+        batch_size: int = None,
+        writer: Callable[[Any, List[Any]], Any] = None,
+        sql: str = None
+    ) -> int:
+        """Write rows with execute_values (or a custom writer), one transaction per batch"""
+        batch_size = batch_size or self.batch_size
+        rows = iter(rows)
+        stored = 0
+        
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with self._cursor() as cursor:
+                if writer:
+                    writer(cursor, batch)
+                else:
+                    psycopg2.extras.execute_values(cursor, sql, batch, page_size=len(batch))
+            stored += len(batch)
+        
+        return stored
+    
+    @invalidates("threats")
+    def store_threats_many(self, threats: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many threats with one transaction per batch
+        
+        Args:
+            threats: Iterable of threat dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of threats stored
+        """
+        return self._store_many(map(self._threat_row, threats), batch_size, sql=self.INSERT_THREAT_SQL)
+    
+    @invalidates("accounts")
+    def store_accounts_many(self, accounts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Upsert many accounts with one transaction per batch
+        
+        Args:
+            accounts: Iterable of account dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of account records written
+        """
+        return self._store_many(accounts, batch_size, self._upsert_accounts)
+    
+    @invalidates("alerts")
+    def store_alerts_many(self, alerts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many alerts with one transaction per batch
+        
+        Args:
+            alerts: Iterable of alert dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of alerts stored
+        """
+        return self._store_many(map(self._alert_row, alerts), batch_size, sql=self.INSERT_ALERT_SQL)
+    
+    @invalidates("network_connections")
+    def store_network_connections_many(self, connections: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """
+        Store many network connections with one transaction per batch
+        
+        Args:
+            connections: Iterable of connection dictionaries
+            batch_size: Rows per transaction, defaults to the database batch size
+            
+        Returns:
+            Number of connections stored
+        """
+        return self._store_many(
+            map(self._network_connection_row, connections), batch_size, sql=self.INSERT_NETWORK_CONNECTION_SQL
+        )
+    
+    def _upsert_accounts(self, cursor, accounts: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert accounts and relink their identifiers, returning username -> id"""
+        # One row per username, since a statement may not update a row twice;
+        # sorted so concurrent writers lock accounts in the same order
+        merged = sorted(self._merge_accounts(accounts), key=lambda item: item[0].get("username"))
+        ids = dict(psycopg2.extras.execute_values(
+            cursor,
+            self.UPSERT_ACCOUNT_SQL,
+            [self._account_row(account, occurrences) for account, occurrences in merged],
+            page_size=len(merged),
+            fetch=True
+        ))
+        
+        self._link_identifiers(cursor, {
+            ids[account.get("username")]: self._account_identifiers(account) for account, _ in merged
+        })
+        return ids
+    
+    def _link_identifiers(self, cursor, links: Dict[int, List[Tuple[str, str]]]):
+        """Replace the identifiers linked to each account id"""
+        cursor.execute("DELETE FROM account_identifiers WHERE account_id = ANY(%s)", (list(links),))
+        
+        identifiers = sorted({identifier for identifiers in links.values() for identifier in identifiers})
+        if not identifiers:
+            return
+        psycopg2.extras.execute_values(
+            cursor,
+            "INSERT INTO identifiers (kind, value) VALUES %s ON CONFLICT DO NOTHING",
+            identifiers,
+            page_size=len(identifiers)
+        )
+        values = [
+            (account_id, kind, value)
+            for account_id, identifiers in links.items()
+            for kind, value in identifiers
+        ]
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO account_identifiers (account_id, identifier_id)
+            SELECT link.account_id, identifiers.id
+            FROM (VALUES %s) AS link (account_id, kind, value)
+            JOIN identifiers ON identifiers.kind = link.kind AND identifiers.value = link.value
+            ON CONFLICT DO NOTHING
+        """, values, page_size=len(values))
+    
+    def _decode_row(self, table: str, columns: Dict[str, int], row: Tuple, lazy: bool):
+        """Wrap a raw row as a LazyRecord, or convert it into a dictionary"""
+        # psycopg2 already decodes JSONB columns
+        record = LazyRecord(columns, row)
+        return record if lazy else record.to_dict()
+    
+    def _query(self, table: str, sql: str, params: Iterable[Any] = (), lazy: bool = False) -> List[Any]:
+        """Run a query and return its rows as records"""
+        with self._cursor() as cursor:
+            cursor.execute(sql, tuple(params))
+            columns = {description[0]: i for i, description in enumerate(cursor.description)}
+            return [self._decode_row(table, columns, row, lazy) for row in cursor.fetchall()]
+    
+    def _iter_keyset(
+        self,
+        table: str,
+        where: List[str],
+        params: List[Any],
+        order_column: str,
+        batch_size: int,
+        lazy: bool
+    ) -> Iterator[Any]:
+        """Stream rows in (order_column, id) descending order, one page per query"""
+        last_key = None
+        
+        while True:
+            conditions = list(where)
+            page_params = list(params)
+            if last_key is not None:
+                conditions.append(f"({order_column}, id) < (%s, %s)")
+                page_params.extend(last_key)
+            
+            where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            records = self._query(table, f"""
+                SELECT * FROM {table}
+                {where_sql}
+                ORDER BY {order_column} DESC, id DESC
+                LIMIT %s
+            """, (*page_params, batch_size), lazy)
+            
+            yield from records
+            if len(records) < batch_size:
+                return
+            last_key = (records[-1][order_column], records[-1]["id"])
+    
+    def iter_threats(
+        self,
+        platform: str = None,
+        since: str = None,
+        until: str = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream threats newest first with keyset pagination
+        
+        Args:
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            until: Optional exclusive upper bound on the timestamp
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords instead of dictionaries
+            
+        Returns:
+            Iterator over threat records
+        """
+        where, params = [], []
+        if platform:
+            where.append("platform = %s")
+            params.append(platform)
+        if since:
+            where.append("timestamp >= %s")
+            params.append(since)
+        if until:
+            where.append("timestamp < %s")
+            params.append(until)
+        return self._iter_keyset("threats", where, params, "timestamp", batch_size, lazy)
+    
+    def iter_network_connections(
+        self,
+        account_id: int = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream network connections strongest first with keyset pagination
+        
+        Args:
+            account_id: Optional account ID to filter connections
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords instead of dictionaries
+            
+        Returns:
+            Iterator over connection records
+        """
+        where, params = [], []
+        if account_id:
+            where.append("(account1_id = %s OR account2_id = %s)")
+            params.extend([account_id, account_id])
+        return self._iter_keyset("network_connections", where, params, "strength", batch_size, lazy)
+    
+    def iter_table(
+        self,
+        table: str,
+        since: str = None,
+        until: str = None,
+        after_id: int = 0,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """
+        Stream every row of a table in id order with keyset pagination
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            since: Optional inclusive lower bound on the table's time column
+            until: Optional exclusive upper bound on the table's time column
+            after_id: Only rows with a larger id are returned, for resuming
+            batch_size: Rows fetched per page
+            lazy: Yield LazyRecords instead of dictionaries
+            
+        Returns:
+            Iterator over table records
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conditions, params = ["id > %s"], []
+        if since:
+            conditions.append(f"{self.TIME_COLUMNS[table]} >= %s")
+            params.append(since)
+        if until:
+            conditions.append(f"{self.TIME_COLUMNS[table]} < %s")
+            params.append(until)
+        
+        last_id = after_id
+        while True:
+            records = self._query(table, f"""
+                SELECT * FROM {table}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id
+                LIMIT %s
+            """, (last_id, *params, batch_size), lazy)
+            
+            yield from records
+            if len(records) < batch_size:
+                return
+            last_id = records[-1]["id"]
+    
+    def search_threats(
+        self,
+        query: str,
+        platform: str = None,
+        since: str = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Full-text search over threat messages, best matches first
+        
+        Args:
+            query: Web-search style query, e.g. "rally vote", "\"fake news\"" or "protest -peaceful"
+            platform: Optional platform filter
+            since: Optional inclusive lower bound on the timestamp
+            limit: Maximum number of threats to retrieve
+            
+        Returns:
+            List of threat dictionaries, each with a "snippet" of the message
+            with matches in **bold** and its "rank" (lower is better)
+        """
+        conditions, params = ["to_tsvector('simple', message) @@ search"], [query]
+        if platform:
+            conditions.append("platform = %s")
+            params.append(platform)
+        if since:
+            conditions.append("timestamp >= %s")
+            params.append(since)
+        
+        return self._query("threats", f"""
+            SELECT threats.*,
+                -ts_rank(to_tsvector('simple', message), search) AS rank,
+                ts_headline('simple', message, search, 'StartSel=**, StopSel=**, MaxWords=16, MinWords=5') AS snippet
+            FROM threats, websearch_to_tsquery('simple', %s) AS search
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank
+            LIMIT %s
+        """, (*params, limit))
+    
+    @cached_query("accounts")
+    def get_high_risk_accounts(self, min_score: int = 80) -> List[Dict[str, Any]]:
+        """
+        Get high-risk accounts from database
+        
+        Args:
+            min_score: Minimum threat score threshold
+            
+        Returns:
+            List of account dictionaries
+        """
+        return self._query("accounts", """
+            SELECT * FROM accounts
+            WHERE threat_score >= %s
+            ORDER BY threat_score DESC
+        """, (min_score,))
+    
+    @cached_query("alerts")
+    def get_unacknowledged_alerts(self) -> List[Dict[str, Any]]:
+        """
+        Get unacknowledged alerts from database
+        
+        Returns:
+            List of alert dictionaries
+        """
+        return self._query("alerts", """
+            SELECT * FROM alerts
+            WHERE acknowledged = FALSE
+            ORDER BY timestamp DESC
+        """)
+    
+    def find_accounts_by_identifier(self, kind: str, value: str) -> List[Dict[str, Any]]:
+        """
+        Get accounts whose metadata lists an identifier
+        
+        Args:
+            kind: Identifier kind (see IDENTIFIER_KINDS), e.g. "phone_numbers"
+            value: Identifier value
+            
+        Returns:
+            List of account dictionaries, highest threat score first
+        """
+        return self._query("accounts", """
+            SELECT accounts.* FROM identifiers
+            JOIN account_identifiers ON account_identifiers.identifier_id = identifiers.id
+            JOIN accounts ON accounts.id = account_identifiers.account_id
+            WHERE identifiers.kind = %s AND identifiers.value = %s
+            ORDER BY accounts.threat_score DESC
+        """, (kind, value))
+    
+    def get_shared_identifiers(self, account_ids: List[int] = None, min_shared: int = 1) -> List[Dict[str, Any]]:
+        """
+        Find account pairs that share identifiers
+        
+        Args:
+            account_ids: Optional accounts to restrict both sides of each pair to
+            min_shared: Minimum number of shared identifiers per pair
+            
+        Returns:
+            List of dictionaries with account1_id < account2_id, the shared
+            identifier kinds as "shared_metadata" and their "shared_count",
+            most shared first
+        """
+        where, params = "", []
+        if account_ids is not None:
+            where = "WHERE first.account_id = ANY(%s) AND second.account_id = ANY(%s)"
+            ids = [int(account_id) for account_id in account_ids]
+            params = [ids, ids]
+        
+        with self._cursor() as cursor:
+            cursor.execute(f"""
+                SELECT first.account_id, second.account_id,
+                    string_agg(DISTINCT identifiers.kind, ','), COUNT(*) AS shared_count
+                FROM account_identifiers AS first
+                JOIN account_identifiers AS second
+                    ON second.identifier_id = first.identifier_id AND second.account_id > first.account_id
+                JOIN identifiers ON identifiers.id = first.identifier_id
+                {where}
+                GROUP BY first.account_id, second.account_id
+                HAVING COUNT(*) >= %s
+                ORDER BY shared_count DESC, first.account_id, second.account_id
+            """, (*params, min_shared))
+            rows = cursor.fetchall()
+        
+        return [
+            {
+                "account1_id": account1_id,
+                "account2_id": account2_id,
+                "shared_metadata": [kind for kind in self.IDENTIFIER_KINDS if kind in kinds.split(",")],
+                "shared_count": shared_count
+            }
+            for account1_id, account2_id, kinds, shared_count in rows
+        ]
+    
+    def get_columns(self, table: str) -> List[Tuple[str, str]]:
+        """
+        Get the columns of a table
+        
+        Args:
+            table: Table name (see JSON_COLUMNS)
+            
+        Returns:
+            (name, declared type) of each column, in SELECT * order
+        """
+        if table not in self.JSON_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        with self._cursor() as cursor:
+            cursor.execute("""
+                SELECT column_name, data_type FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+                ORDER BY ordinal_position
+            """, (table,))
+            return cursor.fetchall()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get database statistics
+        
+        Returns:
+            Dictionary containing statistics
+        """
+        day_ago = datetime.utcnow() - timedelta(hours=24)
+        with self._cursor() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE threat_score >= 80),
+                    AVG(threat_score), COUNT(*) FILTER (WHERE timestamp >= %s)
+                FROM threats
+            """, (day_ago,))
+            total_threats, high_risk_threats, avg_score, threats_last_24h = cursor.fetchone()
+            
+            cursor.execute("""
+                SELECT COUNT(*), COUNT(*) FILTER (WHERE threat_score >= 80),
+                    COUNT(*) FILTER (WHERE bot_confidence > 0.7)
+                FROM accounts
+            """)
+            total_accounts, high_risk_accounts, bot_accounts = cursor.fetchone()
+            
+            cursor.execute("""
+                SELECT COUNT(*) FILTER (WHERE acknowledged = FALSE),
+                    COUNT(*) FILTER (WHERE severity = 'high'),
+                    COUNT(*) FILTER (WHERE timestamp >= %s)
+                FROM alerts
+            """, (day_ago,))
+            unacknowledged_alerts, high_severity_alerts, alerts_last_24h = cursor.fetchone()
+            
+            cursor.execute("SELECT platform, COUNT(*) FROM threats GROUP BY platform")
+            platform_distribution = dict(cursor.fetchall())
+        
+        return {
+            "total_threats": total_threats,
+            "high_risk_threats": high_risk_threats,
+            "average_threat_score": round(float(avg_score), 2) if avg_score else 0,
+            "total_accounts": total_accounts,
+            "high_risk_accounts": high_risk_accounts,
+            "bot_accounts": bot_accounts,
+            "unacknowledged_alerts": unacknowledged_alerts,
+            "high_severity_alerts": high_severity_alerts,
+            "platform_distribution": platform_distribution,
+            "threats_last_24h": threats_last_24h,
+            "alerts_last_24h": alerts_last_24h
+        }
+    
+    @invalidates("alerts")
+    def acknowledge_alert(self, alert_id: int) -> bool:
+        """
+        Acknowledge an alert
+        
+        Args:
+            alert_id: ID of alert to acknowledge
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("UPDATE alerts SET acknowledged = TRUE WHERE id = %s", (alert_id,))
+                return cursor.rowcount > 0
+        except psycopg2.Error:
+            return False
+    
+    def _delete_expired(
+        self,
+        table: str,
+        condition: str,
+        cutoff: str,
+        limit: int,
+        archive: Callable[[List[Dict[str, Any]]], None] = None
+    ) -> int:
+        """Delete up to limit rows older than the cutoff, passing them to archive before commit"""
+        with self._cursor() as cursor:
+            # SKIP LOCKED lets several cleanup processes work side by side
+            cursor.execute(f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE timestamp < %s {condition}
+                    ORDER BY timestamp
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING *
+            """, (cutoff, limit))
+            columns = [description[0] for description in cursor.description]
+            records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            if archive and records:
+                archive(records)
+            return len(records)
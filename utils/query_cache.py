@@ -0,0 +1,195 @@
+import time
+import json
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple, Callable, Optional
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+class QueryCache:
+    """
+    Read-through cache of query results with a TTL and per-table invalidation
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        max_entries: int = 1024,
+        redis_url: str = None,
+        namespace: str = "pindar"
+    ):
+        """
+        Args:
+            ttl: Seconds a cached result may be served
+            max_entries: Results kept in process, least recently used evicted first
+            redis_url: Optional Redis URL for a second tier shared by every
+                process using the same database. Cached values are pickled,
+                so the Redis server must be trusted.
+            namespace: Prefix of the Redis keys, one per database
+        """
+        if redis_url and not REDIS_AVAILABLE:
+            raise RuntimeError("The Redis cache tier requires redis")
+        
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.redis = redis.Redis.from_url(redis_url) if redis_url else None
+        
+        # (table, name, args) -> (expiry time, table generation, pickled result)
+        self._entries = OrderedDict()
+        # Local table generations; with Redis the shared counters are used instead
+        self._generations = {}
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.redis_errors = 0
+    
+    def get_or_load(self, table: str, name: str, args: Tuple, loader: Callable[[], Any]) -> Any:
+        """
+        Return a cached result, or load, cache and return it
+        
+        Each call returns its own copy, so callers may modify the result.
+        
+        Args:
+            table: Table the query reads; writes to it invalidate the result
+            name: Query name
+            args: Query arguments, part of the cache key
+            loader: Function running the query
+            
+        Returns:
+            Query result
+        """
+        generation = self._generation(table)
+        if generation is None:
+            # Without the shared generation a cached result cannot be trusted
+            self.misses += 1
+            return loader()
+        
+        key = (table, name, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now and entry[1] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(entry[2])
+        
+        data = self._redis_get(table, generation, name, args)
+        if data is not None:
+            self.redis_hits += 1
+            self._store(key, now, generation, data)
+            return pickle.loads(data)
+        
+        self.misses += 1
+        result = loader()
+        data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        self._store(key, now, generation, data)
+        self._redis_set(table, generation, name, args, data)
+        return result
+    
+    def invalidate(self, *tables: str) -> None:
+        """
+        Drop the cached results of tables after a write
+        
+        Args:
+            *tables: Names of the written tables
+        """
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key in [key for key in self._entries if key[0] in tables]:
+                del self._entries[key]
+            self.invalidations += len(tables)
+        
+        if self.redis is not None:
+            try:
+                pipeline = self.redis.pipeline(transaction=False)
+                for table in tables:
+                    pipeline.incr(self._redis_key("generation", table))
+                pipeline.execute()
+            except redis.RedisError as e:
+                self.redis_errors += 1
+                logging.warning(f"Could not invalidate shared cache for {tables}: {e}")
+    
+    def clear(self) -> None:
+        """Drop every result cached in process"""
+        with self._lock:
+            self._entries.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Cache metrics
+        
+        Returns:
+            Hit and miss counters, the hit ratio over both tiers and the number of cached results
+        """
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "redis_errors": self.redis_errors
+        }
+    
+    def _store(self, key: Tuple, now: float, generation: int, data: bytes) -> None:
+        """Cache a pickled result in process, evicting the least recently used"""
+        with self._lock:
+            self._entries[key] = (now + self.ttl, generation, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def _generation(self, table: str) -> Optional[int]:
+        """Current generation of a table, or None if Redis is unreachable"""
+        if self.redis is None:
+            return self._generations.get(table, 0)
+        try:
+            return int(self.redis.get(self._redis_key("generation", table)) or 0)
+        except redis.RedisError as e:
+            self.redis_errors += 1
+            logging.warning(f"Shared cache unavailable: {e}")
+            return None
+    
+    def _redis_key(self, *parts: Any) -> str:
+        """Namespaced Redis key"""
+        return ":".join([self.namespace, *map(str, parts)])
+    
+    def _redis_get(self, table: str, generation: int, name: str, args: Tuple) -> Optional[bytes]:
+        """Pickled result from the shared tier, if any"""
+        if self.redis is None:
+            return None
+        try:
+            return self.redis.get(self._redis_key("result", table, generation, name, json.dumps(args)))
+        except redis.RedisError as e:
+            self.redis_errors += 1
+            logging.warning(f"Shared cache unavailable: {e}")
+            return None
+    
+    def _redis_set(self, table: str, generation: int, name: str, args: Tuple, data: bytes) -> None:
+        """Share a pickled result; results of older generations simply expire"""
+        if self.redis is None:
+            return
+        try:
+            self.redis.set(
+                self._redis_key("result", table, generation, name, json.dumps(args)),
+                data,
+                px=max(1, int(self.ttl * 1000))
+            )
+        except redis.RedisError as e:
+            self.redis_errors += 1
+            logging.warning(f"Shared cache unavailable: {e}")
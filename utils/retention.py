@@ -0,0 +1,143 @@
+import time
+from typing import Dict, List, Any, Iterator, Callable
+
+from utils.database import Database
+
+class RetentionJob:
+    """
+    Batched deletion of expired rows that never holds the write lock for long
+    """
+    
+    # Table -> extra condition on top of the age cutoff
+    POLICIES = Database.RETENTION_POLICIES
+    
+    def __init__(
+        self,
+        database: Database,
+        days: int = 30,
+        batch_size: int = 5000,
+        pause: float = 0.05,
+        archive_dir: str = None,
+        vacuum_pages: int = 2000
+    ):
+        """
+        Args:
+            database: Database to clean up
+            days: Number of days to keep data
+            batch_size: Rows deleted per transaction
+            pause: Seconds to yield to other writers between batches
+            archive_dir: Optional directory receiving expired rows as gzipped NDJSON before deletion
+            vacuum_pages: Free pages returned to the OS after each batch, via incremental vacuum
+        """
+        self.database = database
+        self.days = int(days)
+        self.batch_size = batch_size
+        self.pause = pause
+        self.archive_dir = archive_dir
+        self.vacuum_pages = vacuum_pages
+    
+    def steps(self) -> Iterator[Dict[str, Any]]:
+        """
+        Run the job one batch at a time
+        
+        Each yielded step marks a committed batch; callers can stop iterating
+        to interrupt the job and simply run it again later.
+        
+        Returns:
+            Iterator over progress dictionaries
+        """
+        conn = self.database._get_connection()
+        cutoff = conn.execute("SELECT datetime('now', ?)", (f"-{self.days} days",)).fetchone()[0]
+        total_deleted = 0
+        
+        for table, condition in self.POLICIES.items():
+            deleted = 0
+            
+            # Partitions that expired as a whole are dropped instead of deleted row by row
+            partitions = self.database.partitions if table == "threats" else None
+            for partition in (partitions.expired(cutoff) if partitions else []):
+                batch = partitions.drop(partition, self._archive_partition if self.archive_dir else None)
+                deleted += batch
+                total_deleted += batch
+                yield {
+                    "table": table,
+                    "partition": partition,
+                    "batch_deleted": batch,
+                    "table_deleted": deleted,
+                    "total_deleted": total_deleted,
+                    "cutoff": cutoff
+                }
+                self._incremental_vacuum(conn)
+            
+            for source in (self.database._threat_tables(until=cutoff) if table == "threats" else [table]):
+                for batch in self._delete_batches(source, table, condition, cutoff):
+                    deleted += batch
+                    total_deleted += batch
+                    if self.database.cache is not None:
+                        self.database.cache.invalidate(table)
+                    yield {
+                        "table": table,
+                        "batch_deleted": batch,
+                        "table_deleted": deleted,
+                        "total_deleted": total_deleted,
+                        "cutoff": cutoff
+                    }
+                    self._incremental_vacuum(conn)
+                    if self.pause:
+                        time.sleep(self.pause)
+        
+        # Minute buckets older than the 24h window are no longer read
+        with conn:
+            conn.execute("""
+                DELETE FROM stats_minutes
+                WHERE minute < CAST(strftime('%s', 'now', '-24 hours') AS INTEGER) / 60
+            """)
+    
+    def run(self, progress: Callable[[Dict[str, Any]], None] = None) -> int:
+        """
+        Run the job to completion
+        
+        Args:
+            progress: Optional callback receiving each progress dictionary
+        
+        Returns:
+            Number of rows deleted
+        """
+        total_deleted = 0
+        for step in self.steps():
+            total_deleted = step["total_deleted"]
+            if progress:
+                progress(step)
+        return total_deleted
+    
+    def _delete_batches(self, source: str, table: str, condition: str, cutoff: str) -> Iterator[int]:
+        """Delete expired rows from one physical table, yielding each batch size"""
+        archive = (lambda records: self.database._write_archive(self.archive_dir, table, records)) if self.archive_dir else None
+        while True:
+            batch = self.database._delete_expired(table, condition, cutoff, self.batch_size, archive, source)
+            if batch == 0:
+                return
+            yield batch
+    
+    def _archive_partition(self, partition: str):
+        """Archive every row of a threat partition before it is dropped"""
+        cursor = self.database._get_connection().execute(f"SELECT * FROM {partition}")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            self._archive("threats", rows, cursor.description)
+    
+    def _archive(self, table: str, rows, description=None):
+        """Append rows to the table's gzipped NDJSON archive and sync it to disk"""
+        description = description or rows.description
+        columns = {column[0]: i for i, column in enumerate(description)}
+        self.database._write_archive(
+            self.archive_dir, table, (self.database._decode_row(table, columns, row, lazy=False) for row in rows)
+        )
+    
+    def _incremental_vacuum(self, conn):
+        """Release free pages when the database uses incremental auto-vacuum"""
+        if self.vacuum_pages and conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            # execute() would free a single page per call; executescript steps the pragma to completion
+            conn.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
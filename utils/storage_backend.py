@@ -0,0 +1,351 @@
+import os
+import gzip
+import json
+import time
+import inspect
+import functools
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Iterable, Iterator, Callable, Tuple
+from itertools import islice
+from datetime import datetime, timedelta
+
+from utils.identifiers import IDENTIFIER_KINDS
+
+def cached_query(table: str):
+    """Serve a read method through the backend's QueryCache, keyed by its arguments"""
+    def decorate(method):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.cache is None:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            return self.cache.get_or_load(
+                table, method.__name__, bound.args[1:], lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorate
+
+def invalidates(*tables: str):
+    """Drop the backend's cached results for tables once a write method returns"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                # Bulk writes commit batch by batch, so a failure may still have written rows
+                if self.cache is not None:
+                    self.cache.invalidate(*tables)
+        return wrapper
+    return decorate
+
+class StorageBackend(ABC):
+    """
+    Storage interface shared by the SQLite, PostgreSQL and DuckDB databases
+    """
+    
+    # Columns stored as JSON, decoded when rows are read
+    JSON_COLUMNS = {
+        "threats": ("metadata", "analysis_result"),
+        "accounts": ("metadata",),
+        "alerts": ("details",),
+        "network_connections": ("shared_metadata",),
+        "analysis_logs": ("input_data", "result")
+    }
+    
+    # Tables whose JSON columns held free text in older databases; values
+    # that do not decode are returned as stored
+    FREE_TEXT_TABLES = ("analysis_logs",)
+    
+    # Column used for time-range filters on each table
+    TIME_COLUMNS = {
+        "threats": "timestamp",
+        "accounts": "last_seen",
+        "alerts": "timestamp",
+        "network_connections": "timestamp",
+        "analysis_logs": "timestamp"
+    }
+    
+    # Account metadata lists normalized into the identifiers tables
+    IDENTIFIER_KINDS = IDENTIFIER_KINDS
+    
+    # Table -> extra condition on top of the age cutoff when cleaning up
+    RETENTION_POLICIES = {
+        "threats": "",
+        "alerts": "AND severity != 'high'",
+        "analysis_logs": ""
+    }
+    
+    # Rows per write transaction in the bulk methods and cleanup
+    batch_size = 5000
+    
+    # Optional QueryCache for the hot dashboard queries
+    cache = None
+    
+    @abstractmethod
+    def store_threat(self, threat_data: Dict[str, Any]) -> int:
+        """Store a threat and return its ID"""
+    
+    @abstractmethod
+    def store_account(self, account_data: Dict[str, Any]) -> int:
+        """Insert or update an account by username and return its ID"""
+    
+    @abstractmethod
+    def store_alert(self, alert_data: Dict[str, Any]) -> int:
+        """Store an alert and return its ID"""
+    
+    @abstractmethod
+    def store_network_connection(self, connection_data: Dict[str, Any]) -> int:
+        """Store a network connection and return its ID"""
+    
+    @abstractmethod
+    def store_threats_many(self, threats: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """Store many threats with one transaction per batch, returning the number stored"""
+    
+    @abstractmethod
+    def store_accounts_many(self, accounts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """Upsert many accounts with one transaction per batch, returning the number written"""
+    
+    @abstractmethod
+    def store_alerts_many(self, alerts: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """Store many alerts with one transaction per batch, returning the number stored"""
+    
+    @abstractmethod
+    def store_network_connections_many(self, connections: Iterable[Dict[str, Any]], batch_size: int = None) -> int:
+        """Store many network connections with one transaction per batch, returning the number stored"""
+    
+    @abstractmethod
+    def iter_threats(
+        self,
+        platform: str = None,
+        since: str = None,
+        until: str = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """Stream threats newest first with keyset pagination"""
+    
+    @abstractmethod
+    def iter_network_connections(
+        self,
+        account_id: int = None,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """Stream network connections strongest first with keyset pagination"""
+    
+    @abstractmethod
+    def iter_table(
+        self,
+        table: str,
+        since: str = None,
+        until: str = None,
+        after_id: int = 0,
+        batch_size: int = 1000,
+        lazy: bool = True
+    ) -> Iterator[Any]:
+        """Stream every row of a table in id order with keyset pagination"""
+    
+    @abstractmethod
+    def search_threats(
+        self,
+        query: str,
+        platform: str = None,
+        since: str = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Full-text search over threat messages, each result with a "snippet" and a "rank" (lower is better)"""
+    
+    @abstractmethod
+    def get_high_risk_accounts(self, min_score: int = 80) -> List[Dict[str, Any]]:
+        """Get accounts at or above a threat score, highest first"""
+    
+    @abstractmethod
+    def get_unacknowledged_alerts(self) -> List[Dict[str, Any]]:
+        """Get unacknowledged alerts, newest first"""
+    
+    @abstractmethod
+    def find_accounts_by_identifier(self, kind: str, value: str) -> List[Dict[str, Any]]:
+        """Get accounts whose metadata lists an identifier"""
+    
+    @abstractmethod
+    def get_shared_identifiers(self, account_ids: List[int] = None, min_shared: int = 1) -> List[Dict[str, Any]]:
+        """Find account pairs that share identifiers"""
+    
+    @abstractmethod
+    def get_columns(self, table: str) -> List[Tuple[str, str]]:
+        """(name, declared type) of each column of a table, in SELECT * order"""
+    
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get database statistics"""
+    
+    @abstractmethod
+    def acknowledge_alert(self, alert_id: int) -> bool:
+        """Acknowledge an alert, returning whether it existed"""
+    
+    @abstractmethod
+    def close(self):
+        """Release the backend's connections"""
+    
+    @cached_query("threats")
+    def get_recent_threats(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get recent threats from database
+        
+        Args:
+            limit: Maximum number of threats to retrieve
+            
+        Returns:
+            List of threat dictionaries
+        """
+        return list(islice(self.iter_threats(batch_size=max(1, limit), lazy=False), limit))
+    
+    def get_network_connections(self, account_id: int = None) -> List[Dict[str, Any]]:
+        """
+        Get network connections from database
+        
+        Args:
+            account_id: Optional account ID to filter connections
+            
+        Returns:
+            List of connection dictionaries
+        """
+        return list(self.iter_network_connections(account_id, lazy=False))
+    
+    @invalidates(*RETENTION_POLICIES)
+    def cleanup_old_data(self, days: int = 30, archive_dir: str = None, progress: Callable = None) -> int:
+        """
+        Clean up old data from database
+        
+        Expired rows are deleted oldest first in batches of batch_size, one
+        transaction each.
+        
+        Args:
+            days: Number of days to keep data
+            archive_dir: Optional directory for gzipped NDJSON archives of deleted rows
+            progress: Optional callback receiving a progress dictionary per batch
+            
+        Returns:
+            Number of records deleted
+        """
+        cutoff = f"{datetime.utcnow() - timedelta(days=int(days)):%Y-%m-%d %H:%M:%S}"
+        total_deleted = 0
+        
+        for table, condition in self.RETENTION_POLICIES.items():
+            deleted = 0
+            archive = (lambda records, table=table: self._write_archive(archive_dir, table, records)) if archive_dir else None
+            while True:
+                batch = self._delete_expired(table, condition, cutoff, self.batch_size, archive)
+                if batch == 0:
+                    break
+                deleted += batch
+                total_deleted += batch
+                if progress:
+                    progress({
+                        "table": table,
+                        "batch_deleted": batch,
+                        "table_deleted": deleted,
+                        "total_deleted": total_deleted,
+                        "cutoff": cutoff
+                    })
+        
+        return total_deleted
+    
+    @abstractmethod
+    def _delete_expired(
+        self,
+        table: str,
+        condition: str,
+        cutoff: str,
+        limit: int,
+        archive: Callable[[List[Dict[str, Any]]], None] = None
+    ) -> int:
+        """Delete up to limit rows older than the cutoff, passing them to archive before commit"""
+    
+    def export_data(self, table: str = None) -> Dict[str, Any]:
+        """
+        Export data from database
+        
+        Args:
+            table: Specific table to export, or None for all
+            
+        Returns:
+            Dictionary containing exported data
+        """
+        tables = list(self.JSON_COLUMNS)
+        
+        if table and table in tables:
+            tables = [table]
+        
+        # JSON columns are decoded from the schema; use DataExporter for large tables
+        return {
+            table_name: list(self.iter_table(table_name, lazy=False))
+            for table_name in tables
+        }
+    
+    def _account_identifiers(self, account_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(kind, value) identifiers listed in an account's metadata"""
+        metadata = account_data.get("metadata") or {}
+        identifiers = []
+        for kind in self.IDENTIFIER_KINDS:
+            for value in metadata.get(kind) or []:
+                if value:
+                    identifiers.append((kind, str(value)))
+        return identifiers
+    
+    def _merge_accounts(self, accounts: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Collapse repeated usernames in a batch for single-statement upserts
+        
+        Returns:
+            (last account dictionary, number of occurrences) per username
+        """
+        merged = {}
+        for account in accounts:
+            username = account.get("username")
+            merged[username] = (account, merged.get(username, (None, 0))[1] + 1)
+        return list(merged.values())
+    
+    def _write_archive(self, archive_dir: str, table: str, records: Iterable[Dict[str, Any]]):
+        """Append decoded records to the table's gzipped NDJSON archive and sync it to disk"""
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{table}-{time.strftime('%Y%m%d')}.ndjson.gz")
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+                for record in records:
+                    archive.write(json.dumps(record, default=str).encode("utf-8") + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+
+def create_database(url: str = None, **options) -> StorageBackend:
+    """
+    Open the storage backend named by a database URL
+    
+    Args:
+        url: "sqlite:///relative/path.db", "sqlite:////absolute/path.db",
+            "duckdb:///path.duckdb" or a "postgresql://" DSN. Defaults to the
+            PINDAR_DATABASE_URL environment variable, then data/pindar.db.
+        **options: Keyword arguments for the backend's constructor
+        
+    Returns:
+        Storage backend instance
+    """
+    url = url or os.environ.get("PINDAR_DATABASE_URL", "sqlite:///data/pindar.db")
+    scheme, _, path = url.partition("://")
+    # As in SQLAlchemy URLs, the third slash separates the (empty) host from a relative path
+    path = path[1:] if path.startswith("/") else path
+    
+    if scheme == "sqlite":
+        from utils.database import Database
+        return Database(path, **options)
+    if scheme in ("postgresql", "postgres"):
+        from utils.postgres_database import PostgresDatabase
+        return PostgresDatabase(url, **options)
+    if scheme == "duckdb":
+        from utils.duckdb_database import DuckDBDatabase
+        return DuckDBDatabase(path, **options)
+    raise ValueError(f"Unknown database URL scheme: {scheme}")
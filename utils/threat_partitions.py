@@ -0,0 +1,268 @@
+import re
+import threading
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Callable
+from datetime import datetime, timedelta
+
+class ThreatPartitions:
+    """
+    Time-partitioned storage for threats: one table per day or week
+    """
+    
+    # Statements run before a partition is dropped, to keep derived tables in
+    # step with the rows that disappear without firing DELETE triggers
+    DROP_HOOKS = [
+        """
+        UPDATE stats_threats SET
+            count = stats_threats.count - expired.count,
+            score_sum = stats_threats.score_sum - expired.score_sum,
+            high_risk = stats_threats.high_risk - expired.high_risk
+        FROM (
+            SELECT platform, COUNT(*) AS count, SUM(threat_score) AS score_sum,
+                SUM(threat_score >= 80) AS high_risk
+            FROM {partition} GROUP BY platform
+        ) AS expired
+        WHERE stats_threats.platform = expired.platform
+        """,
+        """
+        UPDATE stats_minutes SET count = stats_minutes.count - expired.count
+        FROM (
+            SELECT CAST(strftime('%s', timestamp) AS INTEGER) / 60 AS minute, COUNT(*) AS count
+            FROM {partition} GROUP BY minute
+        ) AS expired
+        WHERE stats_minutes.table_name = 'threats' AND stats_minutes.minute = expired.minute
+        """,
+        """
+        INSERT INTO threats_fts (threats_fts, rowid, message, platform, timestamp)
+        SELECT 'delete', id, message, platform, timestamp
+        FROM {partition}, threats_fts_progress
+        WHERE (id <= done_id OR id > target_id)
+        AND id NOT IN (SELECT id FROM threats_fts_pending)
+        """,
+        """
+        DELETE FROM threats_fts_pending
+        WHERE EXISTS (SELECT 1 FROM {partition} WHERE {partition}.id = threats_fts_pending.id)
+        """
+    ]
+    
+    def __init__(self, database, interval: str = "day"):
+        """
+        Args:
+            database: Database whose threats are partitioned
+            interval: Partition width, "day" or "week"
+        """
+        if interval not in ("day", "week"):
+            raise ValueError(f"Unknown partition interval: {interval}")
+        
+        self.database = database
+        self.interval = interval
+        
+        # name -> (start, end) as SQLite timestamps, half-open
+        self.partitions = {}
+        # Per thread, the connection and PRAGMA data_version of the last registry read
+        self._seen = threading.local()
+        conn = database._get_connection()
+        self.refresh(conn)
+        for name in self.partitions:
+            self._sync_schema(conn, name)
+    
+    def refresh(self, conn=None):
+        """
+        Re-read the partition registry if another connection committed since the last read
+        
+        Other handles and processes create and drop partitions too. PRAGMA
+        data_version only changes after their commits, so while nothing
+        changed a check costs a single pragma.
+        """
+        conn = conn or self.database._get_connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._seen, "state", None) == (conn, version):
+            return
+        self.partitions = {
+            name: (start, end) for name, start, end in conn.execute("SELECT name, start, end FROM threat_partitions")
+        }
+        self._seen.state = (conn, version)
+    
+    def dropped(self, conn, name: str) -> bool:
+        """Whether a partition listed earlier has since been dropped, forgetting it if so"""
+        if name == "threats" or conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone():
+            return False
+        self.partitions.pop(name, None)
+        return True
+    
+    def bounds(self, timestamp: datetime) -> Tuple[str, str, str]:
+        """
+        Partition covering a UTC timestamp
+        
+        Returns:
+            Tuple of (table name, start, end)
+        """
+        start = datetime(timestamp.year, timestamp.month, timestamp.day)
+        if self.interval == "week":
+            start -= timedelta(days=start.weekday())
+            end = start + timedelta(weeks=1)
+            name = f"threats_w{start:%Y%m%d}"
+        else:
+            end = start + timedelta(days=1)
+            name = f"threats_d{start:%Y%m%d}"
+        return name, f"{start:%Y-%m-%d %H:%M:%S}", f"{end:%Y-%m-%d %H:%M:%S}"
+    
+    def ensure(self, conn, timestamp: datetime) -> str:
+        """Return the partition for a timestamp, creating it if needed"""
+        name, start, end = self.bounds(timestamp)
+        self.refresh(conn)
+        if name in self.partitions:
+            return name
+        
+        # Registered and created in the caller's write transaction; another
+        # process may already have done both
+        conn.execute(
+            "INSERT OR IGNORE INTO threat_partitions (name, start, end) VALUES (?, ?, ?)", (name, start, end)
+        )
+        self._sync_schema(conn, name)
+        self.database._sync_threat_search(conn)
+        self.partitions[name] = (start, end)
+        return name
+    
+    def _sync_schema(self, conn, name: str):
+        """Create a partition's table, indexes and triggers from those of the legacy threats table"""
+        for sql in self._partition_ddl(conn, name):
+            conn.execute(sql)
+    
+    def _partition_ddl(self, conn, name: str) -> List[str]:
+        """DDL of the legacy threats table rewritten for a partition"""
+        statements = []
+        rows = conn.execute("""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE tbl_name = 'threats' AND sql IS NOT NULL
+            ORDER BY type = 'table' DESC
+        """).fetchall()
+        
+        for kind, object_name, sql in rows:
+            sql = re.sub(
+                r'^\s*CREATE\s+(TABLE|INDEX|TRIGGER)\s+(?:IF\s+NOT\s+EXISTS\s+)?("?\w+"?)',
+                lambda match: f"CREATE {match.group(1)} IF NOT EXISTS {self._rename(object_name, name)}",
+                sql,
+                flags=re.IGNORECASE
+            )
+            if kind == "table":
+                # Ids come from the shared allocator instead of a per-table sequence
+                sql = re.sub(r'\s+AUTOINCREMENT', '', sql, flags=re.IGNORECASE)
+            else:
+                sql = re.sub(r'\bON\s+"?threats"?(?=[\s(])', f"ON {name}", sql, count=1, flags=re.IGNORECASE)
+            statements.append(sql)
+        
+        return statements
+    
+    def _rename(self, object_name: str, partition: str) -> str:
+        """Name of a partition's copy of a legacy schema object"""
+        return partition if object_name == "threats" else f"{object_name}__{partition}"
+    
+    def allocate_ids(self, conn, count: int) -> int:
+        """
+        Reserve consecutive threat ids from the legacy table's AUTOINCREMENT sequence
+        
+        Sharing the sequence keeps ids unique across the legacy table and
+        every partition. Must be called inside a write transaction.
+        
+        Returns:
+            First reserved id
+        """
+        conn.execute("""
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT 'threats', COALESCE((SELECT MAX(id) FROM threats), 0)
+            WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'threats')
+        """)
+        last = conn.execute(
+            "UPDATE sqlite_sequence SET seq = seq + ? WHERE name = 'threats' RETURNING seq", (count,)
+        ).fetchone()[0]
+        return last - count + 1
+    
+    def insert(self, conn, rows: Sequence[Tuple]) -> int:
+        """
+        Insert threat rows (see Database.INSERT_THREAT_SQL) into the current partition
+        
+        Must be called inside a write transaction.
+        
+        Returns:
+            Id of the first inserted row
+        """
+        now = datetime.utcnow().replace(microsecond=0)
+        name = self.ensure(conn, now)
+        first_id = self.allocate_ids(conn, len(rows))
+        
+        columns = self.database.THREAT_COLUMNS
+        timestamp = f"{now:%Y-%m-%d %H:%M:%S}"
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        conn.executemany(
+            f"INSERT INTO {name} (id, {', '.join(columns)}, timestamp) VALUES ({placeholders})",
+            [(first_id + i, *row, timestamp) for i, row in enumerate(rows)]
+        )
+        return first_id
+    
+    def tables(self, newest_first: bool = True, since: str = None, until: str = None) -> List[str]:
+        """
+        Physical tables holding threats in a time range
+        
+        The legacy threats table is treated as the oldest partition and is
+        always included, since its rows are not bounded in time.
+        
+        Args:
+            newest_first: Order partitions from newest to oldest
+            since: Optional inclusive lower bound on the timestamp
+            until: Optional exclusive upper bound on the timestamp
+        
+        Returns:
+            List of table names
+        """
+        self.refresh()
+        names = [
+            name for name, (start, end) in sorted(self.partitions.items(), key=lambda item: item[1][0])
+            if (not since or end > since) and (not until or start < until)
+        ]
+        names.insert(0, "threats")
+        return names[::-1] if newest_first else names
+    
+    def expired(self, cutoff: str) -> List[str]:
+        """Partitions whose whole time range lies before the cutoff"""
+        self.refresh()
+        return [name for name, (_, end) in self.partitions.items() if end <= cutoff]
+    
+    def drop(self, name: str, archive: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Drop a whole partition
+        
+        Args:
+            name: Partition table name
+            archive: Optional callback receiving the partition name before it is dropped
+        
+        Returns:
+            Number of rows dropped, 0 if another connection dropped it first
+        """
+        conn = self.database._get_connection()
+        if self.dropped(conn, name):
+            return 0
+        if archive:
+            archive(name)
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.dropped(conn, name):
+                conn.rollback()
+                return 0
+            count = conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            for sql in self.DROP_HOOKS:
+                conn.execute(sql.format(partition=name))
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.execute("DELETE FROM threat_partitions WHERE name = ?", (name,))
+            self.database._sync_threat_search(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        self.partitions.pop(name, None)
+        if self.database.cache is not None:
+            self.database.cache.invalidate("threats")
+        return count
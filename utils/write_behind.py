@@ -0,0 +1,240 @@
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+from collections import deque
+
+from utils.database import Database
+
+class WriteBehindWriter:
+    """
+    Bounded write-behind queue drained by a dedicated group-commit thread
+    """
+    
+    # Sentinel that tells the writer thread to stop
+    _STOP = object()
+    
+    def __init__(
+        self,
+        database: Database,
+        max_queue: int = 100000,
+        batch_size: int = 5000,
+        flush_interval: float = 0.5,
+        latency_window: int = 1000,
+        retries: int = 3,
+        retry_backoff: float = 0.1
+    ):
+        """
+        Args:
+            database: Database the records are written to
+            max_queue: Maximum queued records before producers block
+            batch_size: Maximum records committed in one group commit
+            flush_interval: Seconds the writer waits for more records before committing
+            latency_window: Number of recent commit latencies kept for the metrics
+            retries: Attempts after the first before a failed group commit is given up
+            retry_backoff: Seconds before the first retry, doubled for each further retry
+        """
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.queue = queue.Queue(maxsize=max_queue)
+        
+        self.writers = {
+            "threats": database.store_threats_many,
+            "accounts": database.store_accounts_many,
+            "alerts": database.store_alerts_many,
+            "network_connections": database.store_network_connections_many
+        }
+        
+        # Metrics
+        self.rows_written = 0
+        self.commits = 0
+        self.errors = 0
+        self.blocked_puts = 0
+        self.commit_latencies = deque(maxlen=latency_window)
+        
+        # Records whose commit failed on every attempt, kept for the caller
+        self.failed: List[tuple] = []
+        self._failure: Optional[Exception] = None
+        self._failure_lock = threading.Lock()
+        
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+    
+    def submit(self, kind: str, row: Dict[str, Any], timeout: Optional[float] = None) -> None:
+        """
+        Queue a record for writing
+        
+        Blocks while the queue is full, which slows producers down to the
+        rate the disk can sustain.
+        
+        Args:
+            kind: "threats", "accounts", "alerts" or "network_connections"
+            row: Row dictionary in the format of the matching store_* method
+            timeout: Maximum seconds to wait for queue space; None waits forever
+        
+        Raises:
+            queue.Full: If the queue stayed full for the whole timeout
+        """
+        if kind not in self.writers:
+            raise ValueError(f"Unknown row kind: {kind}")
+        if self._closed:
+            raise RuntimeError("WriteBehindWriter is closed")
+        
+        try:
+            self.queue.put_nowait((kind, row))
+        except queue.Full:
+            self.blocked_puts += 1
+            self.queue.put((kind, row), timeout=timeout)
+    
+    def store_threat(self, threat_data: Dict[str, Any]) -> None:
+        """Queue a threat"""
+        self.submit("threats", threat_data)
+    
+    def store_account(self, account_data: Dict[str, Any]) -> None:
+        """Queue an account upsert"""
+        self.submit("accounts", account_data)
+    
+    def store_alert(self, alert_data: Dict[str, Any]) -> None:
+        """Queue an alert"""
+        self.submit("alerts", alert_data)
+    
+    def store_network_connection(self, connection_data: Dict[str, Any]) -> None:
+        """Queue a network connection"""
+        self.submit("network_connections", connection_data)
+    
+    def flush(self) -> None:
+        """
+        Block until every queued record has been committed
+        
+        Raises:
+            RuntimeError: If a group commit failed on every attempt since the
+                last flush; its records are kept in failed
+        """
+        self.queue.join()
+        self._raise_failure()
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Commit the remaining records and stop the writer thread
+        
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+        
+        Raises:
+            RuntimeError: If a group commit failed on every attempt since the
+                last flush; its records are kept in failed
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(self._STOP)
+        self._thread.join(timeout)
+        self._raise_failure()
+    
+    def take_failed(self) -> List[tuple]:
+        """
+        Hand the failed records over to the caller
+        
+        Returns:
+            (kind, row) tuples whose commit failed on every attempt, in
+            submission order; they are removed from the writer
+        """
+        with self._failure_lock:
+            failed, self.failed = self.failed, []
+        return failed
+    
+    def _raise_failure(self) -> None:
+        """Raise the last unreported commit failure"""
+        with self._failure_lock:
+            failure, self._failure = self._failure, None
+            count = len(self.failed)
+        if failure is not None:
+            raise RuntimeError(f"Write-behind commit failed; {count} records are kept in failed") from failure
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Queue and commit metrics
+        
+        Returns:
+            Queue depth, throughput counters and commit latency statistics (seconds)
+        """
+        latencies = sorted(self.commit_latencies)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "rows_written": self.rows_written,
+            "commits": self.commits,
+            "errors": self.errors,
+            "blocked_puts": self.blocked_puts,
+            "failed_rows": len(self.failed),
+            "commit_latency_avg": sum(latencies) / len(latencies) if latencies else 0.0,
+            "commit_latency_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "commit_latency_max": latencies[-1] if latencies else 0.0
+        }
+    
+    def _run(self) -> None:
+        """Writer thread: collect records into groups and commit them"""
+        running = True
+        while running:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            
+            if batch[-1] is self._STOP:
+                running = False
+            
+            self._commit([item for item in batch if item is not self._STOP])
+            for _ in batch:
+                self.queue.task_done()
+    
+    def _commit(self, batch: List[tuple]) -> None:
+        """Group-commit a batch, one bulk write per record kind"""
+        if not batch:
+            return
+        
+        grouped = {}
+        for kind, row in batch:
+            grouped.setdefault(kind, []).append(row)
+        
+        start = time.perf_counter()
+        for kind, rows in grouped.items():
+            self._commit_kind(kind, rows)
+        self.commit_latencies.append(time.perf_counter() - start)
+        self.commits += 1
+    
+    def _commit_kind(self, kind: str, rows: List[Dict[str, Any]]) -> None:
+        """Write the rows of one kind, retrying with exponential backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                # Each bulk write is a single transaction, so a failed attempt leaves nothing behind
+                self.rows_written += self.writers[kind](rows, batch_size=len(rows))
+                return
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Write-behind commit of {len(rows)} {kind} failed (attempt {attempt + 1}): {e}")
+                if attempt == self.retries:
+                    with self._failure_lock:
+                        self.failed.extend((kind, row) for row in rows)
+                        self._failure = e
+                    return
+                time.sleep(self.retry_backoff * 2 ** attempt)
+    
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()